@@ -0,0 +1,46 @@
+# Compares two results files of benchmarks/suite.py and exits non-zero when a
+# benchmark got slower than the threshold.
+#
+#   python benchmarks/compare.py results/old.json results/new.json [--threshold 0.2]
+import argparse
+import json
+from pathlib import Path
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown (default: 20%%)"
+    )
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    print(f"{'benchmark':>32} {baseline['commit']:>12} {current['commit']:>12}   change")
+
+    regressions = []
+    for name in sorted(baseline["results"].keys() | current["results"].keys()):
+        old = baseline["results"].get(name, {}).get("median_us")
+        new = current["results"].get(name, {}).get("median_us")
+        if old is None or new is None:
+            old_text = "-" if old is None else f"{old:.1f}"
+            new_text = "-" if new is None else f"{new:.1f}"
+            print(f"{name:>32} {old_text:>12} {new_text:>12}")
+            continue
+        change = (new - old) / old
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:>32} {old:>12.1f} {new:>12.1f} {change:>+8.1%}{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
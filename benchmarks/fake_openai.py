@@ -0,0 +1,153 @@
+# A minimal OpenAI-compatible chat completions server for benchmarks: answers
+# structured output requests for the outline and question schemas with
+# synthetic data after a fixed delay, streamed like the real API. It also
+# lists a single model, so it works as a local backend for offline runs.
+#
+#   python benchmarks/fake_openai.py [port] [delay_seconds]
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima"
+    " mike november oscar papa quebec romeo sierra tango uniform victor"
+    " whiskey xray yankee zulu"
+).split()
+STREAM_CHUNK_CHARS = 64
+MODEL = "fake-model"
+
+
+def fake_question(rng: random.Random) -> dict:
+    choices = [" ".join(rng.choices(WORDS, k=2)) for _ in range(4)]
+    return {
+        "question": " ".join(rng.choices(WORDS, k=12)) + "?",
+        "answer": choices[0],
+        "choices": choices,
+        "explanation": " ".join(rng.choices(WORDS, k=20)) + ".",
+        "difficulty": rng.randint(1, 5),
+    }
+
+
+def fake_content(body: dict, rng: random.Random) -> dict:
+    schema = body.get("response_format", {}).get("json_schema", {}).get("schema", {})
+    properties = schema.get("properties", {})
+    if "topics" in properties:
+        return {
+            "name": "Benchmark course",
+            "description": "Synthetic course",
+            "topics": [f"Topic {index}" for index in range(4)],
+        }
+    # Ask for as many questions as the system prompt does.
+    prompt = body["messages"][0]["content"]
+    count = next((int(word) for word in prompt.split() if word.isdigit()), 10)
+    return {"questions": [fake_question(rng) for _ in range(count)]}
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    requests = itertools.count()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            data = json.dumps(
+                {
+                    "object": "list",
+                    "data": [{"id": MODEL, "object": "model", "created": 0, "owned_by": "benchmark"}],
+                }
+            ).encode()
+            self.send_response(200)
+        else:
+            data = b'{"error": {"message": "Not found"}}'
+            self.send_response(404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.delay)
+        rng = random.Random(next(self.requests))
+        content = json.dumps(fake_content(body, rng))
+        base = {"id": "fake", "created": 0, "model": body["model"]}
+
+        if not body.get("stream"):
+            data = json.dumps(
+                {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(event: str):
+            data = f"data: {event}\n\n".encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        for start in range(0, len(content), STREAM_CHUNK_CHARS):
+            delta = {"role": "assistant", "content": content[start : start + STREAM_CHUNK_CHARS]}
+            send(
+                json.dumps(
+                    {
+                        **base,
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    }
+                )
+            )
+        send(
+            json.dumps(
+                {
+                    **base,
+                    "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+            )
+        )
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+# Starts the server on a background thread; returns it and its base URL.
+def serve(port: int = 0, delay: float = 0.0) -> tuple[ThreadingHTTPServer, str]:
+    handler = type("Handler", (FakeOpenAIHandler,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    server, base_url = serve(port, delay)
+    print(f"Serving fake OpenAI API at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
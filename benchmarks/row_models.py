@@ -0,0 +1,65 @@
+# Per-row construction cost of the read-side models.
+#
+#   python benchmarks/row_models.py
+import json
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from pydantic import BaseModel
+
+from models.db import Question
+
+
+# The pydantic model rows used to be validated with.
+class PydanticQuestion(BaseModel):
+    id: int
+    question: str
+    answer: str
+    choices: list[str]
+    explanation: str
+    difficulty: int
+    created_at: int
+    course_id: int
+
+
+ROW = (
+    1,
+    "How do you say 'Hello' in Spanish?",
+    "Hola",
+    json.dumps(["Hola", "Adiós", "Gracias", "Por favor"]),
+    "'Hola' is the most common greeting in Spanish.",
+    1,
+    1700000000,
+    1,
+)
+
+
+def pydantic_from_row(row):
+    return PydanticQuestion(
+        id=row[0],
+        question=row[1],
+        answer=row[2],
+        choices=json.loads(row[3]),
+        explanation=row[4],
+        difficulty=row[5],
+        created_at=row[6],
+        course_id=row[7],
+    )
+
+
+def main():
+    number = 100_000
+    results = {
+        "pydantic": min(timeit.repeat(lambda: pydantic_from_row(ROW), number=number, repeat=5)),
+        "dataclass": min(timeit.repeat(lambda: Question.from_row(ROW), number=number, repeat=5)),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>10}: {seconds / number * 1e6:.2f} µs/row")
+    print(f"{'speedup':>10}: {results['pydantic'] / results['dataclass']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
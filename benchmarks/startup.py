@@ -0,0 +1,57 @@
+# Cold start to first paint of the app, measured from outside the process.
+#
+#   python benchmarks/startup.py [runs]
+import json
+import os
+from pathlib import Path
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def measure(runs: int) -> list[float]:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "db.sqlite3"
+        shutil.copy(SRC_DIR / "db.sqlite3", db_path)
+        env = {
+            **os.environ,
+            "CUTE_LEARNING_DB": str(db_path),
+            "CUTE_LEARNING_EXIT_AFTER_FIRST_PAINT": "1",
+            "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen"),
+        }
+        timings = []
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            subprocess.run(
+                [sys.executable, str(SRC_DIR / "main.py")],
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            timings.append((time.perf_counter() - started_at) * 1000)
+        return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    timings = measure(runs)
+    print(
+        json.dumps(
+            {
+                "benchmark": "startup_to_first_paint",
+                "runs": runs,
+                "median_ms": round(statistics.median(timings), 1),
+                "min_ms": round(min(timings), 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# Times the data, UI and generation paths against synthetic databases and a
+# local fake OpenAI server, headless. Results are written as JSON so runs on
+# different commits can be compared with benchmarks/compare.py.
+#
+#   python benchmarks/suite.py [--sizes 1k,100k,1m] [--only fetch] [--output results.json]
+import argparse
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+# Must be set before Qt and the LLM client are imported.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["OPENAI_REQUESTS_PER_MINUTE"] = "1000000"
+
+BENCHMARKS_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "src"))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from PySide6.QtWidgets import QApplication
+
+import fake_openai
+import synthetic_db
+from models.ai import CreateCourseInput, CreateQuestionInput
+from models.db import Question
+from storage.repository import Repository
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+
+def timed(function: Callable[[], object], number: int, repeat: int = 5) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started_at) / number * 1e6)
+    return {
+        "median_us": round(statistics.median(timings), 2),
+        "min_us": round(min(timings), 2),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def course_ids(repository: Repository) -> list[int]:
+    return [row[0] for row in repository.connection().execute("SELECT id FROM course")]
+
+
+def bench_fetch(label: str, question_count: int) -> dict:
+    repository = Repository(synthetic_db.database_path(question_count))
+    rng = random.Random(0)
+    ids = course_ids(repository)
+    results = {
+        f"fetch_course/{label}": timed(
+            lambda: repository.fetch_course(rng.choice(ids)), number=1000
+        ),
+        f"fetch_questions/{label}": timed(
+            lambda: repository.fetch_questions(rng.choice(ids)), number=20
+        ),
+        f"fetch_questions_page/{label}": timed(
+            lambda: repository.fetch_questions(
+                rng.choice(ids), after_id=rng.randrange(question_count), limit=50
+            ),
+            number=500,
+        ),
+        f"fetch_new_questions_page/{label}": timed(
+            lambda: repository.fetch_new_questions(rng.choice(ids), limit=50),
+            number=500,
+        ),
+    }
+    repository.close()
+    return results
+
+
+def bench_decode_choices() -> dict:
+    repository = Repository(synthetic_db.database_path(SIZES["100k"]))
+    rows = (
+        repository.connection()
+        .execute(f"SELECT {Question.COLUMNS} FROM question LIMIT 10000")
+        .fetchall()
+    )
+    repository.close()
+    return {
+        "decode_choices": timed(lambda: [Question.from_row(row) for row in rows], number=1)
+        | {"rows": len(rows)},
+    }
+
+
+def bench_courses_window(app: QApplication, label: str, question_count: int) -> dict:
+    from windows.courses.courses import CoursesWindow
+
+    repository = Repository(synthetic_db.database_path(question_count))
+    window = CoursesWindow(app, repository)
+    window.window.show()
+
+    def load():
+        window.load_courses()
+        app.processEvents()
+
+    # Runs what the debounce timer would once typing pauses, until the
+    # results are shown.
+    def search():
+        window.search_input.setText("alpha bra")
+        window.load_courses()
+        app.processEvents()
+        window.courses_model.search_pool.waitForDone()
+        app.processEvents()
+        window.search_input.setText("")
+        window.load_courses()
+        window.search_timer.stop()
+
+    results = {
+        f"load_courses/{label}": timed(load, number=20),
+        f"search_courses/{label}": timed(search, number=20),
+    }
+    window.window.close()
+    repository.close()
+    return results
+
+
+def fake_questions(rng: random.Random, count: int) -> list[CreateQuestionInput]:
+    return [
+        CreateQuestionInput(**fake_openai.fake_question(rng)) for _ in range(count)
+    ]
+
+
+# What happens once NewCourseWindow has a generated course: it is saved (with
+# deduplication and full-text indexing) and shown in the courses list.
+def bench_new_course_insert(app: QApplication, directory: Path) -> dict:
+    from windows.courses.courses import CoursesWindow
+
+    repository = Repository(
+        synthetic_db.scratch_copy(SIZES["100k"], directory, signatures=True)
+    )
+    window = CoursesWindow(app, repository)
+    window.load_courses()
+    rng = random.Random(0)
+
+    def insert():
+        course_id = repository.create_course(
+            CreateCourseInput(
+                name="Benchmark course",
+                description="Synthetic course",
+                questions=fake_questions(rng, 20),
+            )
+        )
+        window.on_course_created(course_id)
+        app.processEvents()
+
+    results = {"new_course_insert/100k": timed(insert, number=10)}
+    window.window.close()
+    repository.close()
+    return results
+
+
+def bench_generation(directory: Path, llm_delay: float) -> dict:
+    from services.backends import get_backend
+    from services.generation import GenerateCourseJob
+    from services.llm_cache import CacheMode
+    from services.pipeline import GenerationConfig
+
+    server, base_url = fake_openai.serve(delay=llm_delay)
+    repository = Repository(synthetic_db.scratch_copy(SIZES["1k"], directory))
+    failures = []
+    # Warmed up like the app does at startup, so only generation is timed.
+    backend = get_backend(base_url, "benchmark", kind="local")
+    backend.warm_up()
+
+    def generate():
+        job = GenerateCourseJob(
+            repository,
+            backend=backend,
+            prompt="I want to learn benchmarking.",
+            config=GenerationConfig(question_count=40, cache_mode=CacheMode.OFF),
+        )
+        job.signals.failed.connect(failures.append)
+        job.run()
+
+    results = {
+        "generation_end_to_end": timed(generate, number=1) | {"llm_delay_s": llm_delay},
+    }
+    server.shutdown()
+    repository.close()
+    if failures:
+        raise RuntimeError(f"Generation failed: {failures[0]}")
+    return results
+
+
+def bench_startup() -> dict:
+    import startup
+
+    timings = startup.measure(5)
+    return {
+        "startup_to_first_paint": {
+            "median_us": round(statistics.median(timings) * 1000, 2),
+            "min_us": round(min(timings) * 1000, 2),
+            "number": 1,
+            "repeat": len(timings),
+        }
+    }
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARKS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--sizes", default="1k,100k,1m", help="database sizes for the fetch paths")
+    parser.add_argument("--only", help="run only benchmarks whose name starts with this")
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="fake model latency in seconds")
+    parser.add_argument("--output", type=Path, help="results file (default: results/<commit>.json)")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    sizes = [(label, SIZES[label]) for label in args.sizes.lower().split(",")]
+    runs: list[tuple[str, Callable[[], dict]]] = []
+    for label, question_count in sizes:
+        runs.append((f"fetch/{label}", lambda q=question_count, l=label: bench_fetch(l, q)))
+    runs.append(("decode_choices", bench_decode_choices))
+    for label, question_count in sizes:
+        runs.append(
+            (
+                f"load_courses/{label}",
+                lambda q=question_count, l=label: bench_courses_window(app, l, q),
+            )
+        )
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        runs.append(("new_course_insert", lambda: bench_new_course_insert(app, Path(directory))))
+        runs.append(("generation", lambda: bench_generation(Path(directory), args.llm_delay)))
+        runs.append(("startup", bench_startup))
+
+        for name, run in runs:
+            if args.only and not name.startswith(args.only):
+                continue
+            for benchmark, result in run().items():
+                results[benchmark] = result
+                print(f"{benchmark:>32}: {result['median_us']:>12.1f} µs", file=sys.stderr)
+
+    sha = commit()
+    output = args.output or RESULTS_DIR / f"{sha}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": sha,
+                "created_at": int(time.time()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
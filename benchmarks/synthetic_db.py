@@ -0,0 +1,96 @@
+# Synthetic databases for the benchmarks, built once per size and cached in
+# benchmarks/.data since the large ones take a while.
+import json
+from pathlib import Path
+import random
+import shutil
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storage.dedup_index import NUM_PERMUTATIONS, DedupIndex
+from storage.repository import Repository
+
+DATA_DIR = Path(__file__).parent / ".data"
+# Bump when the generated data changes so stale caches are rebuilt.
+BUILD_VERSION = 3
+COURSE_SIZE = 1000
+CREATED_AT = 1_700_000_000
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima"
+    " mike november oscar papa quebec romeo sierra tango uniform victor"
+    " whiskey xray yankee zulu"
+).split()
+
+
+def database_path(question_count: int, signatures: bool = False) -> Path:
+    name = f"v{BUILD_VERSION}-{question_count}{'-signatures' if signatures else ''}.sqlite3"
+    path = DATA_DIR / name
+    if not path.exists():
+        DATA_DIR.mkdir(exist_ok=True)
+        building = path.with_suffix(".building")
+        building.unlink(missing_ok=True)
+        build(building, question_count, signatures)
+        building.rename(path)
+    return path
+
+
+# Copies a cached database so benchmarks that write leave the cache intact.
+def scratch_copy(question_count: int, directory: Path, signatures: bool = False) -> Path:
+    path = directory / "db.sqlite3"
+    shutil.copy(database_path(question_count, signatures), path)
+    return path
+
+
+def build(path: Path, question_count: int, signatures: bool):
+    print(f"Building synthetic database with {question_count} questions...", file=sys.stderr)
+    rng = random.Random(question_count)
+    repository = Repository(path)
+    repository.migrate()
+    course_count = max(question_count // COURSE_SIZE, 1)
+
+    def insert(db: sqlite3.Connection):
+        with db:
+            db.executemany(
+                "INSERT INTO course (id, name, description, created_at) VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        course_id,
+                        f"{' '.join(rng.choices(WORDS, k=2)).title()} {course_id}",
+                        " ".join(rng.choices(WORDS, k=12)),
+                        CREATED_AT + course_id,
+                    )
+                    for course_id in range(1, course_count + 1)
+                ),
+            )
+            db.executemany(
+                "INSERT INTO question (course_id, question, answer, choices, explanation, difficulty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        index * course_count // question_count + 1,
+                        f"{' '.join(rng.choices(WORDS, k=10))} {index}?",
+                        choices[0],
+                        json.dumps(choices),
+                        " ".join(rng.choices(WORDS, k=16)),
+                        rng.randint(1, 5),
+                        CREATED_AT,
+                    )
+                    for index in range(question_count)
+                    for choices in [[" ".join(rng.choices(WORDS, k=2)) for _ in range(4)]]
+                ),
+            )
+            if signatures:
+                # Random signatures give the dedup index a realistic size without
+                # paying for MinHash over every synthetic question.
+                DedupIndex(db).add(
+                    (
+                        question_id,
+                        tuple(rng.getrandbits(60) for _ in range(NUM_PERMUTATIONS)),
+                    )
+                    for (question_id,) in db.execute("SELECT id FROM question")
+                )
+        db.execute("ANALYZE")
+
+    repository.write(insert)
+    repository.close()
@@ -0,0 +1,24 @@
+# Compiles every Qt Designer file under src/windows into a ui_<name>.py module
+# next to it, so windows don't have to parse XML with QUiLoader at startup.
+# Run it after editing any .ui file:
+#
+#   python scripts/compile_ui.py
+from pathlib import Path
+import subprocess
+import sys
+
+WINDOWS_DIR = Path(__file__).parent.parent / "src" / "windows"
+
+
+def main():
+    for ui_file in sorted(WINDOWS_DIR.rglob("*.ui")):
+        output = ui_file.with_name(f"ui_{ui_file.stem}.py")
+        subprocess.run(
+            ["pyside6-uic", str(ui_file), "-o", str(output)],
+            check=True,
+        )
+        print(f"{ui_file.relative_to(WINDOWS_DIR)} -> {output.name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
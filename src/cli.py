@@ -0,0 +1,121 @@
+import argparse
+from pathlib import Path
+import sqlite3
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from storage.course_archive import (
+    export_courses,
+    import_courses,
+    index_questions,
+    open_archive,
+)
+from storage.profiles import data_dir, database_path, list_profiles
+from storage.repository import Repository
+
+
+def report(message: str):
+    # stdout may be the archive itself.
+    print(message, file=sys.stderr)
+
+
+def export_command(repository: Repository, args: argparse.Namespace):
+    started_at = time.perf_counter()
+    with open_archive(args.file, "w") as file:
+        courses, questions = export_courses(repository, file, args.course or None)
+    report(
+        f"Exported {courses} courses, {questions} questions in {time.perf_counter() - started_at:.1f}s"
+    )
+
+
+def import_command(repository: Repository, args: argparse.Namespace):
+    started_at = time.perf_counter()
+    with open_archive(args.file, "r") as file:
+        courses, questions, skipped = import_courses(repository, file)
+    report(
+        f"Imported {courses} courses, {questions} questions in {time.perf_counter() - started_at:.1f}s"
+        + (f" ({skipped} courses already present)" if skipped else "")
+    )
+    # Otherwise the app indexes them in the background.
+    if args.index:
+        index_command(repository, args)
+
+
+def index_command(repository: Repository, args: argparse.Namespace):
+    started_at = time.perf_counter()
+    indexed = index_questions(
+        repository,
+        lambda done, total: report(f"Indexing questions for duplicate detection: {done}/{total}"),
+    )
+    report(f"Indexed {indexed} questions in {time.perf_counter() - started_at:.1f}s")
+
+
+def profiles_command(repository: Repository, args: argparse.Namespace):
+    report(f"Profiles in {data_dir() / 'profiles'}:")
+    for name in list_profiles():
+        print(name)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Move courses between databases without the app."
+    )
+    parser.add_argument(
+        "--profile",
+        help="profile to use (default: $CUTE_LEARNING_PROFILE or 'default')",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help="database file, instead of the profile's",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser(
+        "export", help="write courses to a JSON Lines archive (.gz to compress)"
+    )
+    export_parser.add_argument("file", help="archive path, or - for stdout")
+    export_parser.add_argument(
+        "--course", type=int, action="append", help="course id to export (repeatable, default: all)"
+    )
+    export_parser.set_defaults(run=export_command)
+
+    import_parser = commands.add_parser("import", help="add the courses of an archive")
+    import_parser.add_argument("file", help="archive path, or - for stdin")
+    import_parser.add_argument(
+        "--index",
+        action="store_true",
+        help="add the questions to the duplicate index right away, instead of leaving it to the app",
+    )
+    import_parser.set_defaults(run=import_command)
+
+    index_parser = commands.add_parser(
+        "index", help="add questions missing from the duplicate index"
+    )
+    index_parser.set_defaults(run=index_command)
+
+    profiles_parser = commands.add_parser("profiles", help="list the profiles")
+    profiles_parser.set_defaults(run=profiles_command)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    args = parse_args(sys.argv[1:])
+
+    try:
+        repository = Repository(args.db or database_path(args.profile))
+        repository.migrate()
+    except (OSError, ValueError, sqlite3.Error) as e:
+        report(f"Error: {e}")
+        sys.exit(1)
+    try:
+        args.run(repository, args)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        report(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        repository.close()
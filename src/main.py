@@ -1,57 +1,116 @@
+import logging
+import os
 from pathlib import Path
-import sqlite3
 import sys
+import threading
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
-from windows.courses.courses import CoursesWindow
-from windows.new_course.new_course import NewCourseWindow
-from windows.course.course import CourseWindow
+from dotenv import load_dotenv
+
+from services.settings import GeneratorSettings
+from storage.profiles import database_path
+from storage.repository import Repository
+import tracing
+from windows.window_manager import WindowManager
+
+logger = logging.getLogger(__name__)
+
+
+# A local model server loads the model on its first request, which would
+# otherwise be the first course the learner generates.
+def warm_up_backend(settings: GeneratorSettings):
+    from services.backends import backend_from_settings
+
+    try:
+        backend_from_settings(settings).warm_up()
+    except Exception as e:
+        logger.warning("Warming up the generator backend failed: %s", e)
+
+
+# Questions imported without deduplication, or dropped from the dedup index by
+# a migration, are indexed a batch at a time until done or until the app quits.
+def index_in_background(app: QApplication, repository: Repository):
+    stop = threading.Event()
+
+    def run():
+        from storage.course_archive import index_questions
+
+        try:
+            index_questions(repository, is_cancelled=stop.is_set)
+        except Exception as e:
+            logger.warning("Indexing questions for duplicate detection failed: %s", e)
+
+    thread = threading.Thread(target=run, name="dedup-index", daemon=True)
+
+    def finish():
+        stop.set()
+        if thread.is_alive():
+            thread.join()
+
+    app.aboutToQuit.connect(finish)
+    QTimer.singleShot(0, thread.start)
+
+
+# Takes `--profile NAME` out of the command line and leaves the rest to Qt.
+# (argparse alone would add a few milliseconds to startup.)
+def split_profile_arg(argv: list[str]) -> tuple[str | None, list[str]]:
+    profile = None
+    rest = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--profile":
+            profile = next(args, None)
+        elif arg.startswith("--profile="):
+            profile = arg.partition("=")[2]
+        else:
+            rest.append(arg)
+    return profile, rest
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    db = sqlite3.connect(Path(__file__).parent / "db.sqlite3")
-    cursor = db.cursor()
-
-    cursor.execute(
-        """
-            CREATE TABLE IF NOT EXISTS course (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                created_at INTEGER NOT NULL
-            );
-            """
-    )
-    cursor.execute(
-        """
-            CREATE TABLE IF NOT EXISTS question (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question TEXT NOT NULL,
-                answer TEXT NOT NULL,
-                choices TEXT NOT NULL,
-                explanation TEXT NOT NULL,
-                difficulty INTEGER NOT NULL,
-                created_at INTEGER NOT NULL,
-                course_id INTEGER NOT NULL,
-                FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
-            );
-            """
-    )
-    db.commit()
-
-    newCourseWindow = NewCourseWindow(app, db)
-    coursesWindow = CoursesWindow(app, db)
-    courseWindow = CourseWindow(app, db)
-
-    newCourseWindow.course_was_created.connect(coursesWindow.on_course_created)
-
-    coursesWindow.open_new_course_window.connect(newCourseWindow.window.show)
-    coursesWindow.open_course_window.connect(courseWindow.load_course)
-
-    courseWindow.open_new_course_window.connect(newCourseWindow.window.show)
-    courseWindow.open_courses_window.connect(coursesWindow.window.show)
-
-    courseWindow.window.show()
+    load_dotenv()
+
+    profile, argv = split_profile_arg(sys.argv)
+    try:
+        path = database_path(profile)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+
+    app = QApplication(argv)
+
+    repository = Repository(path)
+    repository.migrate()
+
+    windows = WindowManager(app, repository)
+    windows.show_course_window()
+
+    # Used by benchmarks/startup.py to time cold start to first paint.
+    if os.environ.get("CUTE_LEARNING_EXIT_AFTER_FIRST_PAINT"):
+        QTimer.singleShot(0, app.quit)
+    else:
+        # Started after the first paint, so importing openai doesn't delay it.
+        # Remote servers have nothing to warm up, so openai waits until
+        # generation is requested.
+        if windows.generator_settings.backend_kind() == "local":
+            QTimer.singleShot(
+                0,
+                threading.Thread(
+                    target=warm_up_backend,
+                    args=(windows.generator_settings,),
+                    name="warm-up",
+                    daemon=True,
+                ).start,
+            )
+        index_in_background(app, repository)
+    # Connected last: the course window first waits for answers still being
+    # saved, and indexing stops after its current batch.
+    app.aboutToQuit.connect(repository.close)
+
+    # Dumps the timings of the whole session for chrome://tracing or Perfetto.
+    trace_file = os.environ.get("CUTE_LEARNING_TRACE_FILE")
+    if trace_file:
+        app.aboutToQuit.connect(lambda: tracing.export_chrome_trace(Path(trace_file)))
 
     sys.exit(app.exec())
@@ -29,3 +29,17 @@ class CreateCourseInput(BaseModel):
     questions: list[CreateQuestionInput] = Field(
         description="A list of 3-5 questions. Must contain at least 3 questions."
     )
+
+
+class CreateCourseOutlineInput(BaseModel):
+    name: str
+    description: str
+    topics: list[str] = Field(
+        description="A list of distinct, non-overlapping topics that together cover the course. Each topic is a short phrase.",
+    )
+
+
+class CreateQuestionsInput(BaseModel):
+    questions: list[CreateQuestionInput] = Field(
+        description="A list of questions about the requested topic. Questions must not repeat each other.",
+    )
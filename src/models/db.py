@@ -1,7 +1,13 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
+import json
+import sqlite3
 
+# Rows read back from our own database are trusted, so they skip validation.
+# Pydantic models are only used at the LLM boundary (models/ai.py).
 
-class Question(BaseModel):
+
+@dataclass(slots=True)
+class Question:
     id: int
     question: str
     answer: str
@@ -11,9 +17,104 @@ class Question(BaseModel):
     created_at: int
     course_id: int
 
+    COLUMNS = "id, question, answer, choices, explanation, difficulty, created_at, course_id"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "Question":
+        return cls(
+            row[0], row[1], row[2], json.loads(row[3]), row[4], row[5], row[6], row[7]
+        )
 
-class Course(BaseModel):
+
+@dataclass(slots=True)
+class Course:
     id: int
     name: str
     description: str
     created_at: int
+
+    COLUMNS = "id, name, description, created_at"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "Course":
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class ReviewState:
+    question_id: int
+    course_id: int
+    ease: float
+    interval: float
+    repetitions: int
+    due_at: int
+    reviewed_at: int
+
+    COLUMNS = "question_id, course_id, ease, interval, repetitions, due_at, reviewed_at"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "ReviewState":
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class ImportJob:
+    id: int
+    path: str
+    size: int
+    modified_at: int
+    questions_per_chunk: int
+    name: str | None
+    description: str | None
+    created_at: int
+
+    COLUMNS = "id, path, size, modified_at, questions_per_chunk, name, description, created_at"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "ImportJob":
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class LearnerStats:
+    answered: int
+    correct: int
+    current_streak: int
+    longest_streak: int
+    active_days: int
+    last_day: str | None
+
+    COLUMNS = "answered, correct, current_streak, longest_streak, active_days, last_day"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "LearnerStats":
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class Badge:
+    id: str
+    title: str
+    description: str
+    metric: str
+    threshold: int
+    earned_at: int | None
+
+    COLUMNS = "id, title, description, metric, threshold, earned_at"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "Badge":
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class CourseSkill:
+    course_id: int
+    skill: float
+    answered: int
+
+    COLUMNS = "course_id, skill, answered"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row | tuple) -> "CourseSkill":
+        return cls(*row)
@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+
+from services.llm_client import REQUESTS_PER_MINUTE, LLMClient, get_client
+from services.settings import GeneratorSettings, is_local_url
+from tracing import span
+
+REMOTE_MODEL = "gpt-5-mini"
+# REMOTE_MODEL = "deepseek-chat"
+# Only used when a local server doesn't list any model.
+LOCAL_MODEL = "openai/gpt-oss-20b"
+
+# A local server has no quota to protect, so its limiter only stops runaway loops.
+LOCAL_REQUESTS_PER_MINUTE = float(os.environ.get("LOCAL_REQUESTS_PER_MINUTE", 6000))
+
+logger = logging.getLogger(__name__)
+
+
+class GeneratorBackend:
+    kind = ""
+
+    def __init__(self, base_url: str, api_key: str, model: str = ""):
+        self.base_url = base_url
+        self.api_key = api_key
+        self._model = model
+
+    @property
+    def client(self) -> LLMClient:
+        return get_client(self.base_url, self.api_key)
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def warm_up(self):
+        pass
+
+
+# api.openai.com, DeepSeek or any other hosted OpenAI-compatible server.
+class RemoteBackend(GeneratorBackend):
+    kind = "remote"
+
+    def __init__(self, base_url: str, api_key: str, model: str = ""):
+        super().__init__(base_url, api_key, model or REMOTE_MODEL)
+
+    @property
+    def client(self) -> LLMClient:
+        return get_client(self.base_url, self.api_key, REQUESTS_PER_MINUTE)
+
+
+# LMStudio, llama.cpp, Ollama or the fake server in benchmarks/, all speaking
+# the OpenAI API on this machine. They load the model on the first request,
+# which is what warm_up pays for ahead of time.
+class LocalBackend(GeneratorBackend):
+    kind = "local"
+
+    def __init__(self, base_url: str, api_key: str, model: str = ""):
+        # Local servers ignore the key, but the OpenAI client requires one.
+        super().__init__(base_url, api_key or "local", model)
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> LLMClient:
+        return get_client(self.base_url, self.api_key, LOCAL_REQUESTS_PER_MINUTE)
+
+    # Without a configured model the first one the server lists is used, which
+    # for LMStudio is the model currently loaded.
+    @property
+    def model(self) -> str:
+        with self._lock:
+            if not self._model:
+                try:
+                    models = self.client.call(lambda openai: openai.models.list().data, max_attempts=1)
+                except Exception as e:
+                    logger.warning("Listing local models failed: %s", e)
+                    return LOCAL_MODEL
+                self._model = models[0].id if models else LOCAL_MODEL
+            return self._model
+
+    def warm_up(self):
+        with span("llm.warm_up", "llm", base_url=self.base_url):
+            model = self.model
+            # A one token answer loads the weights and leaves a kept-alive
+            # connection in the client's pool for the first real request.
+            self.client.call(
+                lambda openai: openai.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": "Hi"}],
+                    max_tokens=1,
+                ),
+                max_attempts=1,
+            )
+
+
+BACKENDS: dict[str, type[GeneratorBackend]] = {
+    RemoteBackend.kind: RemoteBackend,
+    LocalBackend.kind: LocalBackend,
+}
+
+
+_backends: dict[tuple[str, str, str, str], GeneratorBackend] = {}
+_backends_lock = threading.Lock()
+
+
+# `kind` is "remote", "local" or empty to pick by the URL. Backends are shared,
+# so a warmed up local backend keeps its model and connection.
+def get_backend(base_url: str, api_key: str, model: str = "", kind: str = "") -> GeneratorBackend:
+    kind = kind or ("local" if is_local_url(base_url) else "remote")
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown generator backend: {kind} (expected one of {', '.join(BACKENDS)})")
+    key = (kind, base_url.rstrip("/"), api_key, model)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = BACKENDS[kind](base_url, api_key, model)
+            _backends[key] = backend
+        return backend
+
+
+def backend_from_settings(settings: GeneratorSettings) -> GeneratorBackend:
+    return get_backend(
+        settings.base_url, settings.api_key, settings.model, settings.backend_kind()
+    )
@@ -0,0 +1,87 @@
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from services.pipeline import MATERIAL_CHUNK_CHARS, PARAGRAPH_BREAK, pack_paragraphs
+
+# Documents are read a block at a time, so only the block being chunked and
+# one pending paragraph are ever in memory, however large the file.
+BLOCK_CHARS = 64 * 1024
+
+TEXT_SUFFIXES = {".txt", ".md", ".markdown", ".rst"}
+HTML_SUFFIXES = {".html", ".htm", ".xhtml"}
+SUPPORTED_SUFFIXES = TEXT_SUFFIXES | HTML_SUFFIXES
+
+# Tags whose text is never learning material.
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+# Tags that end a paragraph in the rendered page.
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "aside", "main",
+    "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "ol", "dl", "dt", "dd",
+    "table", "tr", "blockquote", "pre", "br", "hr", "figure", "figcaption",
+}
+
+
+class HTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag: str, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag: str):
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data: str):
+        if not self.skipping:
+            self.parts.append(data)
+
+    def drain(self) -> str:
+        text = "".join(self.parts)
+        self.parts = []
+        return text
+
+
+def read_blocks(path: Path, block_chars: int = BLOCK_CHARS) -> Iterator[str]:
+    with open(path, encoding="utf-8", errors="replace", newline=None) as file:
+        if path.suffix.lower() not in HTML_SUFFIXES:
+            while block := file.read(block_chars):
+                yield block
+            return
+
+        parser = HTMLText()
+        while block := file.read(block_chars):
+            parser.feed(block)
+            yield parser.drain()
+        parser.close()
+        yield parser.drain()
+
+
+def split_paragraphs(
+    blocks: Iterable[str], max_chars: int = MATERIAL_CHUNK_CHARS
+) -> Iterator[str]:
+    pending = ""
+    for block in blocks:
+        pending += block
+        paragraphs = PARAGRAPH_BREAK.split(pending)
+        pending = paragraphs.pop()
+        yield from paragraphs
+        # Text without blank lines would otherwise pile up unbounded.
+        while len(pending) > max_chars:
+            yield pending[:max_chars]
+            pending = pending[max_chars:]
+    yield pending
+
+
+def read_chunks(path: Path, chunk_chars: int = MATERIAL_CHUNK_CHARS) -> Iterator[str]:
+    return pack_paragraphs(
+        split_paragraphs(read_blocks(path), chunk_chars), chunk_chars
+    )
@@ -0,0 +1,263 @@
+import hashlib
+import itertools
+import math
+from pathlib import Path
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from models.ai import CreateCourseInput, CreateQuestionInput
+from models.db import Course
+from services.backends import GeneratorBackend
+from services.llm_cache import CACHE_FILE_NAME, ResponseCache
+from services.documents import SUPPORTED_SUFFIXES, read_chunks
+from services.pipeline import (
+    MATERIAL_CHUNK_CHARS,
+    OUTLINE_MATERIAL_CHARS,
+    QUESTIONS_SYSTEM_PROMPT,
+    SEED_QUESTION_COUNT,
+    CoursePipeline,
+    GenerationCancelled,
+    GenerationConfig,
+    deduplicate_questions,
+)
+from storage.repository import Repository
+
+DUPLICATES_WARNING = "{count} near-duplicate questions were left out"
+
+
+class GenerateCourseSignals(QObject):
+    question_generated = Signal(int)
+    # Emitted before course_created when the course came out incomplete.
+    warning = Signal(str)
+    course_created = Signal(int)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class GenerateCourseJob(QRunnable):
+    def __init__(
+        self,
+        repository: Repository,
+        backend: GeneratorBackend,
+        prompt: str,
+        config: GenerationConfig,
+    ):
+        super().__init__()
+        self.repository = repository
+        self.backend = backend
+        self.prompt = prompt
+        self.config = config
+        self.signals = GenerateCourseSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            course = self.generate()
+            # Last chance to back out: once saved the course is visible.
+            if self.is_cancelled():
+                raise GenerationCancelled()
+            course_id = self.repository.create_course(course)
+            left_out = len(course.questions) - self.repository.count_questions(course_id)
+            if left_out:
+                self.signals.warning.emit(DUPLICATES_WARNING.format(count=left_out))
+        except GenerationCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.course_created.emit(course_id)
+
+    def generate(self) -> CreateCourseInput:
+        cache = ResponseCache(self.repository.path.parent / CACHE_FILE_NAME)
+        pipeline = CoursePipeline(
+            self.backend,
+            self.config,
+            cache=cache,
+            is_cancelled=self.is_cancelled,
+            on_progress=self.signals.question_generated.emit,
+        )
+        try:
+            course = pipeline.run(self.prompt)
+        finally:
+            cache.close()
+        self.signals.question_generated.emit(len(course.questions))
+        if pipeline.errors:
+            self.signals.warning.emit(
+                f"{len(pipeline.errors)} topics failed ({pipeline.errors[0]}), so the course has fewer questions than requested"
+            )
+        return course
+
+
+class ImportDocumentJob(QRunnable):
+    def __init__(
+        self,
+        repository: Repository,
+        backend: GeneratorBackend,
+        path: Path,
+        config: GenerationConfig,
+    ):
+        super().__init__()
+        self.repository = repository
+        self.backend = backend
+        self.path = path
+        self.config = config
+        self.signals = GenerateCourseSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            course_id = self.import_document()
+        except GenerationCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.course_created.emit(course_id)
+
+    def import_document(self) -> int:
+        if self.path.suffix.lower() not in SUPPORTED_SUFFIXES:
+            raise ValueError(f"Unsupported file type: {self.path.suffix or self.path.name}")
+        # The size only gives an estimate of the number of chunks, which is
+        # enough to spread the requested questions over the document.
+        estimated_chunks = max(math.ceil(self.path.stat().st_size / MATERIAL_CHUNK_CHARS), 1)
+        job = self.repository.start_import(
+            self.path, max(math.ceil(self.config.question_count / estimated_chunks), 1)
+        )
+
+        cache = ResponseCache(self.repository.path.parent / CACHE_FILE_NAME)
+        pipeline = CoursePipeline(
+            self.backend,
+            self.config,
+            cache=cache,
+            is_cancelled=self.is_cancelled,
+            on_progress=self.signals.question_generated.emit,
+        )
+        try:
+            if job.name is None:
+                outline = pipeline.create_outline(
+                    "\n\n".join(
+                        itertools.islice(
+                            read_chunks(self.path),
+                            math.ceil(OUTLINE_MATERIAL_CHARS / MATERIAL_CHUNK_CHARS),
+                        )
+                    ),
+                    estimated_chunks,
+                )
+                job.name, job.description = outline.name, outline.description
+                self.repository.set_import_outline(job.id, job.name, job.description)
+
+            checkpoints = self.repository.fetch_import_checkpoints(job.id)
+            for index, (_, count) in checkpoints.items():
+                pipeline.report(index, count)
+
+            hashes: dict[int, str] = {}
+
+            def remaining_chunks():
+                for index, chunk in enumerate(read_chunks(self.path)):
+                    chunk_hash = hashlib.sha256(chunk.encode()).hexdigest()
+                    hashes[index] = chunk_hash
+                    if checkpoints.get(index, ("",))[0] != chunk_hash:
+                        yield index, chunk
+
+            def save_chunk(index: int, questions: list[CreateQuestionInput]):
+                self.repository.save_import_chunk(job.id, index, hashes[index], questions)
+
+            errors = pipeline.create_streamed_questions(
+                QUESTIONS_SYSTEM_PROMPT.format(
+                    name=job.name,
+                    description=job.description,
+                    question_count=job.questions_per_chunk,
+                ),
+                remaining_chunks(),
+                save_chunk,
+            )
+        finally:
+            cache.close()
+        if errors:
+            raise ValueError(
+                f"{len(errors)} parts of the document failed ({errors[0]}); import it again to retry them"
+            )
+
+        questions = [
+            CreateQuestionInput.model_validate(question)
+            for question in self.repository.fetch_import_questions(job.id)
+        ]
+        if self.is_cancelled():
+            raise GenerationCancelled()
+        course = CreateCourseInput(
+            name=job.name,
+            description=job.description,
+            questions=deduplicate_questions(questions),
+        )
+        course_id = self.repository.finish_import(job.id, course)
+        left_out = len(course.questions) - self.repository.count_questions(course_id)
+        if left_out:
+            self.signals.warning.emit(DUPLICATES_WARNING.format(count=left_out))
+        return course_id
+
+
+class GenerateQuestionsSignals(QObject):
+    questions_added = Signal(int)
+    warning = Signal(str)
+    failed = Signal(str)
+
+
+class GenerateMoreQuestionsJob(QRunnable):
+    def __init__(
+        self,
+        repository: Repository,
+        course: Course,
+        backend: GeneratorBackend,
+        question_count: int,
+        config: GenerationConfig,
+    ):
+        super().__init__()
+        self.repository = repository
+        self.course = course
+        self.backend = backend
+        self.question_count = question_count
+        self.config = config
+        self.signals = GenerateQuestionsSignals()
+
+    def run(self):
+        try:
+            questions = self.generate()
+            added = self.repository.add_questions(self.course.id, questions)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.questions_added.emit(added)
+        if added < len(questions):
+            self.signals.warning.emit(
+                DUPLICATES_WARNING.format(count=len(questions) - added)
+            )
+
+    def generate(self) -> list[CreateQuestionInput]:
+        existing_questions = self.repository.fetch_question_texts(
+            self.course.id, limit=SEED_QUESTION_COUNT
+        )
+        pipeline = CoursePipeline(self.backend, self.config)
+        return pipeline.create_more_questions(
+            self.course.name,
+            self.course.description,
+            existing_questions,
+            self.question_count,
+        )
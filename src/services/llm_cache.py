@@ -0,0 +1,116 @@
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+from pydantic import BaseModel
+
+CACHE_FILE_NAME = "llm_cache.sqlite3"
+MAX_BYTES = 64 * 1024 * 1024
+MAX_AGE = 30 * 24 * 60 * 60
+
+
+class CacheMode:
+    USE = "use"
+    REFRESH = "refresh"
+    OFF = "off"
+
+
+class ResponseCache:
+    def __init__(self, path: Path, max_bytes: int = MAX_BYTES, max_age: int = MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at INTEGER NOT NULL,
+                accessed_at INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS response_accessed_at ON response (accessed_at)"
+        )
+        self.db.commit()
+
+    @staticmethod
+    def key(
+        model: str,
+        base_url: str,
+        messages: list[dict],
+        response_format: type[BaseModel],
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "base_url": base_url.rstrip("/"),
+                "messages": messages,
+                "schema": response_format.model_json_schema(),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = int(time.time())
+        with self._lock:
+            row = self.db.execute(
+                "SELECT content FROM response WHERE key = ? AND created_at > ?",
+                (key, now - self.max_age),
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE response SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.db.commit()
+        return row[0]
+
+    def put(self, key: str, content: str):
+        now = int(time.time())
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO response (key, content, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, content, len(content.encode()), now, now),
+            )
+            self.evict(now)
+            self.db.commit()
+
+    def evict(self, now: int):
+        self.db.execute(
+            "DELETE FROM response WHERE created_at <= ?", (now - self.max_age,)
+        )
+        (total,) = self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until the cache fits again.
+        stale = []
+        for key, size in self.db.execute(
+            "SELECT key, size FROM response ORDER BY accessed_at"
+        ):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self.db.executemany("DELETE FROM response WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self.db.execute("DELETE FROM response")
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
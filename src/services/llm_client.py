@@ -0,0 +1,140 @@
+from email.utils import parsedate_to_datetime
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, TypeVar
+
+from openai import APIConnectionError, APIStatusError, OpenAI
+
+from tracing import span
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_MINUTE = float(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", 60))
+MAX_ATTEMPTS = int(os.environ.get("OPENAI_MAX_ATTEMPTS", 5))
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            # Going negative queues the caller behind everyone already waiting.
+            self.tokens -= 1
+            return max(-self.tokens / self.rate, 0.0)
+
+    def acquire(self, is_cancelled: Callable[[], bool] = lambda: False):
+        sleep(self.reserve(), is_cancelled)
+
+
+class LLMClient:
+    def __init__(self, base_url: str, api_key: str, requests_per_minute: float):
+        # Retries are handled here so they share the rate limiter.
+        self.openai = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.limiter = TokenBucket(
+            requests_per_minute / 60, capacity=max(requests_per_minute / 10, 1)
+        )
+
+    @property
+    def base_url(self) -> str:
+        return str(self.openai.base_url)
+
+    def call(
+        self,
+        request: Callable[[OpenAI], T],
+        is_cancelled: Callable[[], bool] = lambda: False,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> T:
+        for attempt in range(max_attempts):
+            with span("llm.rate_limit", "llm"):
+                self.limiter.acquire(is_cancelled)
+            try:
+                with span("llm.request", "llm", attempt=attempt):
+                    return request(self.openai)
+            except (APIConnectionError, APIStatusError) as e:
+                if attempt + 1 == max_attempts or not is_retryable(e):
+                    raise
+                delay = retry_delay(e, attempt)
+                logger.warning("Retrying in %.1fs: %s", delay, e)
+                sleep(delay, is_cancelled)
+        raise AssertionError("unreachable")
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRY_STATUS_CODES
+    return True
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    if isinstance(error, APIStatusError):
+        retry_after = parse_retry_after(error.response.headers)
+        if retry_after is not None:
+            return min(retry_after, MAX_BACKOFF)
+    # Full jitter keeps concurrent jobs from retrying in lockstep.
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2**attempt))
+
+
+def parse_retry_after(headers) -> float | None:
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def sleep(seconds: float, is_cancelled: Callable[[], bool]):
+    deadline = time.monotonic() + seconds
+    while not is_cancelled():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 0.1))
+
+
+_clients: dict[tuple[str, str], LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(
+    base_url: str,
+    api_key: str,
+    requests_per_minute: float = REQUESTS_PER_MINUTE,
+) -> LLMClient:
+    key = (base_url.rstrip("/"), api_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = LLMClient(base_url, api_key, requests_per_minute)
+            _clients[key] = client
+        return client
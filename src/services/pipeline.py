@@ -0,0 +1,350 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+import logging
+import math
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from models.ai import (
+    CreateCourseInput,
+    CreateCourseOutlineInput,
+    CreateQuestionInput,
+    CreateQuestionsInput,
+)
+from services.llm_cache import CacheMode, ResponseCache
+from storage.dedup_index import question_key
+from tracing import span, traced
+
+if TYPE_CHECKING:
+    from services.backends import GeneratorBackend
+
+logger = logging.getLogger(__name__)
+
+OUTLINE_SYSTEM_PROMPT = (
+    "You are a learning material generator that plans courses based on the user's prompt or learning material."
+    + " Give the course a short name and description, and split its content into {topic_count} distinct topics."
+)
+
+QUESTIONS_SYSTEM_PROMPT = (
+    "You are a learning material generator that generates learning materials based on the user's prompt."
+    + " The course is '{name}': {description}"
+    + " Generate {question_count} questions and answers about the topic given by the user."
+    + " Cover different aspects of the topic and never repeat a question."
+)
+
+MORE_QUESTIONS_SYSTEM_PROMPT = (
+    "You are a learning material generator that keeps a course going while the user studies it."
+    + " The course is '{name}': {description}"
+    + " Generate {question_count} new questions and answers for this course."
+    + " The user already has the questions listed in the next message; never repeat or rephrase any of them,"
+    + " and prefer aspects of the course they don't cover yet."
+)
+
+# Enough of a course to steer the model away from repeats without blowing the
+# context window on large courses. Older questions are still deduplicated.
+SEED_QUESTION_COUNT = 200
+
+# Above this size the prompt is treated as source material and split locally
+# instead of asking the model for a list of topics.
+MATERIAL_CHUNK_CHARS = 6000
+OUTLINE_MATERIAL_CHARS = 12000
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+@dataclass
+class GenerationConfig:
+    question_count: int = 20
+    questions_per_chunk: int = int(os.environ.get("GENERATION_QUESTIONS_PER_CHUNK", 10))
+    concurrency: int = int(os.environ.get("GENERATION_CONCURRENCY", 4))
+    cache_mode: str = os.environ.get("LLM_CACHE", CacheMode.USE)
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+def split_material(text: str, chunk_chars: int = MATERIAL_CHUNK_CHARS) -> list[str]:
+    return list(pack_paragraphs(PARAGRAPH_BREAK.split(text), chunk_chars))
+
+
+# Packs paragraphs into chunks of at most `chunk_chars`, keeping paragraphs
+# whole where possible. Lazy, so documents can be chunked while being read.
+def pack_paragraphs(
+    paragraphs: Iterable[str], chunk_chars: int = MATERIAL_CHUNK_CHARS
+) -> Iterator[str]:
+    current: list[str] = []
+    size = 0
+    for paragraph in paragraphs:
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # A single oversized paragraph still has to fit in a request.
+        while len(paragraph) > chunk_chars:
+            yield paragraph[:chunk_chars]
+            paragraph = paragraph[chunk_chars:]
+        if size + len(paragraph) > chunk_chars and current:
+            yield "\n\n".join(current)
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph)
+    if current:
+        yield "\n\n".join(current)
+
+
+def deduplicate_questions(
+    questions: list[CreateQuestionInput],
+) -> list[CreateQuestionInput]:
+    seen: set[tuple[str, str]] = set()
+    unique = []
+    for question in questions:
+        # Generic wording ("Choose the correct sentence:") is only a repeat
+        # with the same answer.
+        key = (question_key(question.question), question_key(question.answer))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(question)
+    return unique
+
+
+class CoursePipeline:
+    def __init__(
+        self,
+        backend: "GeneratorBackend",
+        config: GenerationConfig,
+        cache: ResponseCache | None = None,
+        is_cancelled: Callable[[], bool] = lambda: False,
+        on_progress: Callable[[int], None] = lambda count: None,
+    ):
+        self.backend = backend
+        self.config = config
+        self.cache = cache if config.cache_mode != CacheMode.OFF else None
+        self.is_cancelled = is_cancelled
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._generated: dict[int, int] = {}
+        # Requests that failed for good, after the client's own retries. The
+        # course is still made from the rest, with fewer questions.
+        self.errors: list[Exception] = []
+
+    @traced("generation")
+    def run(self, prompt: str) -> CreateCourseInput:
+        material = split_material(prompt) if len(prompt) > MATERIAL_CHUNK_CHARS else []
+        chunk_count = len(material) or math.ceil(
+            self.config.question_count / self.config.questions_per_chunk
+        )
+
+        outline = self.create_outline(prompt, chunk_count)
+        # The model may plan more or fewer topics than asked for, so the
+        # questions are split over the topics it actually returned.
+        chunks = material or outline.topics[:chunk_count] or [prompt]
+        per_chunk = math.ceil(self.config.question_count / len(chunks))
+
+        questions = self.create_questions(outline, chunks, per_chunk)
+        return CreateCourseInput(
+            name=outline.name,
+            description=outline.description,
+            questions=deduplicate_questions(questions)[: self.config.question_count],
+        )
+
+    def parse(
+        self,
+        messages: list[dict],
+        response_format: type,
+        on_partial: Callable[[dict], None] = lambda parsed: None,
+    ):
+        key = None
+        model = self.backend.model
+        client = self.backend.client
+        if self.cache is not None:
+            key = ResponseCache.key(model, client.base_url, messages, response_format)
+            if self.config.cache_mode == CacheMode.USE:
+                content = self.cache.get(key)
+                if content is not None:
+                    with span("pydantic.validate", "pydantic", schema=response_format.__name__):
+                        return response_format.model_validate_json(content)
+
+        def request(openai):
+            if self.is_cancelled():
+                raise GenerationCancelled()
+            with openai.chat.completions.stream(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+            ) as stream:
+                for event in stream:
+                    if self.is_cancelled():
+                        raise GenerationCancelled()
+                    if event.type == "content.delta" and isinstance(event.parsed, dict):
+                        on_partial(event.parsed)
+                # Validates the streamed content against the pydantic model.
+                with span("pydantic.parse_completion", "pydantic", schema=response_format.__name__):
+                    return stream.get_final_completion()
+
+        completion = client.call(request, self.is_cancelled)
+        parsed = completion.choices[0].message.parsed
+        if parsed is None:
+            raise ValueError(
+                completion.choices[0].message.refusal or "Empty response from model"
+            )
+        if key is not None:
+            self.cache.put(key, parsed.model_dump_json())
+        return parsed
+
+    @traced("generation")
+    def create_outline(self, prompt: str, topic_count: int) -> CreateCourseOutlineInput:
+        return self.parse(
+            [
+                {
+                    "role": "system",
+                    "content": OUTLINE_SYSTEM_PROMPT.format(topic_count=topic_count),
+                },
+                {"role": "user", "content": prompt[:OUTLINE_MATERIAL_CHARS]},
+            ],
+            CreateCourseOutlineInput,
+        )
+
+    def create_questions(
+        self,
+        outline: CreateCourseOutlineInput,
+        chunks: list[str],
+        per_chunk: int,
+    ) -> list[CreateQuestionInput]:
+        system_prompt = QUESTIONS_SYSTEM_PROMPT.format(
+            name=outline.name,
+            description=outline.description,
+            question_count=per_chunk,
+        )
+        results: dict[int, list[CreateQuestionInput]] = {}
+        errors: list[Exception] = []
+
+        with ThreadPoolExecutor(max_workers=max(self.config.concurrency, 1)) as pool:
+            futures = {
+                pool.submit(self.create_chunk_questions, index, system_prompt, chunk): index
+                for index, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except GenerationCancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                except Exception as e:
+                    logger.warning("Generating questions for topic %d failed: %s", futures[future] + 1, e)
+                    errors.append(e)
+
+        if not results and errors:
+            raise errors[0]
+        self.errors.extend(errors)
+        # Keep the order of the topics rather than the order requests finished in.
+        return [question for index in sorted(results) for question in results[index]]
+
+    # Like create_questions, but for chunks read lazily from a document: only a
+    # few chunks are in flight at once and each result is handed to `on_chunk`
+    # as soon as it is ready. Failed chunks are skipped and returned.
+    def create_streamed_questions(
+        self,
+        system_prompt: str,
+        chunks: Iterable[tuple[int, str]],
+        on_chunk: Callable[[int, list[CreateQuestionInput]], None],
+    ) -> list[Exception]:
+        workers = max(self.config.concurrency, 1)
+        chunks = iter(chunks)
+        pending = {}
+        errors: list[Exception] = []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+
+            def submit():
+                while len(pending) < workers * 2:
+                    next_chunk = next(chunks, None)
+                    if next_chunk is None:
+                        return
+                    index, chunk = next_chunk
+                    future = pool.submit(
+                        self.create_chunk_questions, index, system_prompt, chunk
+                    )
+                    pending[future] = index
+
+            submit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        questions = future.result()
+                    except GenerationCancelled:
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    except Exception as e:
+                        logger.warning("Generating questions for chunk %d failed: %s", index + 1, e)
+                        errors.append(e)
+                        continue
+                    on_chunk(index, questions)
+                submit()
+        return errors
+
+    @traced("generation")
+    def create_chunk_questions(
+        self, index: int, system_prompt: str, chunk: str
+    ) -> list[CreateQuestionInput]:
+        if self.is_cancelled():
+            raise GenerationCancelled()
+
+        questions = self.parse(
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": chunk},
+            ],
+            CreateQuestionsInput,
+            # The last question of a partial snapshot may still be streaming,
+            # so only the ones before it are reported as complete.
+            lambda parsed: self.report(index, len(parsed.get("questions") or []) - 1),
+        ).questions
+        self.report(index, len(questions))
+        return questions
+
+    @traced("generation")
+    def create_more_questions(
+        self,
+        name: str,
+        description: str,
+        existing_questions: list[str],
+        question_count: int,
+    ) -> list[CreateQuestionInput]:
+        questions = self.parse(
+            [
+                {
+                    "role": "system",
+                    "content": MORE_QUESTIONS_SYSTEM_PROMPT.format(
+                        name=name,
+                        description=description,
+                        question_count=question_count,
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": "\n".join(
+                        f"- {question}"
+                        for question in existing_questions[:SEED_QUESTION_COUNT]
+                    ),
+                },
+            ],
+            CreateQuestionsInput,
+            lambda parsed: self.report(0, len(parsed.get("questions") or []) - 1),
+        ).questions
+        # Repeats of questions already in the course are left out on insert.
+        return deduplicate_questions(questions)
+
+    def report(self, index: int, count: int):
+        with self._lock:
+            if count <= self._generated.get(index, 0):
+                return
+            self._generated[index] = count
+            # Reported under the lock so listeners see a monotonic count.
+            self.on_progress(sum(self._generated.values()))
+
@@ -0,0 +1,71 @@
+from models.db import ReviewState
+
+DAY = 24 * 60 * 60
+# A forgotten card comes back within the same session instead of tomorrow.
+RELEARN_DELAY = 10 * 60
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# Keeps due dates within what SQLite can store however often a card is passed.
+MAX_INTERVAL = 36500.0
+
+# Answers are right or wrong, so they map onto two SM-2 grades.
+GRADE_CORRECT = 4
+GRADE_INCORRECT = 1
+
+
+def grade_answer(correct: bool) -> int:
+    return GRADE_CORRECT if correct else GRADE_INCORRECT
+
+
+# SM-2 only needs the previous state of the card, so every answer is a
+# constant-time update of a single row.
+def schedule(
+    state: ReviewState | None,
+    question_id: int,
+    course_id: int,
+    grade: int,
+    now: int,
+) -> ReviewState:
+    if state is None:
+        state = ReviewState(
+            question_id=question_id,
+            course_id=course_id,
+            ease=INITIAL_EASE,
+            interval=0.0,
+            repetitions=0,
+            due_at=now,
+            reviewed_at=now,
+        )
+
+    ease = max(
+        MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+    )
+
+    if grade < 3:
+        return ReviewState(
+            question_id=state.question_id,
+            course_id=state.course_id,
+            ease=ease,
+            interval=0.0,
+            repetitions=0,
+            due_at=now + RELEARN_DELAY,
+            reviewed_at=now,
+        )
+
+    repetitions = state.repetitions + 1
+    if repetitions == 1:
+        interval = 1.0
+    elif repetitions == 2:
+        interval = 6.0
+    else:
+        interval = min(state.interval * ease, MAX_INTERVAL)
+
+    return ReviewState(
+        question_id=state.question_id,
+        course_id=state.course_id,
+        ease=ease,
+        interval=interval,
+        repetitions=repetitions,
+        due_at=now + int(interval * DAY),
+        reviewed_at=now,
+    )
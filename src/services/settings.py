@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+import ipaddress
+import os
+from urllib.parse import urlparse
+
+LOCAL_HOSTS = {"localhost", "host.docker.internal"}
+
+
+# Which generator server to use. One instance is shared by the windows, so
+# what the learner enters in the new course window is also what endless mode
+# and the warm-up use. Starts from the environment (and .env).
+@dataclass(slots=True)
+class GeneratorSettings:
+    base_url: str = ""
+    api_key: str = ""
+    model: str = ""
+    # "remote", "local" or empty to pick by the URL.
+    kind: str = ""
+
+    @classmethod
+    def from_env(cls) -> "GeneratorSettings":
+        return cls(
+            os.environ.get("OPENAI_BASE_URL", ""),
+            os.environ.get("OPENAI_API_KEY", ""),
+            os.environ.get("OPENAI_MODEL", ""),
+            os.environ.get("OPENAI_BACKEND", ""),
+        )
+
+    # Decided here rather than in services/backends.py, which imports openai,
+    # so startup can tell whether there is a local server to warm up.
+    def backend_kind(self) -> str:
+        return self.kind or ("local" if is_local_url(self.base_url) else "remote")
+
+
+def is_local_url(base_url: str) -> bool:
+    host = urlparse(base_url).hostname or ""
+    if host in LOCAL_HOSTS:
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
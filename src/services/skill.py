@@ -0,0 +1,45 @@
+import math
+
+# An Elo-style estimate of the learner's skill in a course, on the same 1-5
+# scale as question difficulty: at skill == difficulty a learner who doesn't
+# have to guess answers half of the questions correctly.
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY = 5
+DIFFICULTIES = range(MIN_DIFFICULTY, MAX_DIFFICULTY + 1)
+MIN_SKILL = 0.0
+MAX_SKILL = 6.0
+# Starts in the middle, so a new course opens on medium questions and moves
+# either way after a few answers.
+INITIAL_SKILL = 3.5
+
+# One in four choices is right even when guessing.
+GUESS_CHANCE = 0.25
+# New questions are picked so the learner gets about this many right.
+TARGET_SUCCESS = 0.7
+
+# Large steps while little is known about the learner, settling as answers
+# accumulate.
+INITIAL_STEP = 1.0
+MIN_STEP = 0.2
+STEP_HALF_LIFE = 10
+
+
+def expected_success(skill: float, difficulty: float) -> float:
+    return GUESS_CHANCE + (1 - GUESS_CHANCE) / (1 + math.exp(difficulty - skill))
+
+
+def update_skill(skill: float, answered: int, difficulty: int, correct: bool) -> float:
+    step = max(MIN_STEP, INITIAL_STEP / (1 + answered / STEP_HALF_LIFE))
+    skill += step * (int(correct) - expected_success(skill, difficulty))
+    return min(max(skill, MIN_SKILL), MAX_SKILL)
+
+
+def target_difficulty(skill: float) -> float:
+    success = (TARGET_SUCCESS - GUESS_CHANCE) / (1 - GUESS_CHANCE)
+    return skill - math.log(success / (1 - success))
+
+
+# Difficulties to try, closest to the target first; ties go to the easier one.
+def difficulty_order(skill: float) -> list[int]:
+    target = target_difficulty(skill)
+    return sorted(DIFFICULTIES, key=lambda difficulty: (abs(difficulty - target), difficulty))
@@ -0,0 +1,172 @@
+import os
+from pathlib import Path
+import queue
+import sqlite3
+import threading
+from typing import Callable, TypeVar
+import weakref
+
+T = TypeVar("T")
+
+# Other processes (a second window, the CLI) may hold the write lock for a
+# while, e.g. during a large import, so waiting is generous.
+BUSY_TIMEOUT_MS = int(os.environ.get("CUTE_LEARNING_BUSY_TIMEOUT_MS", 30000))
+READ_POOL_SIZE = int(os.environ.get("CUTE_LEARNING_READ_POOL_SIZE", 4))
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+def open_connection(path: Path, read_only: bool) -> sqlite3.Connection:
+    db = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        # Pooled connections move between threads, one at a time.
+        check_same_thread=False,
+        # sqlite3 only begins a transaction implicitly before the first
+        # INSERT, UPDATE or DELETE, and then takes the write lock right away.
+        # Anything read before that runs outside the transaction, so write
+        # methods that read first must execute BEGIN IMMEDIATE themselves.
+        isolation_level="DEFERRED" if read_only else "IMMEDIATE",
+    )
+    for pragma in PRAGMAS:
+        db.execute(pragma)
+    if read_only:
+        db.execute("PRAGMA query_only = ON")
+    return db
+
+
+# Owned by the thread-local storage of the thread using the connection: when
+# the thread ends it is garbage collected and the connection goes back.
+class _Lease:
+    __slots__ = ("db", "__weakref__")
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+
+# A queued write and, once the writer ran it, its outcome. (Lighter than
+# concurrent.futures, which would pull logging into startup.)
+class _Write:
+    __slots__ = ("function", "done", "result", "error")
+
+    def __init__(self, function: Callable[[sqlite3.Connection], object]):
+        self.function = function
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: BaseException | None = None
+
+
+# All writes of the process go through one writer thread with the only write
+# connection, so they are serialized here instead of fighting over SQLite's
+# lock; only other processes can still make it wait. Every other thread reads
+# through a query-only connection from a pool, which WAL never blocks.
+class ConnectionManager:
+    def __init__(self, path: Path, read_pool_size: int = READ_POOL_SIZE):
+        self.path = path
+        self.read_pool_size = read_pool_size
+        self._idle: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._writes: queue.SimpleQueue | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+
+    # The connection for the calling thread: the write connection on the
+    # writer thread, a leased read connection anywhere else.
+    def connection(self) -> sqlite3.Connection:
+        writer_db = getattr(self._local, "writer_db", None)
+        if writer_db is not None:
+            return writer_db
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            lease = _Lease(self._acquire())
+            weakref.finalize(lease, self._release, lease.db)
+            self._local.lease = lease
+        return lease.db
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._pool_lock:
+            if self._idle:
+                return self._idle.pop()
+        return open_connection(self.path, read_only=True)
+
+    def _release(self, db: sqlite3.Connection):
+        with self._pool_lock:
+            if len(self._idle) < self.read_pool_size:
+                self._idle.append(db)
+                return
+        db.close()
+
+    # Runs `function` with the write connection on the writer thread and
+    # returns its result. Writes made from the writer thread run directly, so
+    # write methods can call each other.
+    def write(self, function: Callable[[sqlite3.Connection], T]) -> T:
+        writer_db = getattr(self._local, "writer_db", None)
+        if writer_db is not None:
+            return function(writer_db)
+        write = _Write(function)
+        with self._writer_lock:
+            if self._writes is None:
+                # Opened here so a database that can't be opened fails the
+                # caller instead of the writer thread.
+                db = open_connection(self.path, read_only=False)
+                self._writes = queue.SimpleQueue()
+                self._writer = threading.Thread(
+                    target=self._run_writer,
+                    args=(db, self._writes),
+                    name="db-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+            self._writes.put(write)
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.result  # type: ignore[return-value]
+
+    def _run_writer(self, db: sqlite3.Connection, writes: queue.SimpleQueue):
+        self._local.writer_db = db
+        try:
+            while True:
+                write = writes.get()
+                if write is None:
+                    return
+                try:
+                    write.result = write.function(db)
+                except BaseException as e:
+                    if db.in_transaction:
+                        db.rollback()
+                    write.error = e
+                finally:
+                    write.done.set()
+        finally:
+            self._local.writer_db = None
+            db.close()
+
+    # Closes the writer and every idle connection, plus the calling thread's
+    # own. Connections are opened again on the next use.
+    def close(self):
+        with self._writer_lock:
+            writer, writes = self._writer, self._writes
+            self._writer = self._writes = None
+        if writer is not None:
+            # Queued behind every pending write, which still completes.
+            writes.put(None)
+            writer.join()
+
+        lease = getattr(self._local, "lease", None)
+        if lease is not None:
+            self._local.lease = None
+            del lease
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+        for db in idle:
+            db.close()
@@ -0,0 +1,194 @@
+import gzip
+import io
+import json
+import sqlite3
+import sys
+from typing import Callable, Iterable, TextIO
+
+from models.db import Course
+from services.skill import MAX_DIFFICULTY, MIN_DIFFICULTY
+from storage.dedup_index import DedupIndex
+from storage.repository import Repository
+
+# A course archive is JSON Lines: a header, then every course followed by its
+# questions. Records are written and read one at a time, so moving a deck
+# never needs more memory than one batch of questions.
+FORMAT = "cute-learning/courses"
+VERSION = 1
+BATCH_SIZE = 1000
+GZIP_LEVEL = 6
+
+
+def open_archive(path: str, mode: str) -> TextIO:
+    if path == "-":
+        stream = sys.stdin.buffer if mode == "r" else sys.stdout.buffer
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=GZIP_LEVEL)
+    return open(path, mode, encoding="utf-8")
+
+
+def export_courses(
+    repository: Repository, file: TextIO, course_ids: Iterable[int] | None = None
+) -> tuple[int, int]:
+    db = repository.connection()
+    if course_ids is None:
+        courses = db.execute(f"SELECT {Course.COLUMNS} FROM course ORDER BY id")
+    else:
+        courses = (
+            row
+            for course_id in course_ids
+            for row in db.execute(
+                f"SELECT {Course.COLUMNS} FROM course WHERE id = ?", (course_id,)
+            )
+        )
+
+    write = file.write
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    write(dumps({"type": "header", "format": FORMAT, "version": VERSION}) + "\n")
+    course_count = question_count = 0
+    for row in courses:
+        course = Course.from_row(row)
+        write(
+            dumps(
+                {
+                    "type": "course",
+                    "name": course.name,
+                    "description": course.description,
+                    "created_at": course.created_at,
+                }
+            )
+            + "\n"
+        )
+        course_count += 1
+        for question, answer, choices, explanation, difficulty, created_at in db.execute(
+            "SELECT question, answer, choices, explanation, difficulty, created_at FROM question WHERE course_id = ? ORDER BY id",
+            (course.id,),
+        ):
+            write(
+                dumps(
+                    {
+                        "type": "question",
+                        "question": question,
+                        "answer": answer,
+                        "choices": json.loads(choices),
+                        "explanation": explanation,
+                        "difficulty": difficulty,
+                        "created_at": created_at,
+                    }
+                )
+                + "\n"
+            )
+            question_count += 1
+    return course_count, question_count
+
+
+# Imports everything in a single transaction, so a broken archive leaves the
+# database untouched. Courses already present (same name and creation time)
+# are skipped, which makes importing the same archive twice harmless.
+# Questions are taken as they are: they are not checked for near-duplicates
+# and have to be added to the dedup index afterwards (see index_questions).
+def import_courses(repository: Repository, file: TextIO) -> tuple[int, int, int]:
+    return repository.write(lambda db: import_archive(db, file))
+
+
+# Must run with the write connection.
+def import_archive(db: sqlite3.Connection, file: TextIO) -> tuple[int, int, int]:
+    course_count = question_count = skipped = 0
+    course_id: int | None = None
+    skipping = False
+    header_seen = False
+    batch: list[tuple] = []
+
+    def flush():
+        db.executemany(
+            "INSERT INTO question (course_id, question, answer, choices, explanation, difficulty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+        batch.clear()
+
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind = record["type"]
+                if not header_seen:
+                    if kind != "header" or record.get("format") != FORMAT:
+                        raise ValueError("not a course archive")
+                    if record.get("version", 0) > VERSION:
+                        raise ValueError(f"unsupported version {record['version']}")
+                    header_seen = True
+                elif kind == "course":
+                    flush()
+                    skipping = (
+                        db.execute(
+                            "SELECT 1 FROM course WHERE created_at = ? AND name = ?",
+                            (record["created_at"], record["name"]),
+                        ).fetchone()
+                        is not None
+                    )
+                    if skipping:
+                        skipped += 1
+                        continue
+                    course_id = db.execute(
+                        "INSERT INTO course (name, description, created_at) VALUES (?, ?, ?)",
+                        (record["name"], record["description"], record["created_at"]),
+                    ).lastrowid
+                    course_count += 1
+                elif kind == "question":
+                    if skipping:
+                        continue
+                    if course_id is None:
+                        raise ValueError("question before any course")
+                    batch.append(
+                        (
+                            course_id,
+                            record["question"],
+                            record["answer"],
+                            json.dumps(record["choices"], ensure_ascii=False),
+                            record["explanation"],
+                            # Questions are only served from difficulties 1-5.
+                            min(max(int(record["difficulty"]), MIN_DIFFICULTY), MAX_DIFFICULTY),
+                            record["created_at"],
+                        )
+                    )
+                    question_count += 1
+                    if len(batch) >= BATCH_SIZE:
+                        flush()
+                else:
+                    raise ValueError(f"unknown record type {kind!r}")
+            except KeyError as e:
+                raise ValueError(f"Line {line_number}: missing field {e}") from e
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+        flush()
+    return course_count, question_count, skipped
+
+
+# Adds questions missing from the dedup index, one committed batch at a time,
+# so an interrupted run just continues where it stopped next time.
+def index_questions(
+    repository: Repository,
+    on_progress: Callable[[int, int], None] = lambda done, total: None,
+    is_cancelled: Callable[[], bool] = lambda: False,
+) -> int:
+    total = DedupIndex(repository.connection()).count_missing()
+    done = last_id = 0
+
+    def add_batch(db: sqlite3.Connection) -> list[int]:
+        with db:
+            # Another process may be indexing the same questions.
+            db.execute("BEGIN IMMEDIATE")
+            return DedupIndex(db).add_missing(last_id, BATCH_SIZE)
+
+    while not is_cancelled():
+        question_ids = repository.write(add_batch)
+        if not question_ids:
+            return done
+        last_id = question_ids[-1]
+        done += len(question_ids)
+        on_progress(done, total)
+    return done
@@ -0,0 +1,173 @@
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+from typing import Iterable
+import zlib
+
+# MinHash signatures of question texts, split into LSH bands. Two questions
+# only become candidates when a whole band matches, which is an index lookup,
+# so checking a new question never scans the question bank. Only the bands
+# are stored; a question is indexed once it has rows in question_lsh.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 4
+# Jaccard similarity of the shingle sets above which two question texts are
+# considered the same. Checked exactly on candidates, since the estimate from
+# 64 signature slots is off by several points either way.
+DUPLICATE_SIMILARITY = 0.8
+
+# Shingle hashes are scrambled by an odd multiplier (a bijection on 32-bit
+# values); the top bits pick the slot and the rest are compared.
+_MULTIPLIER = 0x9E3779B1
+_SLOT_BITS = NUM_PERMUTATIONS.bit_length() - 1
+_VALUE_BITS = 32 - _SLOT_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+# The order in which each empty slot looks for a full one to borrow from.
+_random = random.Random(20240101)
+_DONORS = [
+    _random.sample(range(NUM_PERMUTATIONS), NUM_PERMUTATIONS) for _ in range(NUM_PERMUTATIONS)
+]
+
+Signature = tuple[int, ...]
+
+
+def question_key(question: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", question.casefold()).split())
+
+
+def shingles(text: str) -> set[int]:
+    key = f" {question_key(text)} "
+    if len(key) <= SHINGLE_SIZE:
+        return {zlib.crc32(key.encode())}
+    return {
+        zlib.crc32(key[i : i + SHINGLE_SIZE].encode())
+        for i in range(len(key) - SHINGLE_SIZE + 1)
+    }
+
+
+# One permutation hashing: every shingle is hashed once into one of the
+# slots, which keep their smallest value, instead of once per permutation.
+# Short texts leave slots empty; each borrows from the first full slot in its
+# own random order, so borrowed values don't line up into whole matching
+# bands the way copying a neighbour would (optimal densification).
+def minhash(text: str) -> Signature:
+    slots: list[int | None] = [None] * NUM_PERMUTATIONS
+    for shingle in shingles(text):
+        scrambled = (shingle * _MULTIPLIER) & 0xFFFFFFFF
+        slot = scrambled >> _VALUE_BITS
+        value = scrambled & _VALUE_MASK
+        current = slots[slot]
+        if current is None or value < current:
+            slots[slot] = value
+    if None in slots:
+        full = slots.copy()
+        for slot, value in enumerate(full):
+            if value is None:
+                # Offset by the attempt, so a borrowed value never equals the
+                # donor's own.
+                for attempt, donor in enumerate(_DONORS[slot], 1):
+                    if full[donor] is not None:
+                        slots[slot] = full[donor] + (attempt << _VALUE_BITS)
+                        break
+    return tuple(slots)
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    return len(a & b) / len(a | b)
+
+
+# Text alone can't tell "When did World War I start?" from "...World War II
+# start?", so a duplicate must also have the same answer.
+def is_duplicate(question: str, answer: str, other_question: str, other_answer: str) -> bool:
+    return (
+        question_key(answer) == question_key(other_answer)
+        and jaccard(shingles(question), shingles(other_question)) >= DUPLICATE_SIMILARITY
+    )
+
+
+def band_buckets(signature: Signature) -> list[tuple[int, int]]:
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            struct.pack(f"<{ROWS_PER_BAND}q", *rows), digest_size=8
+        ).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+# Only questions of the same course count as duplicates: the same question in
+# another course may well belong there too.
+class DedupIndex:
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def find_duplicate(
+        self, course_id: int, question: str, answer: str, signature: Signature
+    ) -> int | None:
+        buckets = band_buckets(signature)
+        candidates = self.db.execute(
+            f"WITH probe (band, bucket) AS (VALUES {', '.join(['(?, ?)'] * len(buckets))})"
+            " SELECT DISTINCT question.id, question.question, question.answer"
+            " FROM probe"
+            " JOIN question_lsh ON question_lsh.band = probe.band AND question_lsh.bucket = probe.bucket"
+            " JOIN question ON question.id = question_lsh.question_id"
+            " WHERE question.course_id = ?",
+            [value for bucket in buckets for value in bucket] + [course_id],
+        )
+        for question_id, other_question, other_answer in candidates:
+            if is_duplicate(question, answer, other_question, other_answer):
+                return question_id
+        return None
+
+    # Marks which (question, answer) pairs are new to the course, both against
+    # the index and against the ones earlier in the same batch.
+    def unique(
+        self,
+        course_id: int,
+        questions: list[tuple[str, str]],
+        signatures: list[Signature],
+    ) -> list[bool]:
+        batch: dict[tuple[int, int], list[int]] = {}
+        keep = []
+        for index, ((question, answer), signature) in enumerate(zip(questions, signatures)):
+            buckets = band_buckets(signature)
+            candidates = {other for bucket in buckets for other in batch.get(bucket, ())}
+            duplicate = any(
+                is_duplicate(question, answer, *questions[other]) for other in candidates
+            ) or self.find_duplicate(course_id, question, answer, signature) is not None
+            keep.append(not duplicate)
+            if not duplicate:
+                for bucket in buckets:
+                    batch.setdefault(bucket, []).append(index)
+        return keep
+
+    def add(self, entries: Iterable[tuple[int, Signature]]):
+        self.db.executemany(
+            "INSERT OR IGNORE INTO question_lsh (band, bucket, question_id) VALUES (?, ?, ?)",
+            (
+                (band, bucket, question_id)
+                for question_id, signature in entries
+                for band, bucket in band_buckets(signature)
+            ),
+        )
+
+    # Indexes up to `limit` questions after `after_id` that aren't in the
+    # index yet, e.g. ones bulk imported without deduplication. Returns their
+    # ids.
+    def add_missing(self, after_id: int = 0, limit: int = 1000) -> list[int]:
+        rows = self.db.execute(
+            "SELECT id, question FROM question WHERE id > ? AND NOT EXISTS (SELECT 1 FROM question_lsh WHERE question_id = question.id) ORDER BY id LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+        self.add((question_id, minhash(question)) for question_id, question in rows)
+        return [question_id for question_id, _ in rows]
+
+    def count_missing(self) -> int:
+        (count,) = self.db.execute(
+            "SELECT COUNT(*) FROM question WHERE NOT EXISTS (SELECT 1 FROM question_lsh WHERE question_id = question.id)"
+        ).fetchone()
+        return count
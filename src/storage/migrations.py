@@ -0,0 +1,480 @@
+import ast
+import json
+import sqlite3
+from typing import Callable
+
+from services.skill import INITIAL_SKILL, update_skill
+from storage.dedup_index import DedupIndex, minhash
+
+
+def create_tables(db: sqlite3.Connection):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS course (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        );
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS question (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            choices TEXT NOT NULL,
+            explanation TEXT NOT NULL,
+            difficulty INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+
+def create_indexes(db: sqlite3.Connection):
+    db.execute("CREATE INDEX IF NOT EXISTS question_course_id ON question (course_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS course_created_at ON course (created_at)")
+
+
+def encode_choices_as_json(db: sqlite3.Connection):
+    # Choices used to be stored as the repr() of a Python list. literal_eval
+    # reads both that and JSON arrays, so rows in either format are rewritten.
+    rows = db.execute("SELECT id, choices FROM question").fetchall()
+    db.executemany(
+        "UPDATE question SET choices = ? WHERE id = ?",
+        (
+            (json.dumps(ast.literal_eval(choices), ensure_ascii=False), question_id)
+            for question_id, choices in rows
+        ),
+    )
+
+
+def create_course_name_index(db: sqlite3.Connection):
+    # NOCASE so the default case-insensitive LIKE 'prefix%' can use it.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS course_name ON course (name COLLATE NOCASE)"
+    )
+
+
+def create_review_tables(db: sqlite3.Connection):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS review_state (
+            question_id INTEGER PRIMARY KEY,
+            course_id INTEGER NOT NULL,
+            ease REAL NOT NULL,
+            interval REAL NOT NULL,
+            repetitions INTEGER NOT NULL,
+            due_at INTEGER NOT NULL,
+            reviewed_at INTEGER NOT NULL,
+            FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
+        );
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS review_state_due_at ON review_state (due_at)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS review_state_course_id_due_at ON review_state (course_id, due_at)"
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS review_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            grade INTEGER NOT NULL,
+            reviewed_at INTEGER NOT NULL,
+            FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
+        );
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS review_log_question_id ON review_log (question_id)"
+    )
+
+
+def create_dedup_index(db: sqlite3.Connection):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS question_signature (
+            question_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE
+        );
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS question_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, question_id),
+            FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS question_lsh_question_id ON question_lsh (question_id)"
+    )
+    DedupIndex(db).add(
+        (question_id, minhash(question))
+        for question_id, question in db.execute("SELECT id, question FROM question")
+    )
+
+
+def create_search_index(db: sqlite3.Connection):
+    # External content tables: the text lives only in course/question, the
+    # triggers keep the full-text index in sync with every write.
+    for table, columns in (
+        ("course", ("name", "description")),
+        ("question", ("question", "explanation")),
+    ):
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        db.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5 (
+                {column_list},
+                content = '{table}',
+                content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            );
+            """
+        )
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.id, {new_values});
+            END;
+            """
+        )
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END;
+            """
+        )
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.id, {new_values});
+            END;
+            """
+        )
+        db.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+def create_import_tables(db: sqlite3.Connection):
+    # Checkpoints of document imports: once a chunk's questions are stored
+    # here it is never sent to the model again, even across restarts.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_job (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            size INTEGER NOT NULL,
+            modified_at INTEGER NOT NULL,
+            questions_per_chunk INTEGER NOT NULL,
+            name TEXT,
+            description TEXT,
+            created_at INTEGER NOT NULL
+        );
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_chunk (
+            job_id INTEGER NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            questions TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (job_id, chunk_index),
+            FOREIGN KEY (job_id) REFERENCES import_job (id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+# Badges are data: a later migration can add one with a plain INSERT, as long
+# as its metric is a column the learner_stats_badges trigger knows about.
+BADGES = (
+    ("first_answer", "First steps", "Answer your first question", "answered", 1),
+    ("answered_100", "Centurion", "Answer 100 questions", "answered", 100),
+    ("answered_1000", "Dedicated", "Answer 1000 questions", "answered", 1000),
+    ("correct_500", "Sharp mind", "Answer 500 questions correctly", "correct", 500),
+    ("streak_3", "Warming up", "Study 3 days in a row", "current_streak", 3),
+    ("streak_7", "One week", "Study 7 days in a row", "current_streak", 7),
+    ("streak_30", "One month", "Study 30 days in a row", "current_streak", 30),
+    ("streak_365", "One year", "Study 365 days in a row", "current_streak", 365),
+    ("active_days_30", "Regular", "Study on 30 different days", "active_days", 30),
+)
+
+
+def create_stats_tables(db: sqlite3.Connection):
+    # Aggregates over review_log, kept up to date by triggers so reading any
+    # statistic is a primary key lookup however long the history is.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS course_stats (
+            course_id INTEGER PRIMARY KEY,
+            answered INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            last_answered_at INTEGER NOT NULL,
+            FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
+        );
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS course_stats_last_answered_at ON course_stats (last_answered_at)"
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS difficulty_stats (
+            difficulty INTEGER PRIMARY KEY,
+            answered INTEGER NOT NULL,
+            correct INTEGER NOT NULL
+        );
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_activity (
+            day TEXT PRIMARY KEY,
+            answered INTEGER NOT NULL,
+            correct INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS learner_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            answered INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            current_streak INTEGER NOT NULL,
+            longest_streak INTEGER NOT NULL,
+            active_days INTEGER NOT NULL,
+            last_day TEXT,
+            updated_at INTEGER NOT NULL
+        );
+        """
+    )
+    db.execute(
+        "INSERT OR IGNORE INTO learner_stats VALUES (1, 0, 0, 0, 0, 0, NULL, 0)"
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS badge (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            threshold INTEGER NOT NULL,
+            earned_at INTEGER
+        ) WITHOUT ROWID;
+        """
+    )
+    db.executemany(
+        "INSERT OR IGNORE INTO badge (id, title, description, metric, threshold) VALUES (?, ?, ?, ?, ?)",
+        BADGES,
+    )
+
+    # Days are local calendar days, so a streak follows the learner's clock.
+    day = "date(new.reviewed_at, 'unixepoch', 'localtime')"
+    streak = f"""
+        CASE
+            WHEN last_day >= {day} THEN current_streak
+            WHEN last_day = date({day}, '-1 day') THEN current_streak + 1
+            ELSE 1
+        END
+    """
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS review_log_stats AFTER INSERT ON review_log BEGIN
+            INSERT INTO course_stats (course_id, answered, correct, last_answered_at)
+            VALUES (new.course_id, 1, new.correct, new.reviewed_at)
+            ON CONFLICT (course_id) DO UPDATE SET
+                answered = answered + 1,
+                correct = correct + excluded.correct,
+                last_answered_at = MAX(last_answered_at, excluded.last_answered_at);
+
+            INSERT INTO difficulty_stats (difficulty, answered, correct)
+            SELECT difficulty, 1, new.correct FROM question WHERE id = new.question_id
+            ON CONFLICT (difficulty) DO UPDATE SET
+                answered = answered + 1,
+                correct = correct + excluded.correct;
+
+            INSERT INTO daily_activity (day, answered, correct)
+            VALUES ({day}, 1, new.correct)
+            ON CONFLICT (day) DO UPDATE SET
+                answered = answered + 1,
+                correct = correct + excluded.correct;
+
+            UPDATE learner_stats SET
+                answered = answered + 1,
+                correct = correct + new.correct,
+                current_streak = {streak},
+                longest_streak = MAX(longest_streak, {streak}),
+                active_days = active_days + (COALESCE(last_day, '') < {day}),
+                last_day = MAX(COALESCE(last_day, ''), {day}),
+                updated_at = new.reviewed_at
+            WHERE id = 1;
+        END;
+        """
+    )
+    db.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS learner_stats_badges AFTER UPDATE ON learner_stats BEGIN
+            UPDATE badge SET earned_at = new.updated_at
+            WHERE earned_at IS NULL AND threshold <= CASE metric
+                WHEN 'answered' THEN new.answered
+                WHEN 'correct' THEN new.correct
+                WHEN 'current_streak' THEN new.current_streak
+                WHEN 'active_days' THEN new.active_days
+            END;
+        END;
+        """
+    )
+
+    # Replays the existing history through the trigger, oldest first.
+    db.execute("CREATE TEMP TABLE review_log_replay AS SELECT * FROM review_log")
+    db.execute("DELETE FROM review_log")
+    db.execute(
+        "INSERT INTO review_log SELECT * FROM review_log_replay ORDER BY reviewed_at, id"
+    )
+    db.execute("DROP TABLE review_log_replay")
+
+
+def create_skill_tables(db: sqlite3.Connection):
+    # New questions are picked by difficulty, one index seek per bucket.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS question_course_id_difficulty ON question (course_id, difficulty, id)"
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS course_skill (
+            course_id INTEGER PRIMARY KEY,
+            skill REAL NOT NULL,
+            answered INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL,
+            FOREIGN KEY (course_id) REFERENCES course(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    # Replays the first answer to every question, like record_review does.
+    skills: dict[int, tuple[float, int, int]] = {}
+    rows = db.execute(
+        """
+        SELECT review_log.course_id, question.difficulty, review_log.correct, review_log.reviewed_at
+        FROM review_log JOIN question ON question.id = review_log.question_id
+        WHERE review_log.id IN (SELECT MIN(id) FROM review_log GROUP BY question_id)
+        ORDER BY review_log.id
+        """
+    )
+    for course_id, difficulty, correct, reviewed_at in rows:
+        skill, answered, _ = skills.get(course_id, (INITIAL_SKILL, 0, 0))
+        skills[course_id] = (
+            update_skill(skill, answered, difficulty, bool(correct)),
+            answered + 1,
+            reviewed_at,
+        )
+    db.executemany(
+        "INSERT INTO course_skill (course_id, skill, answered, updated_at) VALUES (?, ?, ?, ?)",
+        [(course_id, *values) for course_id, values in skills.items()],
+    )
+
+
+def rebuild_dedup_index(db: sqlite3.Connection):
+    # Signatures were only kept to compute the bands, and bands from the old
+    # MinHash don't match the current one. Dropping the table is much faster
+    # than deleting its rows; the app indexes every question again in the
+    # background (see index_questions).
+    db.execute("DROP TABLE question_signature")
+    db.execute("DROP TABLE question_lsh")
+    db.execute(
+        """
+        CREATE TABLE question_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, question_id),
+            FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    db.execute("CREATE INDEX question_lsh_question_id ON question_lsh (question_id)")
+
+
+def drop_course_name_index(db: sqlite3.Connection):
+    # Course search uses course_fts, so this index only slowed down inserts.
+    db.execute("DROP INDEX IF EXISTS course_name")
+
+
+def track_answered_questions(db: sqlite3.Connection):
+    # Picking new questions with NOT EXISTS on review_state walked past every
+    # answered question of the course first. Partial indexes hold only the
+    # questions never answered, so the first entry is always a new question.
+    db.execute("ALTER TABLE question ADD COLUMN first_answered_at INTEGER")
+    db.execute(
+        """
+        UPDATE question SET first_answered_at = COALESCE(
+            (SELECT MIN(reviewed_at) FROM review_log WHERE review_log.question_id = question.id),
+            review_state.reviewed_at
+        )
+        FROM review_state WHERE review_state.question_id = question.id
+        """
+    )
+    db.execute("DROP INDEX IF EXISTS question_course_id_difficulty")
+    db.execute(
+        "CREATE INDEX question_new ON question (course_id, id) WHERE first_answered_at IS NULL"
+    )
+    db.execute(
+        "CREATE INDEX question_new_difficulty ON question (course_id, difficulty, id) WHERE first_answered_at IS NULL"
+    )
+
+
+# Each entry upgrades the schema by one version. Never edit or reorder an
+# entry once released; append a new one instead.
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    create_tables,
+    create_indexes,
+    encode_choices_as_json,
+    create_course_name_index,
+    create_review_tables,
+    create_dedup_index,
+    create_search_index,
+    create_import_tables,
+    create_stats_tables,
+    create_skill_tables,
+    rebuild_dedup_index,
+    drop_course_name_index,
+    track_answered_questions,
+]
+
+
+def migrate(db: sqlite3.Connection):
+    while True:
+        with db:
+            # Take the write lock before reading the version so concurrent
+            # processes cannot apply the same migration twice.
+            db.execute("BEGIN IMMEDIATE")
+            (version,) = db.execute("PRAGMA user_version").fetchone()
+            if version >= len(MIGRATIONS):
+                return
+            MIGRATIONS[version](db)
+            db.execute(f"PRAGMA user_version = {version + 1}")
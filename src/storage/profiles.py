@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+import re
+import sqlite3
+import sys
+import tempfile
+
+APP_NAME = "cute-learning"
+DEFAULT_PROFILE = "default"
+DATABASE_FILE_NAME = "db.sqlite3"
+# Where the database used to live, inside the source tree.
+LEGACY_DATABASE = Path(__file__).parent.parent / DATABASE_FILE_NAME
+PROFILE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+
+# CUTE_LEARNING_DATA_DIR, or the per-user data directory of the platform.
+def data_dir() -> Path:
+    configured = os.environ.get("CUTE_LEARNING_DATA_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    if sys.platform == "win32":
+        base = Path(os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share")
+    return base / APP_NAME
+
+
+def profile_name(profile: str | None = None) -> str:
+    name = profile or os.environ.get("CUTE_LEARNING_PROFILE") or DEFAULT_PROFILE
+    if not PROFILE_NAME.fullmatch(name):
+        raise ValueError(
+            f"Invalid profile name {name!r}: use letters, digits, '.', '-' and '_'"
+        )
+    return name
+
+
+def profile_dir(profile: str | None = None) -> Path:
+    return data_dir() / "profiles" / profile_name(profile)
+
+
+def list_profiles() -> list[str]:
+    profiles = data_dir() / "profiles"
+    if not profiles.is_dir():
+        return []
+    return sorted(
+        path.name
+        for path in profiles.iterdir()
+        if (path / DATABASE_FILE_NAME).exists()
+    )
+
+
+# The database of a profile, created on first use. CUTE_LEARNING_DB still
+# points at a single file and bypasses profiles (benchmarks use it). The
+# default profile starts from the legacy database in the source tree, if any.
+def database_path(profile: str | None = None) -> Path:
+    configured = os.environ.get("CUTE_LEARNING_DB")
+    if configured:
+        return Path(configured).expanduser()
+
+    name = profile_name(profile)
+    path = profile_dir(name) / DATABASE_FILE_NAME
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if name == DEFAULT_PROFILE and LEGACY_DATABASE.exists():
+            copy_database(LEGACY_DATABASE, path)
+    return path
+
+
+# Copies through SQLite's backup API, so changes still in the WAL of the
+# source are included, and publishes the copy atomically: when two processes
+# start at once only one copy ends up in place.
+def copy_database(source: Path, target: Path):
+    fd, temporary = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".tmp", dir=target.parent
+    )
+    os.close(fd)
+    try:
+        source_db = sqlite3.connect(f"{source.as_uri()}?mode=ro", uri=True)
+        target_db = sqlite3.connect(temporary)
+        try:
+            source_db.backup(target_db)
+        finally:
+            target_db.close()
+            source_db.close()
+        try:
+            os.link(temporary, target)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(temporary)
@@ -0,0 +1,117 @@
+from collections import deque
+import time
+
+from models.db import Question
+from services.skill import DIFFICULTIES, difficulty_order
+from storage.repository import Repository
+
+PAGE_SIZE = 50
+LOW_WATERMARK = 10
+# New questions are kept per difficulty, so smaller pages keep the total
+# buffered close to a single page.
+BUCKET_PAGE_SIZE = 10
+# How often a running session looks again for cards that became due since,
+# e.g. ones answered wrong a few minutes ago (see RELEARN_DELAY).
+DUE_RECHECK_SECONDS = 30
+
+
+class QuestionStream:
+    def __init__(
+        self,
+        repository: Repository,
+        course_id: int | None,
+        page_size: int = PAGE_SIZE,
+        low_watermark: int = LOW_WATERMARK,
+    ):
+        self.repository = repository
+        self.course_id = course_id
+        self.page_size = page_size
+        self.low_watermark = low_watermark
+        self.queue: deque[Question] = deque()
+        # Only moves forward on a recheck. Cards answered since are due later
+        # than everything already read, so the keyset below still holds.
+        self.now = int(time.time())
+        self.due_after = (-1, 0)
+        self.due_exhausted = False
+        self.buckets: dict[int, deque[Question]] = {
+            difficulty: deque() for difficulty in DIFFICULTIES
+        }
+        self.last_ids = dict.fromkeys(DIFFICULTIES, 0)
+        self.drained: set[int] = set()
+        # Reviewing across all courses only serves due cards.
+        self.exhausted = course_id is None
+
+    def __len__(self) -> int:
+        return len(self.queue) + sum(map(len, self.buckets.values()))
+
+    # Due cards come first, then cards never seen before. Both are keyset
+    # paginated so every page is an index range scan, no matter how far into
+    # the course the learner is.
+    def fill(self):
+        if not self.due_exhausted:
+            due = self.repository.fetch_due_questions(
+                self.course_id, self.now, self.due_after, self.page_size
+            )
+            if len(due) < self.page_size:
+                self.due_exhausted = True
+            if due:
+                due_at, question = due[-1]
+                self.due_after = (due_at, question.id)
+                self.queue.extend(question for _, question in due)
+                return
+
+        if self.exhausted:
+            return
+        for difficulty, bucket in self.buckets.items():
+            if not bucket:
+                self.fill_bucket(difficulty)
+
+    def fill_bucket(self, difficulty: int):
+        if difficulty in self.drained:
+            return
+        page = self.repository.fetch_new_questions_by_difficulty(
+            self.course_id,
+            difficulty,
+            after_id=self.last_ids[difficulty],
+            limit=BUCKET_PAGE_SIZE,
+        )
+        if len(page) < BUCKET_PAGE_SIZE:
+            self.drained.add(difficulty)
+            self.exhausted = len(self.drained) == len(self.buckets)
+        if page:
+            self.last_ids[difficulty] = page[-1].id
+            self.buckets[difficulty].extend(page)
+
+    # New questions were added to the course after the stream ran dry.
+    def resume(self):
+        self.drained.clear()
+        self.exhausted = self.course_id is None
+
+    # Lets the next fill pick up cards that became due after the session
+    # started, continuing after the last due card already read.
+    def recheck_due(self):
+        now = int(time.time())
+        if self.due_exhausted and now - self.now >= DUE_RECHECK_SECONDS:
+            self.now = now
+            self.due_exhausted = False
+
+    def pop(self) -> Question | None:
+        if len(self.queue) <= self.low_watermark:
+            self.recheck_due()
+            if not self.due_exhausted:
+                self.fill()
+        if self.queue:
+            return self.queue.popleft()
+        if self.course_id is None:
+            return None
+
+        # New questions come from the difficulty closest to where the learner
+        # is now, falling back to the nearest ones once it runs out.
+        skill = self.repository.fetch_course_skill(self.course_id).skill
+        for difficulty in difficulty_order(skill):
+            bucket = self.buckets[difficulty]
+            if not bucket:
+                self.fill_bucket(difficulty)
+            if bucket:
+                return bucket.popleft()
+        return None
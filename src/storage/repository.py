@@ -0,0 +1,532 @@
+import functools
+import json
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from models.db import (
+    Badge,
+    Course,
+    CourseSkill,
+    ImportJob,
+    LearnerStats,
+    Question,
+    ReviewState,
+)
+from services.scheduler import grade_answer, schedule
+from services.skill import INITIAL_SKILL, update_skill
+from storage.connections import ConnectionManager
+from storage.dedup_index import DedupIndex, minhash
+from storage.migrations import migrate
+from tracing import traced
+
+if TYPE_CHECKING:
+    from models.ai import CreateCourseInput, CreateQuestionInput
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable)
+
+
+# Courses are ranked by their best question hit, and only the best hits are
+# grouped, so common words don't make a search walk the whole question bank.
+SEARCH_QUESTION_HITS = 2000
+
+
+# Turns what the user typed into an FTS5 query: every word must match, and
+# the last one is a prefix since it may still be being typed.
+def fts_query(text: str) -> str:
+    words = re.findall(r"\w+", text)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# Runs the method on the writer thread, where connection() is the write
+# connection. Everything that modifies the database must be marked with it.
+def writes(method: F) -> F:
+    @functools.wraps(method)
+    def wrapper(self: "Repository", *args, **kwargs):
+        return self.write(lambda db: method(self, *args, **kwargs))
+
+    return wrapper  # type: ignore[return-value]
+
+
+class Repository:
+    def __init__(self, path: Path):
+        self.path = path
+        self.connections = ConnectionManager(path)
+
+    # Read-only, except on the writer thread (see storage/connections.py).
+    def connection(self) -> sqlite3.Connection:
+        return self.connections.connection()
+
+    def write(self, function: Callable[[sqlite3.Connection], T]) -> T:
+        return self.connections.write(function)
+
+    def close(self):
+        self.connections.close()
+
+    @traced("db")
+    @writes
+    def migrate(self):
+        migrate(self.connection())
+
+    # Newest first. `after` is the (created_at, id) of the last row already
+    # shown, so each page is a single index range scan.
+    @traced("db")
+    def fetch_course_page(
+        self, after: tuple | None = None, limit: int = 100
+    ) -> list[tuple[int, str, int]]:
+        sql = "SELECT id, name, created_at FROM course"
+        params: tuple = ()
+        if after is not None:
+            sql += " WHERE (created_at, id) < (?, ?)"
+            params += after
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        return self.connection().execute(sql, params + (limit,)).fetchall()
+
+    # Courses matching the query in their own name/description or in any of
+    # their questions, best match first.
+    @traced("db")
+    def search_courses(
+        self, query: str, offset: int = 0, limit: int = 100
+    ) -> list[tuple[int, str, int]]:
+        match = fts_query(query)
+        if not match:
+            return []
+        return self.connection().execute(
+            """
+            WITH hits (course_id, score) AS (
+                SELECT rowid, bm25(course_fts, 10.0, 2.0)
+                FROM course_fts WHERE course_fts MATCH :match
+                UNION ALL
+                SELECT question.course_id, score FROM (
+                    SELECT rowid AS question_id, bm25(question_fts, 4.0, 1.0) AS score
+                    FROM question_fts WHERE question_fts MATCH :match
+                    ORDER BY score LIMIT :question_hits
+                ) JOIN question ON question.id = question_id
+            )
+            SELECT course.id, course.name, course.created_at
+            FROM (SELECT course_id, MIN(score) AS score FROM hits GROUP BY course_id) AS best
+            JOIN course ON course.id = best.course_id
+            ORDER BY best.score, course.id
+            LIMIT :limit OFFSET :offset
+            """,
+            {
+                "match": match,
+                "question_hits": SEARCH_QUESTION_HITS,
+                "limit": limit,
+                "offset": offset,
+            },
+        ).fetchall()
+
+    @traced("db")
+    def search_questions(self, query: str, limit: int = 50) -> list[Question]:
+        match = fts_query(query)
+        if not match:
+            return []
+        columns = ", ".join(f"question.{column}" for column in Question.COLUMNS.split(", "))
+        rows = self.connection().execute(
+            f"SELECT {columns} FROM question_fts JOIN question ON question.id = question_fts.rowid"
+            " WHERE question_fts MATCH ? ORDER BY bm25(question_fts, 4.0, 1.0) LIMIT ?",
+            (match, limit),
+        )
+        return list(map(Question.from_row, rows))
+
+    @traced("db")
+    def fetch_course(self, course_id: int) -> Course | None:
+        course = (
+            self.connection()
+            .execute(f"SELECT {Course.COLUMNS} FROM course WHERE id = ?", (course_id,))
+            .fetchone()
+        )
+        if course:
+            return Course.from_row(course)
+        else:
+            return None
+
+    @traced("db")
+    def fetch_questions(
+        self, course_id: int, after_id: int = 0, limit: int = -1
+    ) -> list[Question]:
+        questions = self.connection().execute(
+            f"SELECT {Question.COLUMNS} FROM question WHERE course_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (course_id, after_id, limit),
+        )
+        return list(map(Question.from_row, questions))
+
+    # Questions the learner has never answered, in insertion order.
+    @traced("db")
+    def fetch_new_questions(
+        self, course_id: int, after_id: int = 0, limit: int = -1
+    ) -> list[Question]:
+        questions = self.connection().execute(
+            f"SELECT {Question.COLUMNS} FROM question WHERE course_id = ? AND id > ? AND first_answered_at IS NULL ORDER BY id LIMIT ?",
+            (course_id, after_id, limit),
+        )
+        return list(map(Question.from_row, questions))
+
+    # Like fetch_new_questions, restricted to one difficulty. Both walk
+    # partial indexes of the questions never answered, so picking from any
+    # bucket is a seek however much of the course is done.
+    @traced("db")
+    def fetch_new_questions_by_difficulty(
+        self, course_id: int, difficulty: int, after_id: int = 0, limit: int = -1
+    ) -> list[Question]:
+        questions = self.connection().execute(
+            f"SELECT {Question.COLUMNS} FROM question WHERE course_id = ? AND difficulty = ? AND id > ? AND first_answered_at IS NULL ORDER BY id LIMIT ?",
+            (course_id, difficulty, after_id, limit),
+        )
+        return list(map(Question.from_row, questions))
+
+    @traced("db")
+    def fetch_course_skill(self, course_id: int) -> CourseSkill:
+        row = (
+            self.connection()
+            .execute(
+                f"SELECT {CourseSkill.COLUMNS} FROM course_skill WHERE course_id = ?",
+                (course_id,),
+            )
+            .fetchone()
+        )
+        return CourseSkill.from_row(row) if row else CourseSkill(course_id, INITIAL_SKILL, 0)
+
+    # Questions due by `now`, most overdue first. `after` is the
+    # (due_at, question_id) of the last question already returned. Without a
+    # course this walks the global due_at index, across all courses.
+    @traced("db")
+    def fetch_due_questions(
+        self,
+        course_id: int | None,
+        now: int,
+        after: tuple[int, int] = (-1, 0),
+        limit: int = -1,
+    ) -> list[tuple[int, Question]]:
+        columns = ", ".join(f"question.{column}" for column in Question.COLUMNS.split(", "))
+        sql = f"SELECT review_state.due_at, {columns} FROM review_state JOIN question ON question.id = review_state.question_id WHERE review_state.due_at <= ? AND (review_state.due_at, review_state.question_id) > (?, ?)"
+        params: tuple = (now, *after)
+        if course_id is not None:
+            sql += " AND review_state.course_id = ?"
+            params += (course_id,)
+        sql += " ORDER BY review_state.due_at, review_state.question_id LIMIT ?"
+        rows = self.connection().execute(sql, params + (limit,))
+        return [(row[0], Question.from_row(row[1:])) for row in rows]
+
+    @traced("db")
+    def next_due_question(self, now: int) -> Question | None:
+        due = self.fetch_due_questions(None, now, limit=1)
+        return due[0][1] if due else None
+
+    @traced("db")
+    def fetch_review_state(self, question_id: int) -> ReviewState | None:
+        state = (
+            self.connection()
+            .execute(
+                f"SELECT {ReviewState.COLUMNS} FROM review_state WHERE question_id = ?",
+                (question_id,),
+            )
+            .fetchone()
+        )
+        return ReviewState.from_row(state) if state else None
+
+    @traced("db")
+    @writes
+    def record_review(self, question: Question, correct: bool) -> ReviewState:
+        db = self.connection()
+        now = int(time.time())
+        grade = grade_answer(correct)
+        with db:
+            # The previous state must not change before the new one is saved,
+            # e.g. by the same question answered in a second window.
+            db.execute("BEGIN IMMEDIATE")
+            previous = self.fetch_review_state(question.id)
+            state = schedule(
+                previous,
+                question.id,
+                question.course_id,
+                grade,
+                now,
+            )
+            db.execute(
+                f"INSERT OR REPLACE INTO review_state ({ReviewState.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    state.question_id,
+                    state.course_id,
+                    state.ease,
+                    state.interval,
+                    state.repetitions,
+                    state.due_at,
+                    state.reviewed_at,
+                ),
+            )
+            db.execute(
+                "INSERT INTO review_log (question_id, course_id, correct, grade, reviewed_at) VALUES (?, ?, ?, ?, ?)",
+                (question.id, question.course_id, int(correct), grade, now),
+            )
+            # Only first answers move the skill estimate; later ones say more
+            # about memory than about the level the learner is at.
+            if previous is None:
+                db.execute(
+                    "UPDATE question SET first_answered_at = ? WHERE id = ?",
+                    (now, question.id),
+                )
+                skill = self.fetch_course_skill(question.course_id)
+                db.execute(
+                    "INSERT OR REPLACE INTO course_skill (course_id, skill, answered, updated_at) VALUES (?, ?, ?, ?)",
+                    (
+                        question.course_id,
+                        update_skill(skill.skill, skill.answered, question.difficulty, correct),
+                        skill.answered + 1,
+                        now,
+                    ),
+                )
+        return state
+
+    # A streak only counts while the learner studied today or yesterday.
+    @traced("db")
+    def fetch_learner_stats(self) -> LearnerStats:
+        row = (
+            self.connection()
+            .execute(
+                "SELECT answered, correct, CASE WHEN last_day >= date('now', 'localtime', '-1 day') THEN current_streak ELSE 0 END, longest_streak, active_days, last_day FROM learner_stats WHERE id = 1"
+            )
+            .fetchone()
+        )
+        return LearnerStats.from_row(row)
+
+    # (course name, answered, correct) of the most recently studied courses.
+    @traced("db")
+    def fetch_course_stats(self, limit: int = 100) -> list[tuple[str, int, int]]:
+        return (
+            self.connection()
+            .execute(
+                "SELECT course.name, course_stats.answered, course_stats.correct FROM course_stats JOIN course ON course.id = course_stats.course_id ORDER BY course_stats.last_answered_at DESC LIMIT ?",
+                (limit,),
+            )
+            .fetchall()
+        )
+
+    # (difficulty, answered, correct), easiest first.
+    @traced("db")
+    def fetch_difficulty_stats(self) -> list[tuple[int, int, int]]:
+        return (
+            self.connection()
+            .execute("SELECT difficulty, answered, correct FROM difficulty_stats ORDER BY difficulty")
+            .fetchall()
+        )
+
+    # (day, answered, correct) of the last `days` local days with any answers.
+    @traced("db")
+    def fetch_daily_activity(self, days: int = 30) -> list[tuple[str, int, int]]:
+        return (
+            self.connection()
+            .execute(
+                "SELECT day, answered, correct FROM daily_activity WHERE day > date('now', 'localtime', ?) ORDER BY day",
+                (f"-{days} days",),
+            )
+            .fetchall()
+        )
+
+    # Earned badges first, most recent on top, then the ones still to earn.
+    @traced("db")
+    def fetch_badges(self) -> list[Badge]:
+        rows = self.connection().execute(
+            f"SELECT {Badge.COLUMNS} FROM badge ORDER BY earned_at IS NULL, earned_at DESC, threshold"
+        )
+        return list(map(Badge.from_row, rows))
+
+    @traced("db")
+    def fetch_badges_earned_at(self, earned_at: int) -> list[Badge]:
+        rows = self.connection().execute(
+            f"SELECT {Badge.COLUMNS} FROM badge WHERE earned_at = ?", (earned_at,)
+        )
+        return list(map(Badge.from_row, rows))
+
+    @traced("db")
+    def count_questions(self, course_id: int) -> int:
+        (count,) = (
+            self.connection()
+            .execute("SELECT COUNT(*) FROM question WHERE course_id = ?", (course_id,))
+            .fetchone()
+        )
+        return count
+
+    @traced("db")
+    def fetch_question_texts(self, course_id: int, limit: int = -1) -> list[str]:
+        rows = self.connection().execute(
+            "SELECT question FROM question WHERE course_id = ? ORDER BY id DESC LIMIT ?",
+            (course_id, limit),
+        )
+        return [row[0] for row in rows]
+
+    @traced("db")
+    @writes
+    def create_course(self, course: "CreateCourseInput") -> int:
+        db = self.connection()
+        with db:
+            return self.insert_course(course)
+
+    # Must run inside a write transaction.
+    @traced("db")
+    @writes
+    def insert_course(self, course: "CreateCourseInput") -> int:
+        db = self.connection()
+        created_at = int(time.time())
+        cursor = db.execute(
+            "INSERT INTO course (name, description, created_at) VALUES (?, ?, ?)",
+            (course.name, course.description, created_at),
+        )
+        course_id = cursor.lastrowid
+        assert isinstance(course_id, int)
+        if self.insert_questions(course_id, course.questions, created_at) == 0:
+            raise ValueError("No questions were generated")
+        return course_id
+
+    # Picks up the unfinished import of the same file, unless the file has
+    # changed since, in which case its checkpoints are worthless.
+    @traced("db")
+    @writes
+    def start_import(self, path: Path, questions_per_chunk: int) -> ImportJob:
+        db = self.connection()
+        stat = path.stat()
+        size, modified_at = stat.st_size, int(stat.st_mtime)
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                f"SELECT {ImportJob.COLUMNS} FROM import_job WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+            if row is not None:
+                job = ImportJob.from_row(row)
+                if job.size == size and job.modified_at == modified_at:
+                    return job
+                db.execute("DELETE FROM import_job WHERE id = ?", (job.id,))
+            row = db.execute(
+                f"INSERT INTO import_job (path, size, modified_at, questions_per_chunk, created_at) VALUES (?, ?, ?, ?, ?) RETURNING {ImportJob.COLUMNS}",
+                (str(path), size, modified_at, questions_per_chunk, int(time.time())),
+            ).fetchone()
+        return ImportJob.from_row(row)
+
+    @traced("db")
+    @writes
+    def set_import_outline(self, job_id: int, name: str, description: str):
+        db = self.connection()
+        with db:
+            db.execute(
+                "UPDATE import_job SET name = ?, description = ? WHERE id = ?",
+                (name, description, job_id),
+            )
+
+    # chunk_index -> (chunk_hash, question count) of the chunks already done.
+    @traced("db")
+    def fetch_import_checkpoints(self, job_id: int) -> dict[int, tuple[str, int]]:
+        rows = self.connection().execute(
+            "SELECT chunk_index, chunk_hash, json_array_length(questions) FROM import_chunk WHERE job_id = ?",
+            (job_id,),
+        )
+        return {index: (chunk_hash, count) for index, chunk_hash, count in rows}
+
+    @traced("db")
+    @writes
+    def save_import_chunk(
+        self,
+        job_id: int,
+        chunk_index: int,
+        chunk_hash: str,
+        questions: list["CreateQuestionInput"],
+    ):
+        db = self.connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO import_chunk (job_id, chunk_index, chunk_hash, questions, created_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    chunk_index,
+                    chunk_hash,
+                    json.dumps(
+                        [question.model_dump() for question in questions],
+                        ensure_ascii=False,
+                    ),
+                    int(time.time()),
+                ),
+            )
+
+    # Questions of every checkpointed chunk, in document order.
+    @traced("db")
+    def fetch_import_questions(self, job_id: int) -> list[dict]:
+        rows = self.connection().execute(
+            "SELECT questions FROM import_chunk WHERE job_id = ? ORDER BY chunk_index",
+            (job_id,),
+        )
+        return [question for (questions,) in rows for question in json.loads(questions)]
+
+    # Saves the course and drops the checkpoints in one go, so a crash in
+    # between can neither lose the import nor create the course twice.
+    @traced("db")
+    @writes
+    def finish_import(self, job_id: int, course: "CreateCourseInput") -> int:
+        db = self.connection()
+        with db:
+            course_id = self.insert_course(course)
+            db.execute("DELETE FROM import_job WHERE id = ?", (job_id,))
+        return course_id
+
+    @traced("db")
+    @writes
+    def add_questions(
+        self, course_id: int, questions: list["CreateQuestionInput"]
+    ) -> int:
+        db = self.connection()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            return self.insert_questions(course_id, questions, int(time.time()))
+
+    # Must run inside a write transaction: new ids are read back as everything
+    # above the current maximum, which no other writer can touch meanwhile.
+    # Near-duplicates of questions already in the course are left out; returns
+    # how many questions were added.
+    @traced("db")
+    @writes
+    def insert_questions(
+        self,
+        course_id: int,
+        questions: list["CreateQuestionInput"],
+        created_at: int,
+    ) -> int:
+        db = self.connection()
+        index = DedupIndex(db)
+        signatures = [minhash(item.question) for item in questions]
+        keep = index.unique(
+            course_id, [(item.question, item.answer) for item in questions], signatures
+        )
+        questions = [item for item, kept in zip(questions, keep) if kept]
+        signatures = [signature for signature, kept in zip(signatures, keep) if kept]
+
+        (last_id,) = db.execute("SELECT COALESCE(MAX(id), 0) FROM question").fetchone()
+        db.executemany(
+            "INSERT INTO question (course_id, question, answer, choices, explanation, difficulty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    course_id,
+                    item.question,
+                    item.answer,
+                    json.dumps(item.choices, ensure_ascii=False),
+                    item.explanation,
+                    item.difficulty,
+                    created_at,
+                )
+                for item in questions
+            ),
+        )
+        question_ids = [
+            row[0]
+            for row in db.execute(
+                "SELECT id FROM question WHERE id > ? ORDER BY id", (last_id,)
+            )
+        ]
+        index.add(zip(question_ids, signatures))
+        return len(questions)
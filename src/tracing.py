@@ -0,0 +1,168 @@
+import functools
+import json
+import os
+from pathlib import Path
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Timing spans around the slow paths (database, LLM, UI). Only the most recent
+# ones are kept, so tracing can stay on all the time; the diagnostics window
+# and the Chrome trace export read from this buffer.
+BUFFER_SIZE = int(os.environ.get("CUTE_LEARNING_TRACE_BUFFER", 20000))
+
+enabled = os.environ.get("CUTE_LEARNING_TRACE", "1") != "0"
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: dict | None = None
+
+
+_spans: deque[Span] = deque(maxlen=BUFFER_SIZE)
+_thread_names: dict[int, str] = {}
+_lock = threading.Lock()
+
+
+def set_enabled(value: bool):
+    global enabled
+    enabled = value
+
+
+def record(name: str, category: str, start_ns: int, duration_ns: int, args: dict | None = None):
+    thread_id = threading.get_ident()
+    with _lock:
+        if thread_id not in _thread_names:
+            _thread_names[thread_id] = threading.current_thread().name
+        _spans.append(Span(name, category, start_ns, duration_ns, thread_id, args))
+
+
+# with span("db.fetch_course", "db", course_id=1): ...
+class span:
+    __slots__ = ("name", "category", "args", "start_ns")
+
+    def __init__(self, name: str, category: str = "app", **args):
+        self.name = name
+        self.category = category
+        self.args = args or None
+
+    def __enter__(self) -> "span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        if enabled:
+            record(
+                self.name,
+                self.category,
+                self.start_ns,
+                time.perf_counter_ns() - self.start_ns,
+                self.args,
+            )
+
+
+def traced(category: str, name: str | None = None) -> Callable[[F], F]:
+    def decorate(function: F) -> F:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(span_name, category, start_ns, time.perf_counter_ns() - start_ns)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def spans() -> list[Span]:
+    with _lock:
+        return list(_spans)
+
+
+def clear():
+    with _lock:
+        _spans.clear()
+
+
+@dataclass(slots=True)
+class SpanStats:
+    name: str
+    category: str
+    count: int
+    total_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+def summary() -> list[SpanStats]:
+    durations: dict[tuple[str, str], list[int]] = {}
+    for item in spans():
+        durations.setdefault((item.name, item.category), []).append(item.duration_ns)
+    stats = []
+    for (name, category), values in durations.items():
+        values.sort()
+        stats.append(
+            SpanStats(
+                name,
+                category,
+                len(values),
+                sum(values) / 1e6,
+                statistics.median(values) / 1e6,
+                values[min(int(len(values) * 0.95), len(values) - 1)] / 1e6,
+                values[-1] / 1e6,
+            )
+        )
+    stats.sort(key=lambda item: item.total_ms, reverse=True)
+    return stats
+
+
+# Writes the buffer in the Trace Event Format, which chrome://tracing and
+# https://ui.perfetto.dev open directly.
+def export_chrome_trace(path: Path) -> int:
+    items = spans()
+    with _lock:
+        thread_names = dict(_thread_names)
+    pid = os.getpid()
+    events = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": thread_id,
+            "args": {"name": thread_name},
+        }
+        for thread_id, thread_name in thread_names.items()
+    ]
+    events.extend(
+        {
+            "name": item.name,
+            "cat": item.category,
+            "ph": "X",
+            "ts": item.start_ns / 1000,
+            "dur": item.duration_ns / 1000,
+            "pid": pid,
+            "tid": item.thread_id,
+            "args": item.args or {},
+        }
+        for item in items
+    )
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file, default=str)
+    return len(items)
@@ -1,232 +1,238 @@
-import sys
-from pathlib import Path
-import sqlite3
-import json
+import logging
+import time
+from typing import TYPE_CHECKING
 
-
-from PySide6.QtUiTools import QUiLoader
+from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
-    QGridLayout,
-    QLabel,
     QMainWindow,
     QPushButton,
     QStackedWidget,
-    QVBoxLayout,
     QWidget,
 )
-from PySide6.QtCore import QFile, QIODevice, QObject, Slot, Signal
+from PySide6.QtCore import (
+    QEvent,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Slot,
+    Signal,
+)
+
+from models.db import Badge, Course, Question
+from services.settings import GeneratorSettings
+from storage.question_stream import QuestionStream
+from storage.repository import Repository
+import tracing
+from tracing import traced
+from windows.course.ui_answerForm import Ui_answerForm
+from windows.course.ui_course import Ui_course
+from windows.course.ui_questionForm import Ui_questionForm
+from windows.course.ui_welcome import Ui_welcome
 
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    from services.generation import GenerateMoreQuestionsJob
 
-from models.db import Course, Question
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+# In endless mode more questions are requested once fewer than this many are
+# left, so the next batch is ready before the learner gets there.
+ENDLESS_WATERMARK = 5
+ENDLESS_BATCH_SIZE = 10
 
 
 class CourseWindowWidget:
     WELCOME = 0
-    QUESTION_FORM = 1
-    ANSWER_FORM = 2
+
+
+class RecordReviewSignals(QObject):
+    recorded = Signal(list)
+    failed = Signal(str)
+
+
+# Saves an answer off the GUI thread: the write waits whenever another
+# process holds the database, e.g. the CLI importing a large archive.
+class RecordReviewJob(QRunnable):
+    def __init__(self, repository: Repository, question: Question, correct: bool):
+        super().__init__()
+        self.repository = repository
+        self.question = question
+        self.correct = correct
+        self.signals = RecordReviewSignals()
+
+    def run(self):
+        try:
+            state = self.repository.record_review(self.question, self.correct)
+            badges = self.repository.fetch_badges_earned_at(state.reviewed_at)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        self.signals.recorded.emit(badges)
+
+
+# A question and its answer on a pair of pages of the stacked widget. The
+# window keeps two of them and fills the one off screen with the next
+# question while the learner reads the current answer, so moving on is only
+# a page swap.
+class Card:
+    def __init__(self, stacked_widget: QStackedWidget):
+        self.stacked_widget = stacked_widget
+        self.question: Question = None
+
+        self.question_page = QWidget()
+        question_form = Ui_questionForm()
+        question_form.setupUi(self.question_page)
+        self.question_label = question_form.question
+        self.choice_buttons = [
+            question_form.choice0,
+            question_form.choice1,
+            question_form.choice2,
+            question_form.choice3,
+        ]
+
+        self.answer_page = QWidget()
+        answer_form = Ui_answerForm()
+        answer_form.setupUi(self.answer_page)
+        self.answer_label = answer_form.answer
+        self.explanation_label = answer_form.explanation
+        self.incorrect_answer_label = answer_form.incorrect_answer
+        self.continue_button = answer_form.continue_button
+
+        stacked_widget.addWidget(self.question_page)
+        stacked_widget.addWidget(self.answer_page)
+
+    @traced("ui", "ui.prepare_card")
+    def prepare(self, question: Question):
+        self.question = question
+        self.question_label.setText(question.question)
+        for index, button in enumerate(self.choice_buttons):
+            if index < len(question.choices):
+                button.setText(question.choices[index])
+                button.setVisible(True)
+            else:
+                button.setVisible(False)
+
+        self.answer_label.setText(question.answer)
+        self.explanation_label.setText(question.explanation)
+        self.incorrect_answer_label.setVisible(False)
+
+        # The stacked widget only sizes the page it shows, so the hidden pages
+        # are given its size and laid out now instead of on the swap.
+        size = self.stacked_widget.contentsRect().size()
+        for page in (self.question_page, self.answer_page):
+            page.ensurePolished()
+            page.resize(size)
+            page.layout().activate()
+
+    def show_question(self):
+        self.stacked_widget.setCurrentWidget(self.question_page)
+
+    def show_answer(self, choice_index: int) -> bool:
+        correct = self.question.choices[choice_index] == self.question.answer
+        if not correct:
+            self.incorrect_answer_label.setText(self.question.choices[choice_index])
+            self.incorrect_answer_label.setVisible(True)
+        self.stacked_widget.setCurrentWidget(self.answer_page)
+        return correct
 
 
 class CourseWindow(QObject):
     open_new_course_window = Signal()
     open_courses_window = Signal()
-
-    def __init__(self, app: QApplication, db: sqlite3.Connection):
+    open_diagnostics_window = Signal()
+    open_stats_window = Signal()
+
+    def __init__(
+        self,
+        app: QApplication,
+        repository: Repository,
+        generator_settings: GeneratorSettings,
+    ):
         super().__init__()
         self.app = app
         self.window: QMainWindow = None
         self.course: Course = None
-        self.question: Question = None
-        self.questions: list[Question] = []
+        self.questions: QuestionStream = None
 
         self.welcome: QWidget = None
         self.new_course_button: QPushButton = None
         self.courses_button: QPushButton = None
+        self.review_button: QPushButton = None
+        self.stats_button: QPushButton = None
 
-        self.question_form: QWidget = None
-        self.question_form_layout: QVBoxLayout = None
-        self.question_form_question: QLabel = None
-        self.question_form_choice0: QPushButton = None
-        self.question_form_choice1: QPushButton = None
-        self.question_form_choice2: QPushButton = None
-        self.question_form_choice3: QPushButton = None
-
-        self.answer_form: QWidget = None
-        self.answer_form_layout: QGridLayout = None
-        self.answer_form_answer: QLabel = None
-        self.answer_form_explanation: QLabel = None
-        self.answer_form_incorrect_answer: QLabel = None
-        self.answer_form_continue_button: QPushButton = None
+        self.card: Card = None
+        self.next_card: Card = None
+        self.next_card_ready = False
+        # perf_counter_ns() of the last swap, until the new page is painted.
+        self.transition_started_ns: int | None = None
 
         self.stacked_widget: QStackedWidget = None
+        self.endless_action: QAction = None
 
-        self.db = db
-        self.cursor = self.db.cursor()
-
-        ui_file_name = str(Path(__file__).parent / "course.ui")
-        ui_file = QFile(ui_file_name)
-        if not ui_file.open(QIODevice.ReadOnly):
-            print(f"Cannot open {ui_file_name}: {ui_file.errorString()}")
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.window = loader.load(ui_file)
-        ui_file.close()
-        if not self.window:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.stacked_widget = self.window.stacked_widget
-        assert isinstance(self.stacked_widget, QStackedWidget)
-
-        ui_file_name = str(Path(__file__).parent / "welcome.ui")
-        ui_file = QFile(ui_file_name)
-        if not ui_file.open(QIODevice.ReadOnly):
-            print(f"Cannot open {ui_file_name}: {ui_file.errorString()}")
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.welcome = loader.load(ui_file)
-        ui_file.close()
-        if not self.welcome:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.new_course_button = self.welcome.new_course_button
-        assert isinstance(self.new_course_button, QPushButton)
+        self.generate_job: "GenerateMoreQuestionsJob" = None
+        self.waiting_for_questions = False
+
+        self.repository = repository
+        # Shared with the new course window, which is where they are entered.
+        self.generator_settings = generator_settings
+        self.thread_pool = QThreadPool.globalInstance()
+        # A single thread, so answers are saved in the order they were given.
+        self.review_pool = QThreadPool(self)
+        self.review_pool.setMaxThreadCount(1)
+        app.aboutToQuit.connect(self.review_pool.waitForDone)
+
+        self.window = QMainWindow()
+        course = Ui_course()
+        course.setupUi(self.window)
+        self.stacked_widget = course.stacked_widget
+
+        self.endless_action = course.endless_action
+        self.endless_action.toggled.connect(self.on_endless_toggled)
+
+        course.diagnostics_action.triggered.connect(self.open_diagnostics_window)
+
+        self.welcome = QWidget()
+        welcome = Ui_welcome()
+        welcome.setupUi(self.welcome)
+
+        self.new_course_button = welcome.new_course_button
         self.new_course_button.clicked.connect(self.on_new_course_clicked)
 
-        self.courses_button = self.welcome.courses_button
-        assert isinstance(self.courses_button, QPushButton)
+        self.courses_button = welcome.courses_button
         self.courses_button.clicked.connect(self.on_courses_clicked)
 
-        question_form_file_name = str(Path(__file__).parent / "questionForm.ui")
-        question_form_file = QFile(question_form_file_name)
-        if not question_form_file.open(QIODevice.ReadOnly):
-            print(
-                f"Cannot open {question_form_file_name}: {question_form_file.errorString()}"
-            )
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.question_form = loader.load(question_form_file)
-        question_form_file.close()
-        if not self.question_form:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.question_form_layout = self.question_form.layout()
-        assert isinstance(self.question_form_layout, QVBoxLayout)
-
-        self.question_form_question = self.question_form.question
-        assert isinstance(self.question_form_question, QLabel)
-
-        self.question_form_choice0 = self.question_form.choice0
-        assert isinstance(self.question_form_choice0, QPushButton)
-
-        self.question_form_choice1 = self.question_form.choice1
-        assert isinstance(self.question_form_choice1, QPushButton)
-
-        self.question_form_choice2 = self.question_form.choice2
-        assert isinstance(self.question_form_choice2, QPushButton)
-
-        self.question_form_choice3 = self.question_form.choice3
-        assert isinstance(self.question_form_choice3, QPushButton)
-
-        self.question_form_choice0.clicked.connect(lambda: self.on_choice_clicked(0))
-        self.question_form_choice1.clicked.connect(lambda: self.on_choice_clicked(1))
-        self.question_form_choice2.clicked.connect(lambda: self.on_choice_clicked(2))
-        self.question_form_choice3.clicked.connect(lambda: self.on_choice_clicked(3))
-
-        answer_form_file_name = str(Path(__file__).parent / "answerForm.ui")
-        answer_form_file = QFile(answer_form_file_name)
-        if not answer_form_file.open(QIODevice.ReadOnly):
-            print(
-                f"Cannot open {answer_form_file_name}: {answer_form_file.errorString()}"
-            )
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.answer_form = loader.load(answer_form_file)
-        answer_form_file.close()
-        if not self.answer_form:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.answer_form_layout = self.answer_form.layout()
-        assert isinstance(self.answer_form_layout, QGridLayout)
-
-        self.answer_form_answer = self.answer_form.answer
-        assert isinstance(self.answer_form_answer, QLabel)
-
-        self.answer_form_explanation = self.answer_form.explanation
-        assert isinstance(self.answer_form_explanation, QLabel)
-
-        self.answer_form_incorrect_answer = self.answer_form.incorrect_answer
-        assert isinstance(self.answer_form_incorrect_answer, QLabel)
-
-        self.answer_form_continue_button = self.answer_form.continue_button
-        assert isinstance(self.answer_form_continue_button, QPushButton)
-        self.answer_form_continue_button.clicked.connect(self.load_next_question)
+        self.review_button = welcome.review_button
+        self.review_button.clicked.connect(self.load_review)
+
+        self.stats_button = welcome.stats_button
+        self.stats_button.clicked.connect(self.open_stats_window)
 
         self.stacked_widget.insertWidget(CourseWindowWidget.WELCOME, self.welcome)
-        self.stacked_widget.insertWidget(
-            CourseWindowWidget.QUESTION_FORM, self.question_form
-        )
-        self.stacked_widget.insertWidget(
-            CourseWindowWidget.ANSWER_FORM, self.answer_form
-        )
+        self.card = Card(self.stacked_widget)
+        self.next_card = Card(self.stacked_widget)
+        for card in (self.card, self.next_card):
+            for index, button in enumerate(card.choice_buttons):
+                button.clicked.connect(
+                    lambda checked=False, index=index: self.on_choice_clicked(index)
+                )
+            card.continue_button.clicked.connect(self.load_next_question)
+            card.question_page.installEventFilter(self)
         self.stacked_widget.setCurrentIndex(CourseWindowWidget.WELCOME)
 
-    def fetch_course(self, course_id: int):
-        self.cursor.execute(
-            "SELECT id, name, description, created_at FROM course WHERE id = ?",
-            (course_id,),
-        )
-        course = self.cursor.fetchone()
-        if course:
-            return Course(
-                id=course[0],
-                name=course[1],
-                description=course[2],
-                created_at=course[3],
-            )
-        else:
-            return None
-
-    def fetch_questions(self, course_id: int):
-        self.cursor.execute(
-            "SELECT id, question, answer, choices, explanation, difficulty, created_at, course_id FROM question WHERE course_id = ?",
-            (course_id,),
-        )
-        questions = self.cursor.fetchall()
-
-        return list(
-            map(
-                lambda question: Question(
-                    id=question[0],
-                    question=question[1],
-                    answer=question[2],
-                    choices=json.loads(question[3].replace("'", '"')),
-                    explanation=question[4],
-                    difficulty=question[5],
-                    created_at=question[6],
-                    course_id=question[7],
-                ),
-                questions,
-            )
-        )
-
     @Slot()
+    @traced("ui", "ui.load_course")
     def load_course(self, course_id: int):
-        course = self.fetch_course(course_id)
-        self.questions = self.fetch_questions(course_id)
+        course = self.repository.fetch_course(course_id)
+        self.course = course
+        self.waiting_for_questions = False
+        self.next_card_ready = False
+        self.questions = QuestionStream(self.repository, course_id)
+        self.questions.fill()
         if course is not None and len(self.questions) > 0:
-            self.stacked_widget.setCurrentIndex(CourseWindowWidget.QUESTION_FORM)
             self.window.setWindowTitle(course.name)
 
-            # TODO: shuffle
-            self.answer_form_continue_button.clicked.connect(self.load_next_question)
             self.load_next_question()
             self.window.show()
         else:
@@ -235,50 +241,155 @@ class CourseWindow(QObject):
             dialog.show()
 
     @Slot()
-    def load_next_question(self):
+    @traced("ui", "ui.load_review")
+    def load_review(self):
+        self.course = None
+        self.waiting_for_questions = False
+        self.next_card_ready = False
+        self.questions = QuestionStream(self.repository, None)
+        self.questions.fill()
         if len(self.questions) > 0:
-            self.question = self.questions.pop(0)
-
-            self.question_form_question.setText(self.question.question)
-
-            self.question_form_choice0.setVisible(False)
-            self.question_form_choice1.setVisible(False)
-            self.question_form_choice2.setVisible(False)
-            self.question_form_choice3.setVisible(False)
-
-            if len(self.question.choices) > 0:
-                self.question_form_choice0.setText(self.question.choices[0])
-                self.question_form_choice0.setVisible(True)
-            if len(self.question.choices) > 1:
-                self.question_form_choice1.setText(self.question.choices[1])
-                self.question_form_choice1.setVisible(True)
-            if len(self.question.choices) > 2:
-                self.question_form_choice2.setText(self.question.choices[2])
-                self.question_form_choice2.setVisible(True)
-            if len(self.question.choices) > 3:
-                self.question_form_choice3.setText(self.question.choices[3])
-                self.question_form_choice3.setVisible(True)
-
-            self.answer_form_answer.setText(self.question.answer)
-            self.answer_form_explanation.setText(self.question.explanation)
-            self.answer_form_incorrect_answer.setVisible(False)
-
-            self.stacked_widget.setCurrentIndex(CourseWindowWidget.QUESTION_FORM)
+            self.window.setWindowTitle("Review")
+            self.load_next_question()
+            self.window.show()
         else:
-            self.stacked_widget.setCurrentIndex(CourseWindowWidget.WELCOME)
+            dialog = QDialog()
+            dialog.setWindowTitle("Nothing to review")
+            dialog.show()
 
-    def on_choice_clicked(self, choice_index: int):
-        self.answer_form_answer.setText(self.question.answer)
-        self.answer_form_explanation.setText(self.question.explanation)
+    # Fills the off-screen card with the next question. Runs once an answer
+    # is saved, unless the learner moves on first.
+    @Slot()
+    def prepare_next_card(self):
+        if self.next_card_ready or self.questions is None:
+            return
+        question = self.questions.pop()
+        self.generate_more_questions()
+        if question is not None:
+            self.next_card.prepare(question)
+            self.next_card_ready = True
 
-        if self.question.choices[choice_index] == self.question.answer:
-            self.answer_form_incorrect_answer.setVisible(False)
+    @Slot()
+    @traced("ui", "ui.question_transition")
+    def load_next_question(self):
+        # Only when the learner was faster than the event loop, or on the
+        # first card.
+        self.prepare_next_card()
+        if self.next_card_ready:
+            self.card, self.next_card = self.next_card, self.card
+            self.next_card_ready = False
+            self.transition_started_ns = time.perf_counter_ns()
+            self.card.show_question()
+        elif self.generate_job is not None:
+            self.waiting_for_questions = True
+            self.window.statusBar().showMessage("Generating more questions...")
         else:
-            self.answer_form_incorrect_answer.setText(
-                self.question.choices[choice_index]
-            )
-            self.answer_form_incorrect_answer.setVisible(True)
-        self.stacked_widget.setCurrentIndex(CourseWindowWidget.ANSWER_FORM)
+            self.stacked_widget.setCurrentIndex(CourseWindowWidget.WELCOME)
+
+    # Records how long a swap took to reach the screen, which the span around
+    # load_next_question alone doesn't cover.
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if (
+            event.type() == QEvent.Type.Paint
+            and self.transition_started_ns is not None
+            and watched is self.card.question_page
+        ):
+            started_ns, self.transition_started_ns = self.transition_started_ns, None
+            if tracing.enabled:
+                tracing.record(
+                    "ui.question_transition_to_paint",
+                    "ui",
+                    started_ns,
+                    time.perf_counter_ns() - started_ns,
+                )
+        return False
+
+    def generate_more_questions(self):
+        if (
+            not self.endless_action.isChecked()
+            or self.course is None
+            or self.generate_job is not None
+            or not self.questions.exhausted
+            or len(self.questions) >= ENDLESS_WATERMARK
+        ):
+            return
+
+        # Imported here so openai is only loaded once generation is requested.
+        from services.backends import backend_from_settings
+        from services.generation import GenerateMoreQuestionsJob
+        from services.pipeline import GenerationConfig
+
+        self.generate_job = GenerateMoreQuestionsJob(
+            self.repository,
+            self.course,
+            backend=backend_from_settings(self.generator_settings),
+            question_count=ENDLESS_BATCH_SIZE,
+            config=GenerationConfig(),
+        )
+        self.generate_job.signals.questions_added.connect(self.on_questions_added)
+        self.generate_job.signals.warning.connect(self.on_generation_warning)
+        self.generate_job.signals.failed.connect(self.on_generation_failed)
+        self.thread_pool.start(self.generate_job)
+
+    @Slot(bool)
+    def on_endless_toggled(self, checked: bool):
+        if checked and self.questions is not None:
+            self.generate_more_questions()
+
+    @Slot(int)
+    def on_questions_added(self, count: int):
+        job, self.generate_job = self.generate_job, None
+        if self.course is None or job.course.id != self.course.id:
+            return
+
+        if count == 0:
+            # Everything the model came up with was already in the course.
+            self.window.statusBar().showMessage("No new questions were generated")
+            if self.waiting_for_questions:
+                self.waiting_for_questions = False
+                self.stacked_widget.setCurrentIndex(CourseWindowWidget.WELCOME)
+            return
+
+        self.questions.resume()
+        self.questions.fill()
+        if self.waiting_for_questions:
+            self.waiting_for_questions = False
+            self.window.statusBar().clearMessage()
+            self.load_next_question()
+
+    @Slot(str)
+    def on_generation_warning(self, warning: str):
+        self.window.statusBar().showMessage(warning)
+
+    @Slot(str)
+    def on_generation_failed(self, error: str):
+        logger.error("Generating more questions failed: %s", error)
+        self.generate_job = None
+        self.window.statusBar().showMessage(f"Generating more questions failed: {error}")
+        if self.waiting_for_questions:
+            self.waiting_for_questions = False
+            self.stacked_widget.setCurrentIndex(CourseWindowWidget.WELCOME)
+
+    @traced("ui", "ui.answer")
+    def on_choice_clicked(self, choice_index: int):
+        correct = self.card.show_answer(choice_index)
+        job = RecordReviewJob(self.repository, self.card.question, correct)
+        job.signals.recorded.connect(self.on_review_recorded)
+        job.signals.failed.connect(self.on_review_failed)
+        self.review_pool.start(job)
+
+    @Slot(list)
+    def on_review_recorded(self, badges: list[Badge]):
+        if badges:
+            titles = ", ".join(badge.title for badge in badges)
+            self.window.statusBar().showMessage(f"Badge earned: {titles}")
+        self.prepare_next_card()
+
+    @Slot(str)
+    def on_review_failed(self, error: str):
+        logger.error("Saving an answer failed: %s", error)
+        self.window.statusBar().showMessage(f"Saving your answer failed: {error}")
+        self.prepare_next_card()
 
     def on_new_course_clicked(self):
         self.open_new_course_window.emit()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'answerForm.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QGridLayout, QLabel, QPushButton,
+    QSizePolicy, QWidget)
+
+class Ui_answerForm(object):
+    def setupUi(self, answerForm):
+        if not answerForm.objectName():
+            answerForm.setObjectName(u"answerForm")
+        answerForm.resize(640, 480)
+        self.gridLayout = QGridLayout(answerForm)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.incorrect_answer = QLabel(answerForm)
+        self.incorrect_answer.setObjectName(u"incorrect_answer")
+        font = QFont()
+        font.setPointSize(12)
+        font.setBold(True)
+        self.incorrect_answer.setFont(font)
+        self.incorrect_answer.setStyleSheet(u"color: rgb(170, 0, 0);")
+        self.incorrect_answer.setAlignment(Qt.AlignmentFlag.AlignHCenter|Qt.AlignmentFlag.AlignTop)
+
+        self.gridLayout.addWidget(self.incorrect_answer, 1, 0, 1, 1)
+
+        self.explanation = QLabel(answerForm)
+        self.explanation.setObjectName(u"explanation")
+        self.explanation.setTextFormat(Qt.TextFormat.MarkdownText)
+
+        self.gridLayout.addWidget(self.explanation, 2, 0, 1, 1)
+
+        self.answer = QLabel(answerForm)
+        self.answer.setObjectName(u"answer")
+        font1 = QFont()
+        font1.setPointSize(16)
+        font1.setBold(True)
+        self.answer.setFont(font1)
+        self.answer.setStyleSheet(u"color: rgb(0, 170, 0);")
+        self.answer.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.gridLayout.addWidget(self.answer, 0, 0, 1, 1)
+
+        self.continue_button = QPushButton(answerForm)
+        self.continue_button.setObjectName(u"continue_button")
+
+        self.gridLayout.addWidget(self.continue_button, 3, 0, 1, 1)
+
+        self.gridLayout.setRowStretch(0, 1)
+        self.gridLayout.setRowStretch(1, 1)
+        self.gridLayout.setRowStretch(2, 4)
+
+        self.retranslateUi(answerForm)
+
+        QMetaObject.connectSlotsByName(answerForm)
+    # setupUi
+
+    def retranslateUi(self, answerForm):
+        answerForm.setWindowTitle(QCoreApplication.translate("answerForm", u"Form", None))
+        self.incorrect_answer.setText(QCoreApplication.translate("answerForm", u"Incorrect Answer", None))
+        self.explanation.setText(QCoreApplication.translate("answerForm", u"Explanation", None))
+        self.answer.setText(QCoreApplication.translate("answerForm", u"Correct Answer", None))
+        self.continue_button.setText(QCoreApplication.translate("answerForm", u"Continue", None))
+    # retranslateUi
+
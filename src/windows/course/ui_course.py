@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'course.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
+    QCursor, QFont, QFontDatabase, QGradient,
+    QIcon, QImage, QKeySequence, QLinearGradient,
+    QPainter, QPalette, QPixmap, QRadialGradient,
+    QTransform)
+from PySide6.QtWidgets import (QApplication, QMainWindow, QMenu, QMenuBar,
+    QSizePolicy, QStackedWidget, QStatusBar, QVBoxLayout,
+    QWidget)
+
+class Ui_course(object):
+    def setupUi(self, course):
+        if not course.objectName():
+            course.setObjectName(u"course")
+        course.resize(640, 480)
+        self.endless_action = QAction(course)
+        self.endless_action.setObjectName(u"endless_action")
+        self.endless_action.setCheckable(True)
+        self.diagnostics_action = QAction(course)
+        self.diagnostics_action.setObjectName(u"diagnostics_action")
+        self.centralwidget = QWidget(course)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.verticalLayout = QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.stacked_widget = QStackedWidget(self.centralwidget)
+        self.stacked_widget.setObjectName(u"stacked_widget")
+
+        self.verticalLayout.addWidget(self.stacked_widget)
+
+        course.setCentralWidget(self.centralwidget)
+        self.menubar = QMenuBar(course)
+        self.menubar.setObjectName(u"menubar")
+        self.menubar.setGeometry(QRect(0, 0, 640, 30))
+        self.course_menu = QMenu(self.menubar)
+        self.course_menu.setObjectName(u"course_menu")
+        self.tools_menu = QMenu(self.menubar)
+        self.tools_menu.setObjectName(u"tools_menu")
+        course.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(course)
+        self.statusbar.setObjectName(u"statusbar")
+        course.setStatusBar(self.statusbar)
+
+        self.menubar.addAction(self.course_menu.menuAction())
+        self.menubar.addAction(self.tools_menu.menuAction())
+        self.course_menu.addAction(self.endless_action)
+        self.tools_menu.addAction(self.diagnostics_action)
+
+        self.retranslateUi(course)
+
+        QMetaObject.connectSlotsByName(course)
+    # setupUi
+
+    def retranslateUi(self, course):
+        course.setWindowTitle(QCoreApplication.translate("course", u"Course", None))
+        self.endless_action.setText(QCoreApplication.translate("course", u"Endless mode", None))
+#if QT_CONFIG(tooltip)
+        self.endless_action.setToolTip(QCoreApplication.translate("course", u"Keep generating new questions while you study", None))
+#endif // QT_CONFIG(tooltip)
+        self.diagnostics_action.setText(QCoreApplication.translate("course", u"Diagnostics", None))
+#if QT_CONFIG(shortcut)
+        self.diagnostics_action.setShortcut(QCoreApplication.translate("course", u"Ctrl+Shift+D", None))
+#endif // QT_CONFIG(shortcut)
+        self.course_menu.setTitle(QCoreApplication.translate("course", u"Course", None))
+        self.tools_menu.setTitle(QCoreApplication.translate("course", u"Tools", None))
+    # retranslateUi
+
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'questionForm.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QLabel, QPushButton, QSizePolicy,
+    QVBoxLayout, QWidget)
+
+class Ui_questionForm(object):
+    def setupUi(self, questionForm):
+        if not questionForm.objectName():
+            questionForm.setObjectName(u"questionForm")
+        questionForm.resize(640, 480)
+        self.verticalLayout = QVBoxLayout(questionForm)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.question = QLabel(questionForm)
+        self.question.setObjectName(u"question")
+        self.question.setTextFormat(Qt.TextFormat.MarkdownText)
+        self.question.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.verticalLayout.addWidget(self.question)
+
+        self.choice1 = QPushButton(questionForm)
+        self.choice1.setObjectName(u"choice1")
+
+        self.verticalLayout.addWidget(self.choice1)
+
+        self.choice0 = QPushButton(questionForm)
+        self.choice0.setObjectName(u"choice0")
+
+        self.verticalLayout.addWidget(self.choice0)
+
+        self.choice2 = QPushButton(questionForm)
+        self.choice2.setObjectName(u"choice2")
+
+        self.verticalLayout.addWidget(self.choice2)
+
+        self.choice3 = QPushButton(questionForm)
+        self.choice3.setObjectName(u"choice3")
+
+        self.verticalLayout.addWidget(self.choice3)
+
+
+        self.retranslateUi(questionForm)
+
+        QMetaObject.connectSlotsByName(questionForm)
+    # setupUi
+
+    def retranslateUi(self, questionForm):
+        questionForm.setWindowTitle(QCoreApplication.translate("questionForm", u"Form", None))
+        self.question.setText(QCoreApplication.translate("questionForm", u"Question", None))
+        self.choice1.setText(QCoreApplication.translate("questionForm", u"PushButton", None))
+        self.choice0.setText(QCoreApplication.translate("questionForm", u"PushButton", None))
+        self.choice2.setText(QCoreApplication.translate("questionForm", u"PushButton", None))
+        self.choice3.setText(QCoreApplication.translate("questionForm", u"PushButton", None))
+    # retranslateUi
+
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'welcome.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QGridLayout, QLabel, QPushButton,
+    QSizePolicy, QSpacerItem, QWidget)
+
+class Ui_welcome(object):
+    def setupUi(self, welcome):
+        if not welcome.objectName():
+            welcome.setObjectName(u"welcome")
+        welcome.resize(640, 480)
+        self.gridLayout = QGridLayout(welcome)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.courses_button = QPushButton(welcome)
+        self.courses_button.setObjectName(u"courses_button")
+
+        self.gridLayout.addWidget(self.courses_button, 3, 0, 1, 1)
+
+        self.review_button = QPushButton(welcome)
+        self.review_button.setObjectName(u"review_button")
+
+        self.gridLayout.addWidget(self.review_button, 3, 1, 1, 1)
+
+        self.new_course_button = QPushButton(welcome)
+        self.new_course_button.setObjectName(u"new_course_button")
+        self.new_course_button.setFlat(True)
+
+        self.gridLayout.addWidget(self.new_course_button, 3, 2, 1, 1)
+
+        self.stats_button = QPushButton(welcome)
+        self.stats_button.setObjectName(u"stats_button")
+
+        self.gridLayout.addWidget(self.stats_button, 3, 3, 1, 1)
+
+        self.label = QLabel(welcome)
+        self.label.setObjectName(u"label")
+        font = QFont()
+        font.setPointSize(18)
+        self.label.setFont(font)
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.gridLayout.addWidget(self.label, 1, 0, 1, 4)
+
+        self.label_2 = QLabel(welcome)
+        self.label_2.setObjectName(u"label_2")
+        self.label_2.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.gridLayout.addWidget(self.label_2, 2, 0, 1, 4)
+
+        self.verticalSpacer = QSpacerItem(625, 134, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.gridLayout.addItem(self.verticalSpacer, 4, 0, 1, 4)
+
+        self.verticalSpacer_2 = QSpacerItem(625, 65, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.gridLayout.addItem(self.verticalSpacer_2, 0, 0, 1, 4)
+
+        self.gridLayout.setRowStretch(0, 1)
+        self.gridLayout.setRowStretch(1, 2)
+        self.gridLayout.setRowStretch(2, 1)
+        self.gridLayout.setRowStretch(3, 1)
+        self.gridLayout.setRowStretch(4, 2)
+
+        self.retranslateUi(welcome)
+
+        QMetaObject.connectSlotsByName(welcome)
+    # setupUi
+
+    def retranslateUi(self, welcome):
+        welcome.setWindowTitle(QCoreApplication.translate("welcome", u"Form", None))
+        self.courses_button.setText(QCoreApplication.translate("welcome", u"Courses", None))
+        self.review_button.setText(QCoreApplication.translate("welcome", u"Review", None))
+        self.new_course_button.setText(QCoreApplication.translate("welcome", u"+ New Course", None))
+        self.stats_button.setText(QCoreApplication.translate("welcome", u"Statistics", None))
+        self.label.setText(QCoreApplication.translate("welcome", u"Welcome to Cute", None))
+        self.label_2.setText(QCoreApplication.translate("welcome", u"Load or create a course", None))
+    # retranslateUi
+
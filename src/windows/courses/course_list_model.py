@@ -0,0 +1,133 @@
+import logging
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    Signal,
+    Slot,
+)
+
+from models.db import Course
+from storage.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+
+
+class SearchSignals(QObject):
+    found = Signal(int, list)
+
+
+# Ranking the matches of a short prefix takes up to hundreds of milliseconds on
+# a huge question bank, so searches run off the GUI thread.
+class SearchJob(QRunnable):
+    def __init__(self, repository: Repository, generation: int, query: str, offset: int):
+        super().__init__()
+        self.repository = repository
+        self.generation = generation
+        self.query = query
+        self.offset = offset
+        self.signals = SearchSignals()
+
+    def run(self):
+        try:
+            page = self.repository.search_courses(self.query, self.offset, PAGE_SIZE)
+        except Exception as e:
+            logger.warning("Searching courses failed: %s", e)
+            page = []
+        self.signals.found.emit(self.generation, page)
+
+
+class CourseListModel(QAbstractListModel):
+    CourseIdRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, repository: Repository, parent: QObject = None):
+        super().__init__(parent)
+        self.repository = repository
+        self.courses: list[tuple[int, str, int]] = []
+        self.query = ""
+        self.has_more = True
+        # Bumped on every new query, so results of older ones are dropped.
+        self.generation = 0
+        self.searching = False
+        self.search_pool = QThreadPool(self)
+        self.search_pool.setMaxThreadCount(1)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.courses)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        course_id, name, _ = self.courses[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return name
+        if role == self.CourseIdRole:
+            return course_id
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.has_more and not self.searching
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if parent.isValid():
+            return
+        if self.query:
+            self.searching = True
+            job = SearchJob(self.repository, self.generation, self.query, len(self.courses))
+            job.signals.found.connect(self.on_search_found)
+            self.search_pool.start(job)
+            return
+        self.append_page(self.repository.fetch_course_page(self.last_key(), PAGE_SIZE))
+
+    @Slot(int, list)
+    def on_search_found(self, generation: int, page: list):
+        if generation != self.generation:
+            return
+        self.searching = False
+        self.append_page(page)
+
+    def append_page(self, page: list[tuple[int, str, int]]):
+        self.has_more = len(page) == PAGE_SIZE
+        if not page:
+            return
+        self.beginInsertRows(
+            QModelIndex(), len(self.courses), len(self.courses) + len(page) - 1
+        )
+        self.courses.extend(page)
+        self.endInsertRows()
+
+    def last_key(self) -> tuple | None:
+        if not self.courses:
+            return None
+        course_id, _, created_at = self.courses[-1]
+        return (created_at, course_id)
+
+    def set_query(self, query: str):
+        self.beginResetModel()
+        # Searches for the previous query that haven't started are skipped.
+        self.search_pool.clear()
+        self.generation += 1
+        self.searching = False
+        self.query = query
+        self.courses = []
+        self.has_more = True
+        self.endResetModel()
+
+    def insert_course(self, course: Course):
+        if self.query:
+            # Search results are ranked, so let the search place the new course.
+            self.set_query(self.query)
+            return
+
+        # Newest first, so a freshly created course always goes on top.
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.courses.insert(0, (course.id, course.name, course.created_at))
+        self.endInsertRows()
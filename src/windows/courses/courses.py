@@ -1,70 +1,65 @@
-import sys
-from pathlib import Path
-import sqlite3
-
-
-from PySide6.QtUiTools import QUiLoader
 from PySide6.QtWidgets import (
     QApplication,
+    QLineEdit,
+    QListView,
     QMainWindow,
-    QPushButton,
-    QScrollArea,
-    QVBoxLayout,
 )
-from PySide6.QtCore import QFile, QIODevice, QObject, Signal, Slot
+from PySide6.QtCore import QModelIndex, QObject, QTimer, Signal, Slot
 
-from dotenv import load_dotenv
+from storage.repository import Repository
+from tracing import traced
+from windows.courses.course_list_model import CourseListModel
+from windows.courses.ui_courses import Ui_courses_window
 
-load_dotenv()
+# Ranking a common prefix scores every match, tens of milliseconds on a large
+# question bank, so the search waits until typing pauses.
+SEARCH_DELAY_MS = 150
 
 
 class CoursesWindow(QObject):
     open_new_course_window = Signal()
     open_course_window = Signal(int)
 
-    def __init__(self, app: QApplication, db: sqlite3.Connection):
+    def __init__(self, app: QApplication, repository: Repository):
         super().__init__()
         self.app = app
         self.window: QMainWindow = None
-        self.courses_scroll_area: QScrollArea = None
-
-        self.db = db
-        self.cursor = self.db.cursor()
-
-        ui_file_name = str(Path(__file__).parent / "courses.ui")
-        ui_file = QFile(ui_file_name)
-        if not ui_file.open(QIODevice.ReadOnly):
-            print(f"Cannot open {ui_file_name}: {ui_file.errorString()}")
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.window = loader.load(ui_file)
-        ui_file.close()
-        if not self.window:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.new_course_button = self.window.new_course_button
-        assert isinstance(self.new_course_button, QPushButton)
+        self.search_input: QLineEdit = None
+        self.courses_list: QListView = None
+
+        self.repository = repository
+
+        self.window = QMainWindow()
+        self.ui = Ui_courses_window()
+        self.ui.setupUi(self.window)
+
+        self.new_course_button = self.ui.new_course_button
         self.new_course_button.clicked.connect(self.on_new_course_clicked)
 
-        self.courses_scroll_area = self.window.courses_scroll_area
-        assert isinstance(self.courses_scroll_area, QScrollArea)
+        self.search_input = self.ui.search_input
+        self.search_input.textChanged.connect(self.on_search_changed)
 
-        self.load_courses()
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.load_courses)
 
+        self.courses_model = CourseListModel(self.repository, self)
+        app.aboutToQuit.connect(self.courses_model.search_pool.waitForDone)
+
+        self.courses_list = self.ui.courses_list
+        self.courses_list.setModel(self.courses_model)
+        self.courses_list.clicked.connect(self.on_course_activated)
+
+    @traced("ui", "ui.load_courses")
     def load_courses(self):
-        self.cursor.execute(
-            "SELECT id, name FROM course ORDER BY created_at DESC",
-        )
-        courses = self.cursor.fetchall()
-        print(courses)
-        self.courses_scroll_area.setLayout(QVBoxLayout())
-        for course in courses:
-            button = QPushButton(course[1])
-            button.clicked.connect(
-                lambda _, course_id=course[0]: self.on_course_clicked(course_id)
-            )
-            self.courses_scroll_area.layout().addWidget(button)
+        self.courses_model.set_query(self.search_input.text().strip())
+
+    def on_search_changed(self, text: str):
+        self.search_timer.start()
+
+    def on_course_activated(self, index: QModelIndex):
+        self.on_course_clicked(index.data(CourseListModel.CourseIdRole))
 
     def on_new_course_clicked(self):
         self.open_new_course_window.emit()
@@ -75,4 +70,6 @@ class CoursesWindow(QObject):
 
     @Slot(int)
     def on_course_created(self, course_id: int):
-        self.load_courses()
+        course = self.repository.fetch_course(course_id)
+        if course is not None:
+            self.courses_model.insert_course(course)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'courses.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QLineEdit, QListView,
+    QMainWindow, QMenuBar, QPushButton, QSizePolicy,
+    QStatusBar, QVBoxLayout, QWidget)
+
+class Ui_courses_window(object):
+    def setupUi(self, courses_window):
+        if not courses_window.objectName():
+            courses_window.setObjectName(u"courses_window")
+        courses_window.resize(531, 476)
+        self.centralwidget = QWidget(courses_window)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.verticalLayout = QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.search_input = QLineEdit(self.centralwidget)
+        self.search_input.setObjectName(u"search_input")
+        self.search_input.setClearButtonEnabled(True)
+
+        self.verticalLayout.addWidget(self.search_input)
+
+        self.courses_list = QListView(self.centralwidget)
+        self.courses_list.setObjectName(u"courses_list")
+        self.courses_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.courses_list.setUniformItemSizes(True)
+
+        self.verticalLayout.addWidget(self.courses_list)
+
+        self.new_course_button = QPushButton(self.centralwidget)
+        self.new_course_button.setObjectName(u"new_course_button")
+        icon = QIcon(QIcon.fromTheme(QIcon.ThemeIcon.ListAdd))
+        self.new_course_button.setIcon(icon)
+
+        self.verticalLayout.addWidget(self.new_course_button)
+
+        courses_window.setCentralWidget(self.centralwidget)
+        self.menubar = QMenuBar(courses_window)
+        self.menubar.setObjectName(u"menubar")
+        self.menubar.setGeometry(QRect(0, 0, 531, 30))
+        courses_window.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(courses_window)
+        self.statusbar.setObjectName(u"statusbar")
+        courses_window.setStatusBar(self.statusbar)
+
+        self.retranslateUi(courses_window)
+
+        QMetaObject.connectSlotsByName(courses_window)
+    # setupUi
+
+    def retranslateUi(self, courses_window):
+        courses_window.setWindowTitle(QCoreApplication.translate("courses_window", u"Courses", None))
+        self.search_input.setPlaceholderText(QCoreApplication.translate("courses_window", u"Search courses...", None))
+        self.new_course_button.setText(QCoreApplication.translate("courses_window", u"New Course", None))
+    # retranslateUi
+
@@ -0,0 +1,97 @@
+import logging
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Qt, QTimer, Slot
+from PySide6.QtWidgets import (
+    QApplication,
+    QFileDialog,
+    QMainWindow,
+    QTableWidgetItem,
+)
+
+import tracing
+from windows.diagnostics.ui_diagnostics import Ui_diagnostics_window
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsWindow(QObject):
+    def __init__(self, app: QApplication):
+        super().__init__()
+        self.app = app
+
+        self.window = QMainWindow()
+        self.ui = Ui_diagnostics_window()
+        self.ui.setupUi(self.window)
+
+        self.tracing_input = self.ui.tracing_input
+        self.tracing_input.setChecked(tracing.enabled)
+        self.tracing_input.toggled.connect(tracing.set_enabled)
+
+        self.clear_button = self.ui.clear_button
+        self.clear_button.clicked.connect(self.on_clear_clicked)
+
+        self.export_button = self.ui.export_button
+        self.export_button.clicked.connect(self.on_export_clicked)
+
+        self.summary_table = self.ui.summary_table
+
+        # Only refreshes while shown, so a hidden panel costs nothing.
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def show(self):
+        self.refresh()
+        self.refresh_timer.start()
+        self.window.show()
+
+    @Slot()
+    def refresh(self):
+        if not self.window.isVisible() and self.refresh_timer.isActive():
+            self.refresh_timer.stop()
+
+        stats = tracing.summary()
+        self.summary_table.setSortingEnabled(False)
+        self.summary_table.setRowCount(len(stats))
+        for row, item in enumerate(stats):
+            values = (
+                item.name,
+                item.category,
+                item.count,
+                round(item.total_ms, 2),
+                round(item.median_ms, 2),
+                round(item.p95_ms, 2),
+                round(item.max_ms, 2),
+            )
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem()
+                # Numbers as data so sorting by a column is numeric.
+                cell.setData(Qt.ItemDataRole.DisplayRole, value)
+                self.summary_table.setItem(row, column, cell)
+        self.summary_table.setSortingEnabled(True)
+        self.window.statusBar().showMessage(
+            f"{sum(item.count for item in stats)} spans recorded"
+        )
+
+    @Slot()
+    def on_clear_clicked(self):
+        tracing.clear()
+        self.refresh()
+
+    @Slot()
+    def on_export_clicked(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self.window, "Export trace", "trace.json", "Chrome trace (*.json)"
+        )
+        if not path:
+            return
+        try:
+            count = tracing.export_chrome_trace(Path(path))
+        except OSError as e:
+            logger.error("Exporting the trace failed: %s", e)
+            self.window.statusBar().showMessage(f"Export failed: {e}")
+            return
+        self.window.statusBar().showMessage(f"Exported {count} spans to {path}")
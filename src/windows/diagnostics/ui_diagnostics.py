@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'diagnostics.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QCheckBox, QGridLayout,
+    QHeaderView, QMainWindow, QPushButton, QSizePolicy,
+    QSpacerItem, QStatusBar, QTableWidget, QTableWidgetItem,
+    QWidget)
+
+class Ui_diagnostics_window(object):
+    def setupUi(self, diagnostics_window):
+        if not diagnostics_window.objectName():
+            diagnostics_window.setObjectName(u"diagnostics_window")
+        diagnostics_window.resize(760, 480)
+        self.centralwidget = QWidget(diagnostics_window)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.gridLayout = QGridLayout(self.centralwidget)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.tracing_input = QCheckBox(self.centralwidget)
+        self.tracing_input.setObjectName(u"tracing_input")
+
+        self.gridLayout.addWidget(self.tracing_input, 0, 0, 1, 1)
+
+        self.horizontalSpacer = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+
+        self.gridLayout.addItem(self.horizontalSpacer, 0, 1, 1, 1)
+
+        self.clear_button = QPushButton(self.centralwidget)
+        self.clear_button.setObjectName(u"clear_button")
+
+        self.gridLayout.addWidget(self.clear_button, 0, 2, 1, 1)
+
+        self.export_button = QPushButton(self.centralwidget)
+        self.export_button.setObjectName(u"export_button")
+
+        self.gridLayout.addWidget(self.export_button, 0, 3, 1, 1)
+
+        self.summary_table = QTableWidget(self.centralwidget)
+        if (self.summary_table.columnCount() < 7):
+            self.summary_table.setColumnCount(7)
+        __qtablewidgetitem = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(0, __qtablewidgetitem)
+        __qtablewidgetitem1 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(1, __qtablewidgetitem1)
+        __qtablewidgetitem2 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(2, __qtablewidgetitem2)
+        __qtablewidgetitem3 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(3, __qtablewidgetitem3)
+        __qtablewidgetitem4 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(4, __qtablewidgetitem4)
+        __qtablewidgetitem5 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(5, __qtablewidgetitem5)
+        __qtablewidgetitem6 = QTableWidgetItem()
+        self.summary_table.setHorizontalHeaderItem(6, __qtablewidgetitem6)
+        self.summary_table.setObjectName(u"summary_table")
+        self.summary_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.summary_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.summary_table.setSortingEnabled(True)
+        self.summary_table.horizontalHeader().setStretchLastSection(True)
+        self.summary_table.verticalHeader().setVisible(False)
+
+        self.gridLayout.addWidget(self.summary_table, 1, 0, 1, 4)
+
+        diagnostics_window.setCentralWidget(self.centralwidget)
+        self.statusbar = QStatusBar(diagnostics_window)
+        self.statusbar.setObjectName(u"statusbar")
+        diagnostics_window.setStatusBar(self.statusbar)
+
+        self.retranslateUi(diagnostics_window)
+
+        QMetaObject.connectSlotsByName(diagnostics_window)
+    # setupUi
+
+    def retranslateUi(self, diagnostics_window):
+        diagnostics_window.setWindowTitle(QCoreApplication.translate("diagnostics_window", u"Diagnostics", None))
+        self.tracing_input.setText(QCoreApplication.translate("diagnostics_window", u"Record timings", None))
+        self.clear_button.setText(QCoreApplication.translate("diagnostics_window", u"Clear", None))
+        self.export_button.setText(QCoreApplication.translate("diagnostics_window", u"Export trace...", None))
+        ___qtablewidgetitem = self.summary_table.horizontalHeaderItem(0)
+        ___qtablewidgetitem.setText(QCoreApplication.translate("diagnostics_window", u"Span", None))
+        ___qtablewidgetitem1 = self.summary_table.horizontalHeaderItem(1)
+        ___qtablewidgetitem1.setText(QCoreApplication.translate("diagnostics_window", u"Category", None))
+        ___qtablewidgetitem2 = self.summary_table.horizontalHeaderItem(2)
+        ___qtablewidgetitem2.setText(QCoreApplication.translate("diagnostics_window", u"Count", None))
+        ___qtablewidgetitem3 = self.summary_table.horizontalHeaderItem(3)
+        ___qtablewidgetitem3.setText(QCoreApplication.translate("diagnostics_window", u"Total ms", None))
+        ___qtablewidgetitem4 = self.summary_table.horizontalHeaderItem(4)
+        ___qtablewidgetitem4.setText(QCoreApplication.translate("diagnostics_window", u"Median ms", None))
+        ___qtablewidgetitem5 = self.summary_table.horizontalHeaderItem(5)
+        ___qtablewidgetitem5.setText(QCoreApplication.translate("diagnostics_window", u"p95 ms", None))
+        ___qtablewidgetitem6 = self.summary_table.horizontalHeaderItem(6)
+        ___qtablewidgetitem6.setText(QCoreApplication.translate("diagnostics_window", u"Max ms", None))
+    # retranslateUi
+
@@ -1,120 +1,179 @@
-import os
-import sys
+import logging
 from pathlib import Path
-import sqlite3
-import time
+from typing import TYPE_CHECKING
 
+from PySide6.QtWidgets import QApplication, QFileDialog, QLineEdit, QMainWindow
+from PySide6.QtCore import QObject, QThreadPool, Signal, Slot
 
-from PySide6.QtUiTools import QUiLoader
-from PySide6.QtWidgets import (
-    QApplication,
-    QLineEdit,
-    QMainWindow,
-    QPlainTextEdit,
-    QPushButton,
-)
-from PySide6.QtCore import QFile, QIODevice, QObject, Signal
+from services.llm_cache import CacheMode
+from services.pipeline import GenerationConfig
+from services.settings import GeneratorSettings
+from storage.repository import Repository
+from windows.new_course.ui_new_course import Ui_new_course_window
 
-from openai import OpenAI
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    from services.generation import GenerateCourseJob, ImportDocumentJob
 
-from models.ai import CreateCourseInput
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+DOCUMENT_FILTER = "Documents (*.txt *.md *.markdown *.rst *.html *.htm *.xhtml);;All files (*)"
 
 
 class NewCourseWindow(QObject):
     course_was_created = Signal(int)
 
-    def __init__(self, app: QApplication, db: sqlite3.Connection):
+    def __init__(
+        self,
+        app: QApplication,
+        repository: Repository,
+        generator_settings: GeneratorSettings,
+    ):
         super().__init__()
         self.app = app
         self.window: QMainWindow = None
-        self.openai_client: OpenAI = None
         self.openai_url_input: QLineEdit = None
         self.openai_api_key_input: QLineEdit = None
+        self.job: "GenerateCourseJob | ImportDocumentJob" = None
+        self.warnings: list[str] = []
 
-        self.db = db
-        self.cursor = self.db.cursor()
-
-        ui_file_name = str(Path(__file__).parent / "new_course.ui")
-        ui_file = QFile(ui_file_name)
-        if not ui_file.open(QIODevice.ReadOnly):
-            print(f"Cannot open {ui_file_name}: {ui_file.errorString()}")
-            sys.exit(-1)
-        loader = QUiLoader()
-        self.window = loader.load(ui_file)
-        ui_file.close()
-        if not self.window:
-            print(loader.errorString())
-            sys.exit(-1)
-
-        self.prompt_input = self.window.prompt_input
-        assert isinstance(self.prompt_input, QPlainTextEdit)
-
-        self.openai_url_input = self.window.openai_url_input
-        assert isinstance(self.openai_url_input, QLineEdit)
-        self.openai_url_input.setText(os.environ.get("OPENAI_BASE_URL", ""))
-
-        self.openai_api_key_input = self.window.openai_api_key_input
-        assert isinstance(self.openai_api_key_input, QLineEdit)
-        self.openai_api_key_input.setText(os.environ.get("OPENAI_API_KEY", ""))
-
-        self.submit_button = self.window.submit_button
-        assert isinstance(self.submit_button, QPushButton)
-        self.submit_button.clicked.connect(self.on_prompt_submitted)
+        self.repository = repository
+        self.generator_settings = generator_settings
+        self.thread_pool = QThreadPool.globalInstance()
 
-    def on_prompt_submitted(self):
-        self.openai_client = OpenAI(
-            api_key=self.openai_api_key_input.text(),
-            base_url=self.openai_url_input.text(),
-        )
-        prompt = self.prompt_input.toPlainText()
-        response = self.openai_client.chat.completions.parse(
-            # model="openai/gpt-oss-20b",
-            model="gpt-5-mini",
-            # model="deepseek-chat",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a learning material generator that generates learning materials based on the user's prompt."
-                    + " You will generate a list of 3-5 questions and answers that the user can use to learn the content."
-                    + " Always generate multiple questions (at least 3) to provide comprehensive coverage of the topic.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format=CreateCourseInput,
-        )
+        self.window = QMainWindow()
+        self.ui = Ui_new_course_window()
+        self.ui.setupUi(self.window)
 
-        course = response.choices[0].message.parsed
+        self.prompt_input = self.ui.prompt_input
 
-        print(course)
+        self.document_input = self.ui.document_input
+        self.document_input.textChanged.connect(self.on_document_changed)
 
-        self.cursor.execute(
-            "INSERT INTO course (name, description, created_at) VALUES (?, ?, ?)",
-            (course.name, course.description, int(time.time())),
-        )
-        self.db.commit()
-        course_id = self.cursor.lastrowid
-
-        assert isinstance(course_id, int)
-
-        for item in course.questions:
-            self.cursor.execute(
-                "INSERT INTO question (course_id, question, answer, choices, explanation, difficulty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    course_id,
-                    item.question,
-                    item.answer,
-                    str(item.choices),
-                    item.explanation,
-                    item.difficulty,
-                    int(time.time()),
-                ),
-            )
+        self.open_file_button = self.ui.open_file_button
+        self.open_file_button.clicked.connect(self.on_open_file_clicked)
 
-        self.db.commit()
+        self.openai_url_input = self.ui.openai_url_input
+        self.openai_url_input.setText(generator_settings.base_url)
 
-        self.course_was_created.emit(course_id)
+        self.openai_api_key_input = self.ui.openai_api_key_input
+        self.openai_api_key_input.setText(generator_settings.api_key)
+
+        self.model_input = self.ui.model_input
+        self.model_input.setText(generator_settings.model)
+
+        self.question_count_input = self.ui.question_count_input
+
+        self.refresh_cache_input = self.ui.refresh_cache_input
 
-        self.window.close()
+        self.submit_button = self.ui.submit_button
+        self.submit_button.clicked.connect(self.on_prompt_submitted)
+
+    def on_prompt_submitted(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.submit_button.setEnabled(False)
+            self.window.statusBar().showMessage("Cancelling...")
+            return
+
+        config = GenerationConfig(question_count=self.question_count_input.value())
+        if self.refresh_cache_input.isChecked():
+            config.cache_mode = CacheMode.REFRESH
+
+        # Imported here so openai is only loaded once generation is requested.
+        from services.backends import backend_from_settings
+        from services.generation import GenerateCourseJob, ImportDocumentJob
+
+        settings = self.generator_settings
+        settings.base_url = self.openai_url_input.text().strip()
+        settings.api_key = self.openai_api_key_input.text()
+        settings.model = self.model_input.text().strip()
+        try:
+            backend = backend_from_settings(settings)
+        except ValueError as e:
+            logger.error("Invalid generator settings: %s", e)
+            self.window.statusBar().showMessage(str(e))
+            return
+
+        document_path = self.document_input.text().strip()
+        if document_path:
+            self.job = ImportDocumentJob(
+                self.repository,
+                backend=backend,
+                path=Path(document_path).expanduser().resolve(),
+                config=config,
+            )
+        else:
+            self.job = GenerateCourseJob(
+                self.repository,
+                backend=backend,
+                prompt=self.prompt_input.toPlainText(),
+                config=config,
+            )
+        self.job.signals.question_generated.connect(self.on_question_generated)
+        self.job.signals.warning.connect(self.on_generation_warning)
+        self.job.signals.course_created.connect(self.on_course_created)
+        self.job.signals.failed.connect(self.on_generation_failed)
+        self.job.signals.cancelled.connect(self.on_generation_cancelled)
+
+        self.prompt_input.setReadOnly(True)
+        self.document_input.setReadOnly(True)
+        self.open_file_button.setEnabled(False)
+        self.question_count_input.setEnabled(False)
+        self.model_input.setReadOnly(True)
+        self.submit_button.setText("Cancel")
+        self.warnings = []
+        self.window.statusBar().showMessage(
+            "Importing document..." if document_path else "Generating course..."
+        )
+        self.thread_pool.start(self.job)
+
+    def on_open_file_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self.window, "Open learning material", "", DOCUMENT_FILTER
+        )
+        if path:
+            self.document_input.setText(path)
+
+    @Slot(str)
+    def on_document_changed(self, path: str):
+        # The document replaces the prompt as the source of the course.
+        self.prompt_input.setEnabled(not path.strip())
+
+    def finish_generation(self, message: str = ""):
+        self.job = None
+        self.prompt_input.setReadOnly(False)
+        self.document_input.setReadOnly(False)
+        self.open_file_button.setEnabled(True)
+        self.question_count_input.setEnabled(True)
+        self.model_input.setReadOnly(False)
+        self.submit_button.setText("Start Learning")
+        self.submit_button.setEnabled(True)
+        self.window.statusBar().showMessage(message)
+
+    @Slot(int)
+    def on_question_generated(self, count: int):
+        self.window.statusBar().showMessage(f"Generated {count} questions...")
+
+    @Slot(str)
+    def on_generation_warning(self, warning: str):
+        self.warnings.append(warning)
+
+    @Slot(int)
+    def on_course_created(self, course_id: int):
+        if self.warnings:
+            self.finish_generation(f"Course created, but {'; '.join(self.warnings)}")
+        else:
+            self.finish_generation()
+        self.course_was_created.emit(course_id)
+        # Stays open on warnings so the learner sees what the course is missing.
+        if not self.warnings:
+            self.window.close()
+
+    @Slot(str)
+    def on_generation_failed(self, error: str):
+        logger.error("Generating a course failed: %s", error)
+        self.finish_generation(f"Generation failed: {error}")
+
+    @Slot()
+    def on_generation_cancelled(self):
+        self.finish_generation("Generation cancelled")
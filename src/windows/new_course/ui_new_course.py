@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'new_course.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QGridLayout, QLabel,
+    QLineEdit, QMainWindow, QMenuBar, QPlainTextEdit,
+    QPushButton, QSizePolicy, QSpacerItem, QSpinBox,
+    QStatusBar, QWidget)
+
+class Ui_new_course_window(object):
+    def setupUi(self, new_course_window):
+        if not new_course_window.objectName():
+            new_course_window.setObjectName(u"new_course_window")
+        new_course_window.resize(529, 477)
+        self.centralwidget = QWidget(new_course_window)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.gridLayout = QGridLayout(self.centralwidget)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.gridLayout.setHorizontalSpacing(6)
+        self.verticalSpacer_3 = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.gridLayout.addItem(self.verticalSpacer_3, 5, 0, 1, 3)
+
+        self.verticalSpacer_2 = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+
+        self.gridLayout.addItem(self.verticalSpacer_2, 0, 0, 1, 3)
+
+        self.openai_url_input = QLineEdit(self.centralwidget)
+        self.openai_url_input.setObjectName(u"openai_url_input")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.openai_url_input.sizePolicy().hasHeightForWidth())
+        self.openai_url_input.setSizePolicy(sizePolicy)
+        self.openai_url_input.setFrame(True)
+
+        self.gridLayout.addWidget(self.openai_url_input, 15, 0, 1, 1)
+
+        self.openai_api_key_input = QLineEdit(self.centralwidget)
+        self.openai_api_key_input.setObjectName(u"openai_api_key_input")
+        sizePolicy.setHeightForWidth(self.openai_api_key_input.sizePolicy().hasHeightForWidth())
+        self.openai_api_key_input.setSizePolicy(sizePolicy)
+
+        self.gridLayout.addWidget(self.openai_api_key_input, 15, 1, 1, 2)
+
+        self.openai_api_key_label = QLabel(self.centralwidget)
+        self.openai_api_key_label.setObjectName(u"openai_api_key_label")
+        sizePolicy1 = QSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
+        sizePolicy1.setHorizontalStretch(1)
+        sizePolicy1.setVerticalStretch(0)
+        sizePolicy1.setHeightForWidth(self.openai_api_key_label.sizePolicy().hasHeightForWidth())
+        self.openai_api_key_label.setSizePolicy(sizePolicy1)
+
+        self.gridLayout.addWidget(self.openai_api_key_label, 14, 1, 1, 1)
+
+        self.document_input = QLineEdit(self.centralwidget)
+        self.document_input.setObjectName(u"document_input")
+        self.document_input.setClearButtonEnabled(True)
+
+        self.gridLayout.addWidget(self.document_input, 1, 0, 1, 2)
+
+        self.open_file_button = QPushButton(self.centralwidget)
+        self.open_file_button.setObjectName(u"open_file_button")
+
+        self.gridLayout.addWidget(self.open_file_button, 1, 2, 1, 1)
+
+        self.prompt_input = QPlainTextEdit(self.centralwidget)
+        self.prompt_input.setObjectName(u"prompt_input")
+        self.prompt_input.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+
+        self.gridLayout.addWidget(self.prompt_input, 2, 0, 1, 3)
+
+        self.question_count_label = QLabel(self.centralwidget)
+        self.question_count_label.setObjectName(u"question_count_label")
+
+        self.gridLayout.addWidget(self.question_count_label, 3, 0, 1, 1)
+
+        self.question_count_input = QSpinBox(self.centralwidget)
+        self.question_count_input.setObjectName(u"question_count_input")
+        self.question_count_input.setMinimum(3)
+        self.question_count_input.setMaximum(1000)
+        self.question_count_input.setSingleStep(10)
+        self.question_count_input.setValue(20)
+
+        self.gridLayout.addWidget(self.question_count_input, 3, 1, 1, 2)
+
+        self.model_label = QLabel(self.centralwidget)
+        self.model_label.setObjectName(u"model_label")
+
+        self.gridLayout.addWidget(self.model_label, 16, 0, 1, 1)
+
+        self.model_input = QLineEdit(self.centralwidget)
+        self.model_input.setObjectName(u"model_input")
+
+        self.gridLayout.addWidget(self.model_input, 16, 1, 1, 2)
+
+        self.refresh_cache_input = QCheckBox(self.centralwidget)
+        self.refresh_cache_input.setObjectName(u"refresh_cache_input")
+
+        self.gridLayout.addWidget(self.refresh_cache_input, 17, 0, 1, 3)
+
+        self.openai_url_label = QLabel(self.centralwidget)
+        self.openai_url_label.setObjectName(u"openai_url_label")
+
+        self.gridLayout.addWidget(self.openai_url_label, 14, 0, 1, 1)
+
+        self.submit_button = QPushButton(self.centralwidget)
+        self.submit_button.setObjectName(u"submit_button")
+
+        self.gridLayout.addWidget(self.submit_button, 4, 0, 1, 3)
+
+        new_course_window.setCentralWidget(self.centralwidget)
+        self.menubar = QMenuBar(new_course_window)
+        self.menubar.setObjectName(u"menubar")
+        self.menubar.setGeometry(QRect(0, 0, 529, 30))
+        new_course_window.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(new_course_window)
+        self.statusbar.setObjectName(u"statusbar")
+        new_course_window.setStatusBar(self.statusbar)
+
+        self.retranslateUi(new_course_window)
+
+        QMetaObject.connectSlotsByName(new_course_window)
+    # setupUi
+
+    def retranslateUi(self, new_course_window):
+        new_course_window.setWindowTitle(QCoreApplication.translate("new_course_window", u"New Course", None))
+        self.openai_url_input.setText("")
+        self.openai_url_input.setPlaceholderText(QCoreApplication.translate("new_course_window", u"OpenAI URL", None))
+        self.openai_api_key_label.setText(QCoreApplication.translate("new_course_window", u"API Key", None))
+        self.document_input.setPlaceholderText(QCoreApplication.translate("new_course_window", u"Learn from a text, Markdown or HTML file (optional)", None))
+        self.open_file_button.setText(QCoreApplication.translate("new_course_window", u"Open file...", None))
+        self.prompt_input.setPlainText(QCoreApplication.translate("new_course_window", u"I want to learn basic Spanish.", None))
+        self.prompt_input.setPlaceholderText(QCoreApplication.translate("new_course_window", u"I want to learn...", None))
+        self.question_count_label.setText(QCoreApplication.translate("new_course_window", u"Questions", None))
+        self.model_label.setText(QCoreApplication.translate("new_course_window", u"Model", None))
+        self.model_input.setPlaceholderText(QCoreApplication.translate("new_course_window", u"Default for the server", None))
+        self.refresh_cache_input.setText(QCoreApplication.translate("new_course_window", u"Ignore cached responses", None))
+        self.openai_url_label.setText(QCoreApplication.translate("new_course_window", u"OpenAI URL", None))
+        self.submit_button.setText(QCoreApplication.translate("new_course_window", u"Start Learning", None))
+    # retranslateUi
+
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtWidgets import (
+    QApplication,
+    QListWidgetItem,
+    QMainWindow,
+    QTableWidget,
+    QTableWidgetItem,
+)
+
+from storage.repository import Repository
+from tracing import traced
+from windows.stats.ui_stats import Ui_stats_window
+
+
+def percent(correct: int, answered: int) -> float:
+    return round(100 * correct / answered, 1) if answered else 0.0
+
+
+class StatsWindow(QObject):
+    def __init__(self, app: QApplication, repository: Repository):
+        super().__init__()
+        self.app = app
+        self.repository = repository
+
+        self.window = QMainWindow()
+        self.ui = Ui_stats_window()
+        self.ui.setupUi(self.window)
+
+        self.streak_label = self.ui.streak_label
+        self.total_label = self.ui.total_label
+        self.badge_list = self.ui.badge_list
+        self.course_table = self.ui.course_table
+        self.difficulty_table = self.ui.difficulty_table
+        self.activity_table = self.ui.activity_table
+
+    def show(self):
+        self.load()
+        self.window.show()
+        self.window.raise_()
+
+    # Every statistic is a precomputed row, so this stays fast however many
+    # answers have been recorded.
+    @traced("ui", "ui.load_stats")
+    def load(self):
+        stats = self.repository.fetch_learner_stats()
+        self.streak_label.setText(
+            f"{stats.current_streak} day streak (longest {stats.longest_streak})"
+        )
+        self.total_label.setText(
+            f"{stats.answered} answered, {percent(stats.correct, stats.answered)}% correct"
+            f" over {stats.active_days} days"
+        )
+
+        self.badge_list.clear()
+        for badge in self.repository.fetch_badges():
+            if badge.earned_at is None:
+                text = f"{badge.title} - {badge.description}"
+            else:
+                earned = datetime.fromtimestamp(badge.earned_at).strftime("%Y-%m-%d")
+                text = f"★ {badge.title} - {badge.description} (earned {earned})"
+            item = QListWidgetItem(text)
+            if badge.earned_at is None:
+                item.setForeground(Qt.GlobalColor.gray)
+            self.badge_list.addItem(item)
+
+        self.fill_table(self.course_table, self.repository.fetch_course_stats())
+        self.fill_table(self.difficulty_table, self.repository.fetch_difficulty_stats())
+        self.fill_table(self.activity_table, self.repository.fetch_daily_activity())
+
+    def fill_table(self, table: QTableWidget, rows: list[tuple]):
+        table.setRowCount(len(rows))
+        for row, (label, answered, correct) in enumerate(rows):
+            values = (label, answered, percent(correct, answered))
+            for column, value in enumerate(values):
+                cell = QTableWidgetItem()
+                cell.setData(Qt.ItemDataRole.DisplayRole, value)
+                table.setItem(row, column, cell)
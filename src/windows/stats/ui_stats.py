@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'stats.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QGridLayout, QHeaderView,
+    QLabel, QListWidget, QListWidgetItem, QMainWindow,
+    QSizePolicy, QStatusBar, QTabWidget, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget)
+
+class Ui_stats_window(object):
+    def setupUi(self, stats_window):
+        if not stats_window.objectName():
+            stats_window.setObjectName(u"stats_window")
+        stats_window.resize(640, 480)
+        self.centralwidget = QWidget(stats_window)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.gridLayout = QGridLayout(self.centralwidget)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.streak_label = QLabel(self.centralwidget)
+        self.streak_label.setObjectName(u"streak_label")
+        font = QFont()
+        font.setPointSize(14)
+        self.streak_label.setFont(font)
+
+        self.gridLayout.addWidget(self.streak_label, 0, 0, 1, 1)
+
+        self.total_label = QLabel(self.centralwidget)
+        self.total_label.setObjectName(u"total_label")
+        self.total_label.setAlignment(Qt.AlignmentFlag.AlignRight|Qt.AlignmentFlag.AlignVCenter)
+
+        self.gridLayout.addWidget(self.total_label, 0, 1, 1, 1)
+
+        self.tab_widget = QTabWidget(self.centralwidget)
+        self.tab_widget.setObjectName(u"tab_widget")
+        self.badges_tab = QWidget()
+        self.badges_tab.setObjectName(u"badges_tab")
+        self.badges_tab_layout = QVBoxLayout(self.badges_tab)
+        self.badges_tab_layout.setObjectName(u"badges_tab_layout")
+        self.badge_list = QListWidget(self.badges_tab)
+        self.badge_list.setObjectName(u"badge_list")
+        self.badge_list.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+
+        self.badges_tab_layout.addWidget(self.badge_list)
+
+        self.tab_widget.addTab(self.badges_tab, "")
+        self.courses_tab = QWidget()
+        self.courses_tab.setObjectName(u"courses_tab")
+        self.courses_tab_layout = QVBoxLayout(self.courses_tab)
+        self.courses_tab_layout.setObjectName(u"courses_tab_layout")
+        self.course_table = QTableWidget(self.courses_tab)
+        if (self.course_table.columnCount() < 3):
+            self.course_table.setColumnCount(3)
+        __qtablewidgetitem = QTableWidgetItem()
+        self.course_table.setHorizontalHeaderItem(0, __qtablewidgetitem)
+        __qtablewidgetitem1 = QTableWidgetItem()
+        self.course_table.setHorizontalHeaderItem(1, __qtablewidgetitem1)
+        __qtablewidgetitem2 = QTableWidgetItem()
+        self.course_table.setHorizontalHeaderItem(2, __qtablewidgetitem2)
+        self.course_table.setObjectName(u"course_table")
+        self.course_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.course_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.course_table.horizontalHeader().setStretchLastSection(True)
+        self.course_table.verticalHeader().setVisible(False)
+
+        self.courses_tab_layout.addWidget(self.course_table)
+
+        self.tab_widget.addTab(self.courses_tab, "")
+        self.difficulty_tab = QWidget()
+        self.difficulty_tab.setObjectName(u"difficulty_tab")
+        self.difficulty_tab_layout = QVBoxLayout(self.difficulty_tab)
+        self.difficulty_tab_layout.setObjectName(u"difficulty_tab_layout")
+        self.difficulty_table = QTableWidget(self.difficulty_tab)
+        if (self.difficulty_table.columnCount() < 3):
+            self.difficulty_table.setColumnCount(3)
+        __qtablewidgetitem3 = QTableWidgetItem()
+        self.difficulty_table.setHorizontalHeaderItem(0, __qtablewidgetitem3)
+        __qtablewidgetitem4 = QTableWidgetItem()
+        self.difficulty_table.setHorizontalHeaderItem(1, __qtablewidgetitem4)
+        __qtablewidgetitem5 = QTableWidgetItem()
+        self.difficulty_table.setHorizontalHeaderItem(2, __qtablewidgetitem5)
+        self.difficulty_table.setObjectName(u"difficulty_table")
+        self.difficulty_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.difficulty_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.difficulty_table.horizontalHeader().setStretchLastSection(True)
+        self.difficulty_table.verticalHeader().setVisible(False)
+
+        self.difficulty_tab_layout.addWidget(self.difficulty_table)
+
+        self.tab_widget.addTab(self.difficulty_tab, "")
+        self.activity_tab = QWidget()
+        self.activity_tab.setObjectName(u"activity_tab")
+        self.activity_tab_layout = QVBoxLayout(self.activity_tab)
+        self.activity_tab_layout.setObjectName(u"activity_tab_layout")
+        self.activity_table = QTableWidget(self.activity_tab)
+        if (self.activity_table.columnCount() < 3):
+            self.activity_table.setColumnCount(3)
+        __qtablewidgetitem6 = QTableWidgetItem()
+        self.activity_table.setHorizontalHeaderItem(0, __qtablewidgetitem6)
+        __qtablewidgetitem7 = QTableWidgetItem()
+        self.activity_table.setHorizontalHeaderItem(1, __qtablewidgetitem7)
+        __qtablewidgetitem8 = QTableWidgetItem()
+        self.activity_table.setHorizontalHeaderItem(2, __qtablewidgetitem8)
+        self.activity_table.setObjectName(u"activity_table")
+        self.activity_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.activity_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.activity_table.horizontalHeader().setStretchLastSection(True)
+        self.activity_table.verticalHeader().setVisible(False)
+
+        self.activity_tab_layout.addWidget(self.activity_table)
+
+        self.tab_widget.addTab(self.activity_tab, "")
+
+        self.gridLayout.addWidget(self.tab_widget, 1, 0, 1, 2)
+
+        stats_window.setCentralWidget(self.centralwidget)
+        self.statusbar = QStatusBar(stats_window)
+        self.statusbar.setObjectName(u"statusbar")
+        stats_window.setStatusBar(self.statusbar)
+
+        self.retranslateUi(stats_window)
+
+        self.tab_widget.setCurrentIndex(0)
+
+
+        QMetaObject.connectSlotsByName(stats_window)
+    # setupUi
+
+    def retranslateUi(self, stats_window):
+        stats_window.setWindowTitle(QCoreApplication.translate("stats_window", u"Statistics", None))
+        self.streak_label.setText(QCoreApplication.translate("stats_window", u"No streak yet", None))
+        self.total_label.setText(QCoreApplication.translate("stats_window", u"No answers yet", None))
+        self.tab_widget.setTabText(self.tab_widget.indexOf(self.badges_tab), QCoreApplication.translate("stats_window", u"Badges", None))
+        ___qtablewidgetitem = self.course_table.horizontalHeaderItem(0)
+        ___qtablewidgetitem.setText(QCoreApplication.translate("stats_window", u"Course", None))
+        ___qtablewidgetitem1 = self.course_table.horizontalHeaderItem(1)
+        ___qtablewidgetitem1.setText(QCoreApplication.translate("stats_window", u"Answered", None))
+        ___qtablewidgetitem2 = self.course_table.horizontalHeaderItem(2)
+        ___qtablewidgetitem2.setText(QCoreApplication.translate("stats_window", u"Correct %", None))
+        self.tab_widget.setTabText(self.tab_widget.indexOf(self.courses_tab), QCoreApplication.translate("stats_window", u"Courses", None))
+        ___qtablewidgetitem3 = self.difficulty_table.horizontalHeaderItem(0)
+        ___qtablewidgetitem3.setText(QCoreApplication.translate("stats_window", u"Difficulty", None))
+        ___qtablewidgetitem4 = self.difficulty_table.horizontalHeaderItem(1)
+        ___qtablewidgetitem4.setText(QCoreApplication.translate("stats_window", u"Answered", None))
+        ___qtablewidgetitem5 = self.difficulty_table.horizontalHeaderItem(2)
+        ___qtablewidgetitem5.setText(QCoreApplication.translate("stats_window", u"Correct %", None))
+        self.tab_widget.setTabText(self.tab_widget.indexOf(self.difficulty_tab), QCoreApplication.translate("stats_window", u"Difficulty", None))
+        ___qtablewidgetitem6 = self.activity_table.horizontalHeaderItem(0)
+        ___qtablewidgetitem6.setText(QCoreApplication.translate("stats_window", u"Day", None))
+        ___qtablewidgetitem7 = self.activity_table.horizontalHeaderItem(1)
+        ___qtablewidgetitem7.setText(QCoreApplication.translate("stats_window", u"Answered", None))
+        ___qtablewidgetitem8 = self.activity_table.horizontalHeaderItem(2)
+        ___qtablewidgetitem8.setText(QCoreApplication.translate("stats_window", u"Correct %", None))
+        self.tab_widget.setTabText(self.tab_widget.indexOf(self.activity_tab), QCoreApplication.translate("stats_window", u"Last 30 days", None))
+    # retranslateUi
+
@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Slot
+from PySide6.QtWidgets import QApplication
+
+from services.settings import GeneratorSettings
+from storage.repository import Repository
+from tracing import span
+
+if TYPE_CHECKING:
+    from windows.course.course import CourseWindow
+    from windows.courses.courses import CoursesWindow
+    from windows.diagnostics.diagnostics import DiagnosticsWindow
+    from windows.new_course.new_course import NewCourseWindow
+    from windows.stats.stats import StatsWindow
+
+
+# Windows (and the modules behind them) are only built the first time they
+# are needed, so startup only pays for the window that is shown first.
+class WindowManager(QObject):
+    def __init__(self, app: QApplication, repository: Repository):
+        super().__init__()
+        self.app = app
+        self.repository = repository
+        self.generator_settings = GeneratorSettings.from_env()
+        self._new_course_window: "NewCourseWindow" = None
+        self._courses_window: "CoursesWindow" = None
+        self._course_window: "CourseWindow" = None
+        self._diagnostics_window: "DiagnosticsWindow" = None
+        self._stats_window: "StatsWindow" = None
+
+    def new_course_window(self) -> "NewCourseWindow":
+        if self._new_course_window is None:
+            with span("ui.build_window.new_course", "ui"):
+                from windows.new_course.new_course import NewCourseWindow
+
+                self._new_course_window = NewCourseWindow(
+                    self.app, self.repository, self.generator_settings
+                )
+            self._new_course_window.course_was_created.connect(self.on_course_created)
+        return self._new_course_window
+
+    def courses_window(self) -> "CoursesWindow":
+        if self._courses_window is None:
+            with span("ui.build_window.courses", "ui"):
+                from windows.courses.courses import CoursesWindow
+
+                self._courses_window = CoursesWindow(self.app, self.repository)
+            self._courses_window.open_new_course_window.connect(
+                self.show_new_course_window
+            )
+            self._courses_window.open_course_window.connect(self.open_course)
+        return self._courses_window
+
+    def course_window(self) -> "CourseWindow":
+        if self._course_window is None:
+            with span("ui.build_window.course", "ui"):
+                from windows.course.course import CourseWindow
+
+                self._course_window = CourseWindow(
+                    self.app, self.repository, self.generator_settings
+                )
+            self._course_window.open_new_course_window.connect(
+                self.show_new_course_window
+            )
+            self._course_window.open_courses_window.connect(self.show_courses_window)
+            self._course_window.open_diagnostics_window.connect(
+                self.show_diagnostics_window
+            )
+            self._course_window.open_stats_window.connect(self.show_stats_window)
+        return self._course_window
+
+    def diagnostics_window(self) -> "DiagnosticsWindow":
+        if self._diagnostics_window is None:
+            from windows.diagnostics.diagnostics import DiagnosticsWindow
+
+            self._diagnostics_window = DiagnosticsWindow(self.app)
+        return self._diagnostics_window
+
+    def stats_window(self) -> "StatsWindow":
+        if self._stats_window is None:
+            with span("ui.build_window.stats", "ui"):
+                from windows.stats.stats import StatsWindow
+
+                self._stats_window = StatsWindow(self.app, self.repository)
+        return self._stats_window
+
+    @Slot()
+    def show_new_course_window(self):
+        self.new_course_window().window.show()
+
+    @Slot()
+    def show_courses_window(self):
+        self.courses_window().window.show()
+
+    @Slot()
+    def show_course_window(self):
+        self.course_window().window.show()
+
+    @Slot()
+    def show_diagnostics_window(self):
+        self.diagnostics_window().show()
+
+    @Slot()
+    def show_stats_window(self):
+        self.stats_window().show()
+
+    @Slot(int)
+    def open_course(self, course_id: int):
+        self.course_window().load_course(course_id)
+
+    @Slot(int)
+    def on_course_created(self, course_id: int):
+        # A courses window built later reads the new course from the database.
+        if self._courses_window is not None:
+            self._courses_window.on_course_created(course_id)
@@ -0,0 +1,12 @@
+import pytest
+
+from storage.repository import Repository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = Repository(tmp_path / "db.sqlite3")
+    repository.migrate()
+    yield repository
+    repository.close()
+
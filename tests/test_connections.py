@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from models.ai import CreateCourseInput, CreateQuestionInput
+from storage.connections import ConnectionManager
+
+
+@pytest.fixture
+def connections(tmp_path):
+    connections = ConnectionManager(tmp_path / "db.sqlite3")
+
+    def create(db: sqlite3.Connection):
+        with db:
+            db.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+            db.execute("INSERT INTO counter VALUES (1, 0)")
+
+    connections.write(create)
+    yield connections
+    connections.close()
+
+
+def increment(db: sqlite3.Connection) -> int:
+    with db:
+        (value,) = db.execute("SELECT value FROM counter").fetchone()
+        db.execute("UPDATE counter SET value = ?", (value + 1,))
+    return value + 1
+
+
+def counter(connections: ConnectionManager) -> int:
+    (value,) = connections.connection().execute("SELECT value FROM counter").fetchone()
+    return value
+
+
+def test_writes_from_many_threads_are_serialized(connections):
+    def run():
+        for _ in range(50):
+            connections.write(increment)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter(connections) == 400
+
+
+def test_writes_run_on_one_thread_and_nest(connections):
+    threads = set()
+
+    def outer(db: sqlite3.Connection) -> bool:
+        threads.add(threading.current_thread())
+        # Runs inline instead of waiting for the writer it is running on.
+        return connections.write(lambda inner_db: inner_db is db)
+
+    assert connections.write(outer)
+    connections.write(lambda db: threads.add(threading.current_thread()))
+    assert len(threads) == 1
+    assert threading.current_thread() not in threads
+
+
+def test_reads_are_query_only(connections):
+    with pytest.raises(sqlite3.OperationalError):
+        connections.connection().execute("UPDATE counter SET value = 1")
+
+
+def test_reads_see_committed_writes(connections):
+    db = connections.connection()
+    connections.write(increment)
+    assert db.execute("SELECT value FROM counter").fetchone() == (1,)
+
+
+def test_failed_write_is_rolled_back_and_raised(connections):
+    def fail(db: sqlite3.Connection):
+        db.execute("UPDATE counter SET value = 10")
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError, match="broken"):
+        connections.write(fail)
+    assert counter(connections) == 0
+    # The writer keeps going.
+    assert connections.write(increment) == 1
+
+
+def test_close_waits_for_pending_writes_and_reopens(connections):
+    def slow(db: sqlite3.Connection) -> int:
+        time.sleep(0.05)
+        return increment(db)
+
+    thread = threading.Thread(target=connections.write, args=(slow,))
+    thread.start()
+    time.sleep(0.01)
+    connections.close()
+    thread.join()
+    assert counter(connections) == 1
+    assert connections.write(increment) == 2
+
+
+# A second window or the CLI holds the write lock while it saves an answer to
+# the same question: the second answer must build on the first.
+def test_read_first_transactions_wait_for_other_writers(repository):
+    course_id = repository.create_course(
+        CreateCourseInput(
+            name="Course",
+            description="",
+            questions=[
+                CreateQuestionInput(
+                    question="What is the capital of France?",
+                    answer="Paris",
+                    choices=["Paris", "Rome"],
+                    explanation="",
+                    difficulty=3,
+                )
+            ],
+        )
+    )
+    (question,) = repository.fetch_questions(course_id)
+
+    other = sqlite3.connect(repository.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    thread = threading.Thread(target=repository.record_review, args=(question, True))
+    thread.start()
+    time.sleep(0.1)
+    other.execute(
+        "INSERT INTO review_state (question_id, course_id, ease, interval, repetitions, due_at, reviewed_at) VALUES (?, ?, 2.5, 1, 1, 0, 0)",
+        (question.id, course_id),
+    )
+    other.execute("COMMIT")
+    other.close()
+    thread.join()
+
+    assert repository.fetch_review_state(question.id).repetitions == 2
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from models.ai import CreateCourseInput, CreateQuestionInput
+from storage.course_archive import export_courses, import_courses, index_questions
+from storage.dedup_index import DedupIndex
+from storage.repository import Repository
+
+
+@pytest.fixture
+def target(tmp_path):
+    repository = Repository(tmp_path / "target.sqlite3")
+    repository.migrate()
+    yield repository
+    repository.close()
+
+
+def export(repository: Repository) -> str:
+    archive = io.StringIO()
+    export_courses(repository, archive)
+    return archive.getvalue()
+
+
+def questions(repository: Repository) -> list[tuple]:
+    return (
+        repository.connection()
+        .execute(
+            "SELECT course.name, course.description, course.created_at, question.question, question.answer, question.choices, question.explanation, question.difficulty, question.created_at FROM question JOIN course ON course.id = question.course_id ORDER BY question.id"
+        )
+        .fetchall()
+    )
+
+
+def test_round_trip(repository, target):
+    for name in ("Spanish", "Ünïcode ✓"):
+        repository.create_course(
+            CreateCourseInput(
+                name=name,
+                description=f"About {name}",
+                questions=[
+                    CreateQuestionInput(
+                        question=f"{name} question {index}?",
+                        answer="sí",
+                        choices=["sí", "no", "quizás", "nunca"],
+                        explanation="Because.",
+                        difficulty=index + 1,
+                    )
+                    for index in range(3)
+                ],
+            )
+        )
+    archive = export(repository)
+
+    assert import_courses(target, io.StringIO(archive)) == (2, 6, 0)
+    assert questions(target) == questions(repository)
+    assert export(target) == archive
+
+    # Importing again skips the courses already there.
+    assert import_courses(target, io.StringIO(archive)) == (0, 0, 2)
+    assert len(questions(target)) == 6
+
+    assert index_questions(target) == 6
+    assert DedupIndex(target.connection()).count_missing() == 0
+
+
+def test_broken_archive_changes_nothing(target):
+    archive = (
+        '{"type":"header","format":"cute-learning/courses","version":1}\n'
+        '{"type":"course","name":"A","description":"","created_at":1}\n'
+        '{"type":"question","question":"Q?"}\n'
+    )
+    with pytest.raises(ValueError, match="Line 3"):
+        import_courses(target, io.StringIO(archive))
+    assert target.fetch_course_page() == []
@@ -0,0 +1,137 @@
+import pytest
+
+from models.ai import CreateCourseInput, CreateQuestionInput
+from storage.dedup_index import (
+    DUPLICATE_SIMILARITY,
+    NUM_PERMUTATIONS,
+    band_buckets,
+    is_duplicate,
+    jaccard,
+    minhash,
+    shingles,
+)
+
+
+def question(text: str, answer: str) -> CreateQuestionInput:
+    return CreateQuestionInput(
+        question=text,
+        answer=answer,
+        choices=[answer, "Other 1", "Other 2", "Other 3"],
+        explanation="",
+        difficulty=3,
+    )
+
+
+# Distinct questions whose texts are about as similar as real duplicates.
+DISTINCT = [
+    ("In which year did World War I begin?", "1914", "In which year did World War II begin?", "1939"),
+    ("What is the past tense of go?", "went", "What is the past tense of do?", "did"),
+    ("Translate: the red house", "la casa roja", "Translate: the red horse", "el caballo rojo"),
+    ("Choose the correct sentence:", "She goes home.", "Choose the correct sentence:", "They were late."),
+    # Same answer, texts just below the threshold.
+    ("Is 'the red house' correct?", "Yes", "Is 'the red horse' correct?", "Yes"),
+]
+
+DUPLICATES = [
+    ("What is the capital of France?", "Paris", "what is the capital of France", "Paris."),
+    ("Which of these is a mammal?", "Whale", "Which one of these is a mammal?", "whale"),
+    ("In which year did World War I begin?", "1914", "Which year did World War I begin in?", "1914"),
+]
+
+
+@pytest.mark.parametrize("question, answer, other_question, other_answer", DISTINCT)
+def test_distinct_questions_are_kept(question, answer, other_question, other_answer):
+    assert not is_duplicate(question, answer, other_question, other_answer)
+
+
+@pytest.mark.parametrize("question, answer, other_question, other_answer", DUPLICATES)
+def test_rewordings_with_the_same_answer_are_duplicates(
+    question, answer, other_question, other_answer
+):
+    assert is_duplicate(question, answer, other_question, other_answer)
+
+
+def test_threshold():
+    assert DUPLICATE_SIMILARITY == 0.8
+    assert jaccard(
+        shingles("Is 'the red house' correct?"), shingles("Is 'the red horse' correct?")
+    ) == pytest.approx(0.7, abs=0.01)
+    assert jaccard(
+        shingles("Which of these is a mammal?"), shingles("Which one of these is a mammal?")
+    ) == pytest.approx(0.8, abs=0.01)
+
+
+def matching_slots(text: str, other_text: str) -> float:
+    return sum(a == b for a, b in zip(minhash(text), minhash(other_text))) / NUM_PERMUTATIONS
+
+
+def test_signatures_estimate_the_similarity():
+    for pair in DISTINCT + DUPLICATES:
+        exact = jaccard(shingles(pair[0]), shingles(pair[2]))
+        assert matching_slots(pair[0], pair[2]) == pytest.approx(exact, abs=0.2)
+    assert minhash("What is the capital of France?") == minhash("what is the capital of France")
+
+
+def test_duplicates_share_a_band():
+    for pair in DUPLICATES:
+        assert set(band_buckets(minhash(pair[0]))) & set(band_buckets(minhash(pair[2])))
+
+
+# Short texts leave most signature slots to be filled in from the others,
+# which must not make unrelated texts look alike.
+def test_short_texts_are_not_candidates():
+    texts = ["go", "do", "went", "the red house", "la casa roja", "past tense of be", "1914"]
+    for index, text in enumerate(texts):
+        for other_text in texts[index + 1 :]:
+            assert not set(band_buckets(minhash(text))) & set(band_buckets(minhash(other_text)))
+
+
+def test_near_duplicates_are_left_out_within_a_course(repository):
+    course_id = repository.create_course(
+        CreateCourseInput(
+            name="History",
+            description="Wars",
+            questions=[
+                question(*DISTINCT[0][:2]),
+                question(*DISTINCT[0][2:]),
+                question("Which year did World War I begin in?", "1914"),
+            ],
+        )
+    )
+    assert repository.count_questions(course_id) == 2
+
+    added = repository.add_questions(
+        course_id,
+        [
+            question("In which year did World War I begin", "1914"),
+            question("Which country was invaded on 1 September 1939?", "Poland"),
+        ],
+    )
+    assert added == 1
+    assert repository.count_questions(course_id) == 3
+
+
+def test_other_courses_keep_their_own_copy(repository):
+    questions = [question(*pair[:2]) for pair in DUPLICATES]
+    first = repository.create_course(
+        CreateCourseInput(name="Grammar", description="", questions=questions)
+    )
+    second = repository.create_course(
+        CreateCourseInput(name="Grammar 2", description="", questions=questions)
+    )
+    assert repository.count_questions(first) == len(questions)
+    assert repository.count_questions(second) == len(questions)
+
+
+def test_generic_wording_with_different_answers(repository):
+    course_id = repository.create_course(
+        CreateCourseInput(
+            name="Grammar",
+            description="",
+            questions=[
+                question("Choose the correct sentence:", answer)
+                for answer in ("She goes home.", "They were late.", "We have eaten.")
+            ],
+        )
+    )
+    assert repository.count_questions(course_id) == 3
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+from openai import APIConnectionError, APIStatusError
+import pytest
+
+from services import llm_client
+from services.llm_client import LLMClient, TokenBucket, parse_retry_after, retry_delay
+
+
+def status_error(status_code: int, headers: dict[str, str] | None = None) -> APIStatusError:
+    # Only the parts of an HTTP response the client reads.
+    response = SimpleNamespace(request=None, status_code=status_code, headers=headers or {})
+    return APIStatusError("error", response=response, body=None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_client.time, "monotonic", clock)
+    return clock
+
+
+def test_retry_after_in_milliseconds():
+    assert parse_retry_after({"retry-after-ms": "1500", "retry-after": "9"}) == 1.5
+
+
+def test_retry_after_in_seconds():
+    assert parse_retry_after({"retry-after": "7"}) == 7.0
+    assert parse_retry_after({"retry-after": "-3"}) == 0.0
+
+
+def test_retry_after_as_http_date():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert parse_retry_after(
+        {"retry-after": format_datetime(later, usegmt=True)}
+    ) == pytest.approx(30, abs=2)
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after({"retry-after": format_datetime(earlier, usegmt=True)}) == 0.0
+
+
+def test_invalid_retry_after_is_ignored():
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({"retry-after": "soon"}) is None
+    # A broken millisecond header falls back to the standard one.
+    assert parse_retry_after({"retry-after-ms": "soon", "retry-after": "2"}) == 2.0
+
+
+def test_retry_delay_follows_the_server_up_to_a_cap():
+    assert retry_delay(status_error(429, {"retry-after": "3"}), 0) == 3.0
+    assert retry_delay(status_error(429, {"retry-after": "3600"}), 0) == llm_client.MAX_BACKOFF
+    for attempt in range(10):
+        assert 0 <= retry_delay(status_error(503), attempt) <= llm_client.MAX_BACKOFF
+
+
+def test_bucket_allows_a_burst_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Later callers queue behind each other, one token interval apart.
+    assert [bucket.reserve() for _ in range(3)] == [1.0, 2.0, 3.0]
+
+
+def test_bucket_refills_over_time_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 0.5
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_call_retries_retryable_errors(monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm_client, "sleep", lambda seconds, is_cancelled: delays.append(seconds))
+    client = LLMClient("http://localhost/v1", "key", requests_per_minute=6000)
+    errors = [status_error(429, {"retry-after": "2"}), APIConnectionError(request=None)]
+
+    def request(openai):
+        if errors:
+            raise errors.pop(0)
+        return "done"
+
+    assert client.call(request) == "done"
+    # The limiter's own waits are zero at this rate.
+    backoffs = [delay for delay in delays if delay > 0]
+    assert len(backoffs) == 2 and backoffs[0] == 2.0
+    assert not errors
+
+
+def test_call_gives_up_on_other_errors_and_after_the_last_attempt(monkeypatch):
+    monkeypatch.setattr(llm_client, "sleep", lambda seconds, is_cancelled: None)
+    client = LLMClient("http://localhost/v1", "key", requests_per_minute=6000)
+    attempts = []
+
+    def request(openai, status_code):
+        attempts.append(status_code)
+        raise status_error(status_code)
+
+    with pytest.raises(APIStatusError):
+        client.call(lambda openai: request(openai, 400))
+    assert attempts == [400]
+
+    attempts.clear()
+    with pytest.raises(APIStatusError):
+        client.call(lambda openai: request(openai, 503), max_attempts=3)
+    assert attempts == [503] * 3
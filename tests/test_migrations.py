@@ -0,0 +1,241 @@
+from datetime import datetime
+import json
+import sqlite3
+
+import pytest
+
+from services.skill import INITIAL_SKILL, update_skill
+from storage.course_archive import index_questions
+from storage.dedup_index import DedupIndex
+from storage.migrations import (
+    MIGRATIONS,
+    create_stats_tables,
+    rebuild_dedup_index,
+    track_answered_questions,
+)
+from storage.repository import Repository
+
+
+# Noon on a day of March 2024, local time like the stats triggers.
+def at(day: int, hour: int = 12) -> int:
+    return int(datetime(2024, 3, day, hour).timestamp())
+
+
+def add_course(db: sqlite3.Connection, difficulties: list[int]) -> tuple[int, list[int]]:
+    course_id = db.execute(
+        "INSERT INTO course (name, description, created_at) VALUES ('Course', '', 0)"
+    ).lastrowid
+    question_ids = [
+        db.execute(
+            "INSERT INTO question (course_id, question, answer, choices, explanation, difficulty, created_at) VALUES (?, ?, 'a', ?, '', ?, 0)",
+            (course_id, f"Question {index}", json.dumps(["a", "b", "c", "d"]), difficulty),
+        ).lastrowid
+        for index, difficulty in enumerate(difficulties)
+    ]
+    return course_id, question_ids
+
+
+def log_review(
+    db: sqlite3.Connection, course_id: int, question_id: int, correct: bool, reviewed_at: int
+):
+    db.execute(
+        "INSERT INTO review_log (question_id, course_id, correct, grade, reviewed_at) VALUES (?, ?, ?, 0, ?)",
+        (question_id, course_id, int(correct), reviewed_at),
+    )
+
+
+@pytest.fixture
+def course(repository):
+    def create(db):
+        with db:
+            return add_course(db, [1, 3, 3, 5])
+
+    return repository.write(create)
+
+
+def review(repository: Repository, course, index: int, correct: bool, reviewed_at: int):
+    course_id, question_ids = course
+
+    def write(db):
+        with db:
+            log_review(db, course_id, question_ids[index], correct, reviewed_at)
+
+    repository.write(write)
+
+
+def learner_stats(repository: Repository) -> tuple:
+    return (
+        repository.connection()
+        .execute(
+            "SELECT answered, correct, current_streak, longest_streak, active_days, last_day FROM learner_stats"
+        )
+        .fetchone()
+    )
+
+
+def earned_at(repository: Repository, badge_id: str) -> int | None:
+    (value,) = (
+        repository.connection()
+        .execute("SELECT earned_at FROM badge WHERE id = ?", (badge_id,))
+        .fetchone()
+    )
+    return value
+
+
+def test_migrate_is_idempotent(repository):
+    repository.migrate()
+    (version,) = repository.connection().execute("PRAGMA user_version").fetchone()
+    assert version == len(MIGRATIONS)
+
+
+def test_streak_over_consecutive_days(repository, course):
+    review(repository, course, 0, True, at(1, 9))
+    review(repository, course, 1, False, at(1, 18))
+    assert learner_stats(repository) == (2, 1, 1, 1, 1, "2024-03-01")
+
+    review(repository, course, 2, True, at(2))
+    review(repository, course, 3, True, at(3))
+    assert learner_stats(repository) == (4, 3, 3, 3, 3, "2024-03-03")
+
+
+def test_skipped_day_restarts_the_streak(repository, course):
+    for day in (1, 2, 3):
+        review(repository, course, 0, True, at(day))
+    review(repository, course, 1, True, at(5))
+    assert learner_stats(repository)[2:] == (1, 3, 4, "2024-03-05")
+
+    review(repository, course, 2, True, at(6))
+    assert learner_stats(repository)[2:] == (2, 3, 5, "2024-03-06")
+
+
+def test_late_answer_for_an_earlier_day_keeps_the_streak(repository, course):
+    review(repository, course, 0, True, at(1))
+    review(repository, course, 1, True, at(2))
+    review(repository, course, 2, True, at(1, 20))
+    assert learner_stats(repository)[2:] == (2, 2, 2, "2024-03-02")
+
+
+def test_badges_are_earned_once(repository, course):
+    review(repository, course, 0, True, at(1))
+    assert earned_at(repository, "first_answer") == at(1)
+    assert earned_at(repository, "streak_3") is None
+
+    review(repository, course, 1, True, at(2))
+    review(repository, course, 2, True, at(3))
+    assert earned_at(repository, "streak_3") == at(3)
+    assert earned_at(repository, "first_answer") == at(1)
+    assert [badge.id for badge in repository.fetch_badges_earned_at(at(3))] == ["streak_3"]
+
+
+def test_per_course_and_difficulty_stats(repository, course):
+    review(repository, course, 0, True, at(1))
+    review(repository, course, 1, False, at(1))
+    review(repository, course, 2, True, at(2))
+    assert repository.fetch_difficulty_stats() == [(1, 1, 1), (3, 2, 1)]
+    assert [row[1:] for row in repository.fetch_course_stats()] == [(3, 2)]
+
+
+# A database from before the statistics and skill tables, with a history.
+def test_existing_history_is_replayed(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    db = sqlite3.connect(path)
+    stats_version = MIGRATIONS.index(create_stats_tables)
+    for version, migration in enumerate(MIGRATIONS[:stats_version]):
+        migration(db)
+        db.execute(f"PRAGMA user_version = {version + 1}")
+    course_id, question_ids = add_course(db, [1, 5, 3])
+    history = [
+        (question_ids[0], True, at(1)),
+        (question_ids[1], False, at(2)),
+        (question_ids[1], True, at(2, 18)),
+        (question_ids[2], True, at(3)),
+        (question_ids[0], True, at(5)),
+    ]
+    for question_id, correct, reviewed_at in history:
+        log_review(db, course_id, question_id, correct, reviewed_at)
+    db.commit()
+    db.close()
+
+    repository = Repository(path)
+    try:
+        repository.migrate()
+        assert learner_stats(repository) == (5, 4, 1, 3, 4, "2024-03-05")
+        assert earned_at(repository, "streak_3") == at(3)
+        (count,) = repository.connection().execute("SELECT COUNT(*) FROM review_log").fetchone()
+        assert count == len(history)
+
+        # Only the first answer to each question moves the skill.
+        skill, answered = INITIAL_SKILL, 0
+        for difficulty, correct in ((1, True), (5, False), (3, True)):
+            skill = update_skill(skill, answered, difficulty, correct)
+            answered += 1
+        course_skill = repository.fetch_course_skill(course_id)
+        assert course_skill.skill == pytest.approx(skill)
+        assert course_skill.answered == 3
+    finally:
+        repository.close()
+
+
+
+# Bands from the old MinHash are dropped with the signatures and rebuilt in
+# the background.
+def test_dedup_index_is_rebuilt(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    db = sqlite3.connect(path)
+    for version, migration in enumerate(MIGRATIONS[: MIGRATIONS.index(rebuild_dedup_index)]):
+        migration(db)
+        db.execute(f"PRAGMA user_version = {version + 1}")
+    add_course(db, [3, 3])
+    db.executemany(
+        "INSERT INTO question_signature (question_id, signature) VALUES (?, ?)",
+        [(1, b"old"), (2, b"old")],
+    )
+    db.executemany(
+        "INSERT INTO question_lsh (band, bucket, question_id) VALUES (?, ?, ?)",
+        [(0, 1, 1), (0, 1, 2)],
+    )
+    db.commit()
+    db.close()
+
+    repository = Repository(path)
+    try:
+        repository.migrate()
+        db = repository.connection()
+        tables = [name for (name,) in db.execute("SELECT name FROM sqlite_schema")]
+        assert "question_signature" not in tables
+        assert DedupIndex(db).count_missing() == 2
+        assert index_questions(repository) == 2
+        assert DedupIndex(db).count_missing() == 0
+    finally:
+        repository.close()
+
+
+def test_answered_questions_are_marked(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    db = sqlite3.connect(path)
+    for version, migration in enumerate(MIGRATIONS[: MIGRATIONS.index(track_answered_questions)]):
+        migration(db)
+        db.execute(f"PRAGMA user_version = {version + 1}")
+    course_id, question_ids = add_course(db, [3, 3, 3])
+    for reviewed_at in (at(2), at(1)):
+        log_review(db, course_id, question_ids[0], True, reviewed_at)
+        db.execute(
+            "INSERT OR REPLACE INTO review_state (question_id, course_id, ease, interval, repetitions, due_at, reviewed_at) VALUES (?, ?, 2.5, 1, 1, ?, ?)",
+            (question_ids[0], course_id, reviewed_at, reviewed_at),
+        )
+    db.commit()
+    db.close()
+
+    repository = Repository(path)
+    try:
+        repository.migrate()
+        new = repository.fetch_new_questions(course_id)
+        assert [question.id for question in new] == question_ids[1:]
+        (first_answered_at,) = (
+            repository.connection()
+            .execute("SELECT first_answered_at FROM question WHERE id = ?", (question_ids[0],))
+            .fetchone()
+        )
+        assert first_answered_at == at(1)
+    finally:
+        repository.close()
@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from models.ai import CreateCourseOutlineInput, CreateQuestionInput, CreateQuestionsInput
+from services.llm_cache import CacheMode
+from services.pipeline import CoursePipeline, GenerationConfig
+
+REQUESTED_COUNT = re.compile(r"Generate (\d+) questions")
+
+
+# Answers like a model server that always plans four topics and otherwise
+# does as it's told.
+class FakePipeline(CoursePipeline):
+    def __init__(self, config: GenerationConfig):
+        super().__init__(backend=None, config=config)
+        self.topic_count = 4
+        self.requested: list[int] = []
+
+    def parse(self, messages, response_format, on_partial=lambda parsed: None):
+        if response_format is CreateCourseOutlineInput:
+            return CreateCourseOutlineInput(
+                name="Course",
+                description="",
+                topics=[f"Topic {index}" for index in range(self.topic_count)],
+            )
+        count = int(REQUESTED_COUNT.search(messages[0]["content"]).group(1))
+        self.requested.append(count)
+        topic = messages[1]["content"]
+        return CreateQuestionsInput(
+            questions=[
+                CreateQuestionInput(
+                    question=f"{topic}, question number {index}?",
+                    answer=f"Answer {index}",
+                    choices=[f"Answer {index}", "Other"],
+                    explanation="",
+                    difficulty=3,
+                )
+                for index in range(count)
+            ]
+        )
+
+
+@pytest.mark.parametrize("question_count", [3, 10, 20, 40, 100])
+def test_course_has_the_requested_number_of_questions(question_count):
+    config = GenerationConfig(question_count=question_count, cache_mode=CacheMode.OFF)
+    course = FakePipeline(config).run("Spanish verbs")
+    assert len(course.questions) == question_count
+
+
+def test_questions_are_split_over_the_returned_topics():
+    config = GenerationConfig(
+        question_count=100, questions_per_chunk=10, cache_mode=CacheMode.OFF
+    )
+    pipeline = FakePipeline(config)
+    pipeline.run("Spanish verbs")
+    assert pipeline.requested == [25] * 4
+
+
+def test_topics_beyond_the_planned_count_are_not_requested():
+    config = GenerationConfig(
+        question_count=3, questions_per_chunk=10, cache_mode=CacheMode.OFF
+    )
+    pipeline = FakePipeline(config)
+    pipeline.run("Spanish verbs")
+    assert pipeline.requested == [3]
@@ -0,0 +1,147 @@
+import time
+
+import pytest
+
+from models.ai import CreateCourseInput, CreateQuestionInput
+from services.scheduler import DAY, RELEARN_DELAY
+from services.skill import INITIAL_SKILL, difficulty_order
+from storage import question_stream
+from storage.question_stream import DUE_RECHECK_SECONDS, QuestionStream
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+def create_course(repository, difficulties: list[int]) -> int:
+    return repository.create_course(
+        CreateCourseInput(
+            name="Course",
+            description="",
+            questions=[
+                CreateQuestionInput(
+                    question=f"What is question number {index} of this course about?",
+                    answer=f"Answer {index}",
+                    choices=[f"Answer {index}", "Other"],
+                    explanation="",
+                    difficulty=difficulty,
+                )
+                for index, difficulty in enumerate(difficulties)
+            ],
+        )
+    )
+
+
+def drain(stream: QuestionStream) -> list[int]:
+    ids = []
+    while (question := stream.pop()) is not None:
+        ids.append(question.id)
+    return ids
+
+
+def test_new_questions_are_paged_in_order(repository, clock):
+    course_id = create_course(repository, [3] * 45)
+    stream = QuestionStream(repository, course_id, page_size=4, low_watermark=1)
+
+    first = stream.pop()
+    # Only one page of the bucket is read ahead.
+    assert len(stream) == question_stream.BUCKET_PAGE_SIZE - 1
+    ids = [first.id] + drain(stream)
+    assert ids == [question.id for question in repository.fetch_questions(course_id)]
+    assert stream.exhausted
+
+
+def test_due_questions_come_first_most_overdue_first(repository, clock):
+    course_id = create_course(repository, [3] * 12)
+    questions = repository.fetch_questions(course_id)
+    # Answered a day apart, so the first ones are the most overdue.
+    for question in reversed(questions[:7]):
+        repository.record_review(question, True)
+        clock.now += DAY
+    clock.now += DAY
+
+    stream = QuestionStream(repository, course_id, page_size=2, low_watermark=0)
+    ids = drain(stream)
+    assert ids[:7] == [question.id for question in reversed(questions[:7])]
+    assert ids[7:] == [question.id for question in questions[7:]]
+
+
+def test_review_of_all_courses_only_serves_due_questions(repository, clock):
+    first_course = create_course(repository, [3] * 3)
+    second_course = create_course(repository, [3] * 3)
+    answered = [
+        repository.fetch_questions(first_course)[0],
+        repository.fetch_questions(second_course)[1],
+    ]
+    for question in answered:
+        repository.record_review(question, True)
+    clock.now += 2 * DAY
+
+    stream = QuestionStream(repository, None, page_size=1, low_watermark=0)
+    assert drain(stream) == [question.id for question in answered]
+
+
+def test_questions_answered_wrong_come_back_in_the_same_session(repository, clock):
+    course_id = create_course(repository, [3] * 30)
+    stream = QuestionStream(repository, course_id, page_size=4, low_watermark=1)
+    missed = stream.pop()
+    repository.record_review(missed, False)
+
+    clock.now += RELEARN_DELAY - 1
+    assert stream.pop().id != missed.id
+
+    # Picked up by the next recheck, at most that long after it became due.
+    clock.now += DUE_RECHECK_SECONDS
+    assert stream.pop().id == missed.id
+    assert missed.id not in drain(stream)
+
+
+def test_due_questions_are_rechecked_at_most_every_few_seconds(repository, clock):
+    course_id = create_course(repository, [3] * 30)
+    stream = QuestionStream(repository, course_id, page_size=4, low_watermark=1)
+    stream.pop()
+    calls = []
+    fetch_due_questions = repository.fetch_due_questions
+    repository.fetch_due_questions = lambda *args: calls.append(args) or fetch_due_questions(*args)
+
+    for _ in range(5):
+        stream.pop()
+    assert calls == []
+
+    clock.now += DUE_RECHECK_SECONDS
+    stream.pop()
+    stream.pop()
+    assert len(calls) == 1
+
+
+def test_new_questions_start_near_the_skill_of_the_learner(repository, clock):
+    course_id = create_course(repository, [1, 2, 3, 4, 5] * 3)
+    stream = QuestionStream(repository, course_id)
+    order = difficulty_order(INITIAL_SKILL)
+
+    # The closest difficulty until it runs out, then the next closest.
+    difficulties = [stream.pop().difficulty for _ in range(6)]
+    assert difficulties == [order[0]] * 3 + [order[1]] * 3
+
+
+def test_answered_questions_are_no_longer_new(repository, clock):
+    course_id = create_course(repository, [3] * 4)
+    questions = repository.fetch_questions(course_id)
+    repository.record_review(questions[1], False)
+    repository.record_review(questions[1], True)
+
+    new = [question.id for question in questions if question.id != questions[1].id]
+    assert [question.id for question in repository.fetch_new_questions(course_id)] == new
+    by_difficulty = repository.fetch_new_questions_by_difficulty(course_id, 3, after_id=new[0])
+    assert [question.id for question in by_difficulty] == new[1:]
@@ -0,0 +1,45 @@
+from services.scheduler import (
+    DAY,
+    GRADE_CORRECT,
+    GRADE_INCORRECT,
+    INITIAL_EASE,
+    MAX_INTERVAL,
+    MIN_EASE,
+    RELEARN_DELAY,
+    schedule,
+)
+
+NOW = 1_700_000_000
+
+
+def test_first_correct_answers_follow_sm2():
+    state = schedule(None, 1, 2, GRADE_CORRECT, NOW)
+    assert (state.repetitions, state.interval, state.due_at) == (1, 1.0, NOW + DAY)
+    assert state.ease == INITIAL_EASE
+
+    state = schedule(state, 1, 2, GRADE_CORRECT, NOW + DAY)
+    assert (state.repetitions, state.interval) == (2, 6.0)
+
+    state = schedule(state, 1, 2, GRADE_CORRECT, NOW + 7 * DAY)
+    assert state.repetitions == 3
+    assert state.interval == 6.0 * state.ease
+    assert state.due_at == NOW + 7 * DAY + int(state.interval * DAY)
+
+
+def test_wrong_answer_relearns_soon_and_lowers_ease():
+    state = schedule(None, 1, 2, GRADE_CORRECT, NOW)
+    state = schedule(state, 1, 2, GRADE_INCORRECT, NOW + DAY)
+    assert (state.repetitions, state.interval) == (0, 0.0)
+    assert state.due_at == NOW + DAY + RELEARN_DELAY
+    assert state.ease < INITIAL_EASE
+
+
+def test_ease_and_interval_stay_bounded():
+    state = None
+    for _ in range(20):
+        state = schedule(state, 1, 2, GRADE_INCORRECT, NOW)
+    assert state.ease == MIN_EASE
+
+    for _ in range(100):
+        state = schedule(state, 1, 2, GRADE_CORRECT, NOW)
+    assert state.interval == MAX_INTERVAL
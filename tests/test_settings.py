@@ -0,0 +1,48 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from services.settings import GeneratorSettings, is_local_url
+
+
+@pytest.mark.parametrize(
+    "base_url, local",
+    [
+        ("http://localhost:1234/v1", True),
+        ("http://127.0.0.1:8080/v1", True),
+        ("http://[::1]:11434/v1", True),
+        ("http://host.docker.internal:1234/v1", True),
+        ("https://api.openai.com/v1", False),
+        ("https://api.deepseek.com", False),
+        ("http://192.168.1.20:1234/v1", False),
+        ("", False),
+    ],
+)
+def test_local_urls(base_url, local):
+    assert is_local_url(base_url) == local
+
+
+def test_backend_kind():
+    assert GeneratorSettings().backend_kind() == "remote"
+    assert GeneratorSettings(base_url="http://localhost:1234/v1").backend_kind() == "local"
+    # OPENAI_BACKEND overrides the guess.
+    settings = GeneratorSettings(base_url="http://localhost:1234/v1", kind="remote")
+    assert settings.backend_kind() == "remote"
+
+
+# Startup decides whether to warm up a local server without loading openai.
+def test_backend_kind_does_not_import_openai():
+    code = (
+        "import sys; from services.settings import GeneratorSettings;"
+        " GeneratorSettings.from_env().backend_kind(); print('openai' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent / "src",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,42 @@
+import pytest
+
+from services.skill import (
+    INITIAL_SKILL,
+    MAX_SKILL,
+    MIN_SKILL,
+    TARGET_SUCCESS,
+    difficulty_order,
+    expected_success,
+    target_difficulty,
+    update_skill,
+)
+
+
+def test_answers_move_the_skill_towards_the_learner():
+    assert update_skill(INITIAL_SKILL, 0, 3, True) > INITIAL_SKILL
+    assert update_skill(INITIAL_SKILL, 0, 3, False) < INITIAL_SKILL
+    # An easy question says less when answered right than a hard one.
+    assert update_skill(INITIAL_SKILL, 0, 1, True) < update_skill(INITIAL_SKILL, 0, 5, True)
+
+
+def test_steps_shrink_with_answers():
+    early = update_skill(INITIAL_SKILL, 0, 3, True) - INITIAL_SKILL
+    late = update_skill(INITIAL_SKILL, 100, 3, True) - INITIAL_SKILL
+    assert 0 < late < early
+
+
+def test_skill_is_clamped():
+    skill = INITIAL_SKILL
+    for answered in range(100):
+        skill = update_skill(skill, answered, 5, True)
+    assert skill == pytest.approx(MAX_SKILL)
+    for answered in range(100, 300):
+        skill = update_skill(skill, answered, 1, False)
+    assert skill == pytest.approx(MIN_SKILL)
+
+
+def test_target_difficulty_gives_the_target_success():
+    skill = 3.2
+    assert expected_success(skill, target_difficulty(skill)) == pytest.approx(TARGET_SUCCESS)
+    assert difficulty_order(INITIAL_SKILL)[0] == 3
+    assert sorted(difficulty_order(skill)) == [1, 2, 3, 4, 5]